@@ -0,0 +1,176 @@
+from typing import NamedTuple
+import numpy as np
+from TicTacToe.Game import Game
+
+# A codificação das casas nos tabuleiros do lote.
+EMPTY, X, O = 0, 1, -1
+# O valor de cada 'símbolo' na codificação.
+CODES = {"": EMPTY, "X": X, "O": O}
+
+
+class BatchResult(NamedTuple):
+    """Resultado da avaliação de um lote de
+    tabuleiros. Cada campo possui uma entrada por
+    tabuleiro."""
+
+    # O vencedor: 'X' (1), 'O' (-1) ou nenhum (0).
+    winner: np.ndarray
+    # Se o tabuleiro está empatado.
+    tied: np.ndarray
+    # As sequências ainda abertas para 'X', isto é,
+    # sem nenhum 'O'.
+    x_open: np.ndarray
+    # As sequências ainda abertas para 'O'.
+    o_open: np.ndarray
+    # As ameaças imediatas de 'X': sequências com 'k-1'
+    # 'X' e uma casa vazia.
+    x_threats: np.ndarray
+    # As ameaças imediatas de 'O'.
+    o_threats: np.ndarray
+
+
+class BatchEvaluator:
+    """Avalia, de forma vetorizada, lotes de tabuleiros
+    de um mesmo tamanho, seguindo as regras de
+    'Game'."""
+
+    def __init__(
+        self, rows: int = 3, cols: int = 3, k: int = 3
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            rows (int, optional): A quantidade de
+            linhas do tabuleiro. Valor padrão: 3.
+            cols (int, optional): A quantidade de
+            colunas do tabuleiro. Valor padrão: 3.
+            k (int, optional): O tamanho da sequência
+            vitoriosa. Valor padrão: 3.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        # Os índices (no tabuleiro achatado) das casas
+        # de cada sequência vitoriosa, na mesma ordem
+        # de 'Game._get_winning_positions'.
+        game = Game(rows, cols, k)
+        self.lines = np.array(
+            [
+                [row * cols + col for row, col in combo]
+                for combo in game.winning_positions
+            ],
+            dtype=np.intp,
+        ).reshape(-1, k)
+
+    @staticmethod
+    def encode(game: Game) -> np.ndarray:
+        """Converte o estado atual de um jogo em um
+        tabuleiro do lote.
+
+        Args:
+            game (Game): O jogo.
+
+        Returns:
+            np.ndarray: O tabuleiro, com formato
+            (rows, cols) e tipo int8."""
+        return np.array(
+            [
+                [CODES[move.label] for move in row]
+                for row in game._current_moves
+            ],
+            dtype=np.int8,
+        )
+
+    def evaluate(
+        self, boards: np.ndarray, chunk_size: int = 1 << 16
+    ) -> BatchResult:
+        """Avalia um lote de tabuleiros.
+
+        Args:
+            boards (np.ndarray): Os tabuleiros, com
+            formato (N, rows, cols) e tipo int8, onde
+            'X' é 1, 'O' é -1 e uma casa vazia é 0.
+            chunk_size (int, optional): A quantidade de
+            tabuleiros avaliados por vez, limitando a
+            memória usada. Valor padrão: 2^16.
+
+        Returns:
+            BatchResult: O resultado de cada
+            tabuleiro."""
+        boards = np.asarray(boards, dtype=np.int8)
+        if boards.ndim != 3 or boards.shape[1:] != (
+            self.rows,
+            self.cols,
+        ):
+            raise ValueError(
+                "Formato inválido: esperado "
+                f"(N, {self.rows}, {self.cols}), "
+                f"recebido {boards.shape}."
+            )
+        flat = boards.reshape(len(boards), -1)
+        n = len(flat)
+        winner = np.zeros(n, dtype=np.int8)
+        tied = np.zeros(n, dtype=bool)
+        counts = [np.zeros(n, dtype=np.int32) for _ in range(4)]
+        for start in range(0, n, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            self._evaluate_chunk(
+                flat[chunk],
+                winner[chunk],
+                tied[chunk],
+                *(count[chunk] for count in counts),
+            )
+        return BatchResult(winner, tied, *counts)
+
+    def _evaluate_chunk(
+        self,
+        flat: np.ndarray,
+        winner: np.ndarray,
+        tied: np.ndarray,
+        x_open: np.ndarray,
+        o_open: np.ndarray,
+        x_threats: np.ndarray,
+        o_threats: np.ndarray,
+    ) -> None:
+        """Avalia uma parte do lote, escrevendo os
+        resultados nos vetores recebidos.
+
+        Args:
+            flat (np.ndarray): Os tabuleiros achatados,
+            com formato (n, rows * cols).
+            winner, tied, x_open, o_open, x_threats,
+            o_threats (np.ndarray): As partes
+            correspondentes dos resultados.
+        """
+        k = self.k
+        # As casas de cada sequência, com formato
+        # (n, sequências, k).
+        cells = flat[:, self.lines]
+        x_count = (cells == X).sum(axis=2)
+        o_count = (cells == O).sum(axis=2)
+
+        # Assim como 'Game.check_move', o vencedor é o
+        # dono da primeira sequência completa.
+        complete = (x_count == k) | (o_count == k)
+        has_winner = complete.any(axis=1)
+        first = complete.argmax(axis=1)
+        first_is_x = (
+            x_count[np.arange(len(flat)), first] == k
+        )
+        winner[:] = np.where(
+            has_winner, np.where(first_is_x, X, O), EMPTY
+        )
+        # Há empate quando ninguém venceu e todas as
+        # casas foram preenchidas.
+        tied[:] = ~has_winner & (flat != EMPTY).all(axis=1)
+
+        x_free = o_count == 0
+        o_free = x_count == 0
+        x_open[:] = x_free.sum(axis=1)
+        o_open[:] = o_free.sum(axis=1)
+        x_threats[:] = (x_free & (x_count == k - 1)).sum(
+            axis=1
+        )
+        o_threats[:] = (o_free & (o_count == k - 1)).sum(
+            axis=1
+        )
@@ -0,0 +1,287 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import NamedTuple
+from Engine.Evaluation import Evaluator, evaluate
+from Engine.Search import Search
+from Move import Move
+from TicTacToe.Game import Game
+
+
+class Case(NamedTuple):
+    """Uma posição do conjunto fixo de
+    'benchmarks'."""
+
+    # O nome da posição, usado como chave no JSON.
+    name: str
+    # As dimensões e o tamanho da sequência vitoriosa.
+    rows: int
+    cols: int
+    k: int
+    # As jogadas feitas até a posição, alternando
+    # entre 'X' e 'O' a partir de 'X'.
+    moves: tuple[tuple[int, int], ...]
+
+
+# O conjunto fixo de posições: tabuleiro vazio, meio de
+# jogo e próximo do fim, em vários tamanhos.
+CORPUS = (
+    Case("3x3-empty", 3, 3, 3, ()),
+    Case("3x3-mid", 3, 3, 3, ((1, 1), (0, 0), (2, 2))),
+    Case(
+        "3x3-end",
+        3,
+        3,
+        3,
+        ((1, 1), (0, 0), (2, 2), (0, 2), (0, 1), (2, 1)),
+    ),
+    Case("4x4-empty", 4, 4, 4, ()),
+    Case(
+        "4x4-mid",
+        4,
+        4,
+        4,
+        ((1, 1), (2, 2), (1, 2), (2, 1), (0, 0)),
+    ),
+    Case(
+        "7x7-mid",
+        7,
+        7,
+        5,
+        ((3, 3), (3, 4), (2, 2), (4, 4), (2, 3), (1, 1)),
+    ),
+    Case(
+        "15x15-mid",
+        15,
+        15,
+        5,
+        ((7, 7), (7, 8), (6, 6), (8, 8), (6, 7), (5, 5)),
+    ),
+)
+
+
+def load_case(case: Case) -> Game:
+    """Cria o jogo de uma posição do conjunto.
+
+    Args:
+        case (Case): A posição.
+
+    Returns:
+        Game: O jogo, com as jogadas já feitas."""
+    game = Game(case.rows, case.cols, case.k)
+    labels = ("X", "O")
+    game.replay(
+        Move(row, col, labels[i % 2])
+        for i, (row, col) in enumerate(case.moves)
+    )
+    return game
+
+
+def bench_search(case: Case, repeat: int) -> dict:
+    """Mede a escolha de uma jogada em uma posição,
+    sempre com uma tabela de transposição vazia.
+
+    Args:
+        case (Case): A posição.
+        repeat (int): A quantidade de repetições.
+
+    Returns:
+        dict: Os nós visitados, o tempo (mediano) por
+        jogada e os nós por segundo."""
+    times = []
+    for _ in range(repeat):
+        game = load_case(case)
+        engine = Search()
+        start = time.perf_counter()
+        move = engine.best_move(game)
+        times.append(time.perf_counter() - start)
+    wall = statistics.median(times)
+    return {
+        "move": list(move),
+        "nodes": engine.nodes,
+        "wall": wall,
+        "nps": engine.nodes / wall if wall else 0.0,
+    }
+
+
+def bench_rules(repeat: int, number: int = 20000) -> dict:
+    """Mede as funções críticas das regras e da
+    heurística, em uma posição de meio de jogo.
+
+    Args:
+        repeat (int): A quantidade de repetições.
+        number (int, optional): As chamadas por
+        repetição. Valor padrão: 20000.
+
+    Returns:
+        dict: O tempo, em nanossegundos, por chamada
+        de cada função."""
+    game = load_case(CORPUS[5])
+    engine = Search()
+    pos = game.position
+    # A avaliação completa e a incremental (uma jogada
+    # feita e desfeita).
+    evaluator = Evaluator(pos)
+    cell = (pos.empty & -pos.empty).bit_length() - 1
+
+    def push_pop() -> None:
+        evaluator.push(cell, True)
+        evaluator.pop(cell, True)
+
+    functions = {
+        "Game.check_move": game.check_move,
+        "Game.is_tied": game.is_tied,
+        "Search._minimax_heuristic": lambda: (
+            engine._minimax_heuristic(pos, True)
+        ),
+        "evaluate": lambda: evaluate(
+            pos.x, pos.o, pos.win_masks, True
+        ),
+        "Evaluator.push/pop": push_pop,
+    }
+    results = {}
+    for name, function in functions.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            best = min(best, time.perf_counter() - start)
+        results[name] = {"ns_per_call": best / number * 1e9}
+    return results
+
+
+def run(repeat: int = 3) -> dict:
+    """Executa todos os 'benchmarks'.
+
+    Args:
+        repeat (int, optional): A quantidade de
+        repetições de cada medida. Valor padrão: 3.
+
+    Returns:
+        dict: Os resultados, prontos para o JSON."""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "search": {
+            case.name: bench_search(case, repeat)
+            for case in CORPUS
+        },
+        "rules": bench_rules(repeat),
+    }
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float
+) -> list[str]:
+    """Compara dois resultados, listando as
+    regressões acima do limite.
+
+    Args:
+        baseline (dict): O resultado de referência.
+        current (dict): O resultado atual.
+        threshold (float): O aumento relativo
+        tolerado (0.2 equivale a 20%).
+
+    Returns:
+        list[str]: As regressões encontradas."""
+    regressions = []
+    metrics = [
+        ("search", "wall"),
+        ("search", "nodes"),
+        ("rules", "ns_per_call"),
+    ]
+    for section, metric in metrics:
+        for name, values in current[section].items():
+            old = baseline.get(section, {}).get(name)
+            if old is None or not old[metric]:
+                continue
+            ratio = values[metric] / old[metric]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{section}/{name}/{metric}: "
+                    f"{old[metric]:.6g} -> "
+                    f"{values[metric]:.6g} "
+                    f"(+{(ratio - 1) * 100:.1f}%)"
+                )
+    return regressions
+
+
+def format_results(results: dict) -> str:
+    """Formata os resultados em uma tabela.
+
+    Returns:
+        str: A tabela."""
+    lines = [
+        f"{'posição':<12}{'jogada':>10}{'nós':>10}"
+        f"{'ms':>10}{'nós/s':>12}"
+    ]
+    for name, values in results["search"].items():
+        lines.append(
+            f"{name:<12}{str(tuple(values['move'])):>10}"
+            f"{values['nodes']:>10}"
+            f"{values['wall'] * 1000:>10.2f}"
+            f"{values['nps']:>12.0f}"
+        )
+    lines.append("")
+    for name, values in results["rules"].items():
+        lines.append(
+            f"{name:<28}{values['ns_per_call']:>10.0f} ns"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="'Benchmarks' do 'bot' e das "
+        "regras do jogo, sem interface gráfica."
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Repetições de cada medida.",
+    )
+    parser.add_argument(
+        "--output",
+        help="Arquivo JSON onde salvar os resultados.",
+    )
+    parser.add_argument(
+        "--compare",
+        help="Arquivo JSON de referência.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Aumento relativo tolerado antes de "
+        "falhar (padrão: 0.2).",
+    )
+    args = parser.parse_args()
+
+    # Garante que nada aqui dependa do 'tkinter'.
+    sys.modules["tkinter"] = None
+
+    results = run(args.repeat)
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(
+            baseline, results, args.threshold
+        )
+        if regressions:
+            print("\nRegressões:")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print("\nNenhuma regressão.")
+
+
+if __name__ == "__main__":
+    main()
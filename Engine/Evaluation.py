@@ -0,0 +1,472 @@
+import argparse
+import sys
+from typing import NamedTuple
+from Engine.Position import Position
+
+# A base do peso de uma sequência aberta na avaliação
+# estática: uma sequência com 'n' 'símbolos' de um
+# único jogador vale 'EVAL_BASE ** n'.
+EVAL_BASE = 4
+
+
+class Weights(NamedTuple):
+    """Os pesos da avaliação estática."""
+
+    # A base do peso de uma sequência aberta: uma
+    # sequência com 'n' 'símbolos' de um único jogador
+    # vale 'line ** n'.
+    line: int = EVAL_BASE
+    # O bônus de cada casa vazia que completaria uma
+    # sequência do jogador (uma ameaça).
+    threat: int = 16
+    # O bônus de uma ameaça decisiva: uma ameaça do
+    # jogador do turno, que vence na jogada seguinte,
+    # ou duas ou mais do adversário (um garfo), que o
+    # jogador do turno não consegue bloquear.
+    fork: int = 1024
+
+
+# Os pesos padrão.
+DEFAULT_WEIGHTS = Weights()
+
+
+def score_threats(
+    x_threats: int,
+    o_threats: int,
+    isMax: bool,
+    weights: Weights = DEFAULT_WEIGHTS,
+) -> int:
+    """Avalia as ameaças de cada jogador, isto é, as
+    casas vazias que completariam uma sequência dele.
+
+    Args:
+        x_threats (int): A quantidade de ameaças de
+        'X'.
+        o_threats (int): A quantidade de ameaças de
+        'O'.
+        isMax: Se é o turno de 'X'.
+        weights (Weights, optional): Os pesos da
+        avaliação. Valor padrão: 'DEFAULT_WEIGHTS'.
+
+    Returns:
+        int: A avaliação das ameaças, positiva quando
+        favorece 'X' e negativa quando favorece 'O'."""
+    own, other = (
+        (x_threats, o_threats) if isMax else (o_threats, x_threats)
+    )
+    if own:
+        score = weights.fork
+    elif other >= 2:
+        score = -weights.fork
+    else:
+        score = weights.threat * (own - other)
+    return score if isMax else -score
+
+
+def evaluate(
+    x: int,
+    o: int,
+    win_masks: tuple[int, ...],
+    isMax: bool,
+    weights: Weights = DEFAULT_WEIGHTS,
+) -> int:
+    """Avaliação estática de uma posição, calculada do
+    zero: as sequências abertas de cada jogador e as
+    suas ameaças.
+
+    Args:
+        x (int): As casas ocupadas por 'X'.
+        o (int): As casas ocupadas por 'O'.
+        win_masks (tuple[int, ...]): As máscaras das
+        sequências vitoriosas.
+        isMax: Se é o turno de 'X'.
+        weights (Weights, optional): Os pesos da
+        avaliação. Valor padrão: 'DEFAULT_WEIGHTS'.
+
+    Returns:
+        int: A avaliação, positiva quando favorece 'X'
+        e negativa quando favorece 'O'."""
+    base = weights.line
+    score = 0
+    # As casas que completariam uma sequência de cada
+    # jogador.
+    x_threats = o_threats = 0
+    for mask in win_masks:
+        x_line = x & mask
+        o_line = o & mask
+        if x_line and not o_line:
+            score += base ** x_line.bit_count()
+            rest = mask ^ x_line
+            if rest and not rest & (rest - 1):
+                x_threats |= rest
+        elif o_line and not x_line:
+            score -= base ** o_line.bit_count()
+            rest = mask ^ o_line
+            if rest and not rest & (rest - 1):
+                o_threats |= rest
+    return score + score_threats(
+        x_threats.bit_count(),
+        o_threats.bit_count(),
+        isMax,
+        weights,
+    )
+
+
+# Os índices das sequências que passam por cada casa,
+# já calculados, por conjunto de sequências.
+_line_ids: dict[
+    tuple[int, tuple[int, ...]], tuple[tuple[int, ...], ...]
+] = {}
+
+
+def get_line_ids(
+    cells: int, win_masks: tuple[int, ...]
+) -> tuple[tuple[int, ...], ...]:
+    """Retorna, para cada casa, os índices das
+    sequências vitoriosas que passam por ela,
+    calculando-os somente na primeira vez.
+
+    Args:
+        cells (int): A quantidade de casas.
+        win_masks (tuple[int, ...]): As máscaras das
+        sequências vitoriosas.
+
+    Returns:
+        tuple[tuple[int, ...], ...]: Os índices das
+        sequências de cada casa."""
+    key = (cells, win_masks)
+    if key not in _line_ids:
+        lines = [[] for _ in range(cells)]
+        for line, mask in enumerate(win_masks):
+            rest = mask
+            while rest:
+                bit = rest & -rest
+                lines[bit.bit_length() - 1].append(line)
+                rest ^= bit
+        _line_ids[key] = tuple(tuple(ids) for ids in lines)
+    return _line_ids[key]
+
+
+class Evaluator:
+    """Avaliação estática mantida incrementalmente.
+
+    Guarda, para cada sequência vitoriosa, a quantidade
+    de 'símbolos' de cada jogador e, para cada casa, as
+    sequências de cada jogador que ela completaria. Cada
+    jogada feita ('push') ou desfeita ('pop') atualiza
+    somente as sequências que passam pela casa, e
+    'value' é sempre igual a 'evaluate' da posição
+    atual."""
+
+    __slots__ = (
+        "weights",
+        "score",
+        "_x",
+        "_o",
+        "_masks",
+        "_line_ids",
+        "_size",
+        "_values",
+        "_counts",
+        "_threat_count",
+        "_threats",
+    )
+
+    def __init__(
+        self, pos: Position, weights: Weights = DEFAULT_WEIGHTS
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            pos (Position): A posição inicial.
+            weights (Weights, optional): Os pesos da
+            avaliação. Valor padrão: 'DEFAULT_WEIGHTS'.
+        """
+        self.weights = weights
+        cells = pos.rows * pos.cols
+        lines = len(pos.win_masks)
+        self._masks = pos.win_masks
+        self._line_ids = get_line_ids(cells, pos.win_masks)
+        # O tamanho das sequências ('k').
+        self._size = (
+            pos.win_masks[0].bit_count() if lines else 0
+        )
+        # O valor de uma sequência, pela quantidade de
+        # 'símbolos' de 'X' e de 'O' nela.
+        base = weights.line
+        self._values = [
+            [
+                base**x_count
+                if x_count and not o_count
+                else -(base**o_count)
+                if o_count and not x_count
+                else 0
+                for o_count in range(self._size + 1)
+            ]
+            for x_count in range(self._size + 1)
+        ]
+        # As quantidades de 'símbolos' de cada
+        # sequência, por jogador.
+        self._counts = ([0] * lines, [0] * lines)
+        # Quantas sequências de cada jogador cada casa
+        # completaria, e quantas casas completariam
+        # alguma.
+        self._threat_count = ([0] * cells, [0] * cells)
+        self._threats = [0, 0]
+        # A avaliação das sequências abertas, sem as
+        # ameaças.
+        self.score = 0
+        self._x = self._o = 0
+        for isMax, stones in ((True, pos.x), (False, pos.o)):
+            while stones:
+                bit = stones & -stones
+                self.push(bit.bit_length() - 1, isMax)
+                stones ^= bit
+
+    def value(self, isMax: bool) -> int:
+        """Retorna a avaliação da posição atual.
+
+        Args:
+            isMax: Se é o turno de 'X'.
+
+        Returns:
+            int: A avaliação, positiva quando favorece
+            'X' e negativa quando favorece 'O'."""
+        threats = self._threats
+        return self.score + score_threats(
+            threats[0], threats[1], isMax, self.weights
+        )
+
+    def _add_threat(self, player: int, cell: int, delta: int) -> None:
+        """Registra (ou remove) uma sequência de um
+        jogador que a casa completaria.
+
+        Args:
+            player (int): 0 para 'X' e 1 para 'O'.
+            cell (int): O índice da casa.
+            delta (int): 1 para registrar e -1 para
+            remover.
+        """
+        counts = self._threat_count[player]
+        before = counts[cell]
+        counts[cell] = before + delta
+        # Conta as casas, e não as sequências: duas
+        # sequências completadas pela mesma casa são
+        # uma única ameaça.
+        if not before or not counts[cell]:
+            self._threats[player] += delta
+
+    def _empty_cell(self, line: int) -> int:
+        """Retorna o índice da única casa vazia de uma
+        sequência.
+
+        Args:
+            line (int): O índice da sequência.
+
+        Returns:
+            int: O índice da casa."""
+        rest = self._masks[line] & ~(self._x | self._o)
+        return rest.bit_length() - 1
+
+    def push(self, cell: int, isMax: bool) -> None:
+        """Registra uma jogada.
+
+        Args:
+            cell (int): O índice da casa jogada.
+            isMax: Se a jogada é de 'X'.
+        """
+        player = 0 if isMax else 1
+        own = self._counts[player]
+        other = self._counts[1 - player]
+        values = self._values
+        # A quantidade de 'símbolos' de uma sequência
+        # que é uma ameaça (0 quando 'k' é 1, e não há
+        # ameaças).
+        threat = self._size - 1
+        score = self.score
+        if isMax:
+            self._x |= 1 << cell
+        else:
+            self._o |= 1 << cell
+        for line in self._line_ids[cell]:
+            mine = own[line]
+            theirs = other[line]
+            if isMax:
+                score += values[mine + 1][theirs]
+                score -= values[mine][theirs]
+            else:
+                score += values[theirs][mine + 1]
+                score -= values[theirs][mine]
+            own[line] = mine + 1
+            if not threat:
+                continue
+            # A sequência deixa de ser uma ameaça (ao
+            # ser completada ou bloqueada) ou passa a
+            # ser uma.
+            if not theirs and mine == threat:
+                self._add_threat(player, cell, -1)
+            elif not mine and theirs == threat:
+                self._add_threat(1 - player, cell, -1)
+            elif not theirs and mine + 1 == threat:
+                self._add_threat(
+                    player, self._empty_cell(line), 1
+                )
+        self.score = score
+
+    def pop(self, cell: int, isMax: bool) -> None:
+        """Desfaz uma jogada, a última registrada.
+
+        Args:
+            cell (int): O índice da casa jogada.
+            isMax: Se a jogada é de 'X'.
+        """
+        player = 0 if isMax else 1
+        own = self._counts[player]
+        other = self._counts[1 - player]
+        values = self._values
+        threat = self._size - 1
+        score = self.score
+        for line in self._line_ids[cell]:
+            mine = own[line]
+            theirs = other[line]
+            if isMax:
+                score += values[mine - 1][theirs]
+                score -= values[mine][theirs]
+            else:
+                score += values[theirs][mine - 1]
+                score -= values[theirs][mine]
+            own[line] = mine - 1
+            if not threat:
+                continue
+            # O inverso de 'push', com a casa ainda
+            # ocupada.
+            if not theirs and mine == threat:
+                self._add_threat(
+                    player, self._empty_cell(line), -1
+                )
+            elif not theirs and mine - 1 == threat:
+                self._add_threat(player, cell, 1)
+            elif mine == 1 and theirs == threat:
+                self._add_threat(1 - player, cell, 1)
+        self.score = score
+        if isMax:
+            self._x ^= 1 << cell
+        else:
+            self._o ^= 1 << cell
+
+
+def check_perfect_play(
+    depth: int,
+) -> tuple[int, list[int], list[str]]:
+    """Compara a avaliação com o jogo perfeito, em
+    todas as posições não terminadas alcançáveis do
+    tabuleiro 3x3.
+
+    Args:
+        depth (int): A maior profundidade das buscas
+        com a avaliação.
+
+    Returns:
+        tuple[int, list[int], list[str]]: A
+        quantidade de posições; para cada
+        profundidade, de 1 a 'depth', a quantidade de
+        posições em que a jogada escolhida pela busca
+        mantém o valor do jogo perfeito; e as
+        divergências encontradas: uma avaliação
+        incremental diferente de 'evaluate', uma
+        avaliação decisiva com o vencedor errado ou,
+        na maior profundidade, uma jogada que perde o
+        valor do jogo perfeito."""
+    from Engine.Search import Search
+    from Engine.SolvedTable import solve
+    from TicTacToe.Game import Game
+
+    game = Game(3, 3, 3)
+    solved = solve(game)
+    win_masks = Position.get_win_masks(
+        game.winning_positions, game.cols
+    )
+
+    def value_of(x: int, o: int, isMax: bool) -> int:
+        """O valor da posição no jogo perfeito."""
+        pos = Position(3, 3, win_masks, x, o)
+        if pos.has_winner():
+            return -1 if isMax else 1
+        if pos.is_full():
+            return 0
+        return solved[(x, o)][0]
+
+    agreed = [0] * depth
+    errors = []
+    for (x, o), (value, _) in solved.items():
+        isMax = x.bit_count() == o.bit_count()
+        pos = Position(3, 3, win_masks, x, o)
+        static = evaluate(x, o, win_masks, isMax)
+        if Evaluator(pos).value(isMax) != static:
+            errors.append(
+                f"{(x, o)}: avaliação incremental "
+                "diferente de 'evaluate'."
+            )
+        # Uma avaliação decisiva deve apontar o
+        # vencedor do jogo perfeito.
+        if abs(static) >= DEFAULT_WEIGHTS.fork and (
+            (static > 0) != (value > 0) or not value
+        ):
+            errors.append(
+                f"{(x, o)}: avaliação {static}, mas o "
+                f"valor do jogo perfeito é {value}."
+            )
+        for current in range(1, depth + 1):
+            row, col = Search(depth=current).search(
+                pos.copy(), isMax
+            )
+            bit = 1 << (row * 3 + col)
+            if isMax:
+                after = value_of(x | bit, o, False)
+            else:
+                after = value_of(x, o | bit, True)
+            if after == value:
+                agreed[current - 1] += 1
+            elif current == depth:
+                errors.append(
+                    f"{(x, o)}: a jogada {(row, col)} "
+                    f"muda o valor de {value} para "
+                    f"{after}."
+                )
+    return len(solved), agreed, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Verifica se a avaliação estática "
+        "concorda com o jogo perfeito no tabuleiro "
+        "3x3."
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=4,
+        help="A profundidade das buscas com a "
+        "avaliação cujas jogadas devem ser todas "
+        "perfeitas (padrão: 4).",
+    )
+    args = parser.parse_args()
+
+    # Garante que nada aqui dependa do 'tkinter'.
+    sys.modules["tkinter"] = None
+
+    total, agreed, errors = check_perfect_play(args.depth)
+    for current, count in enumerate(agreed, 1):
+        print(
+            f"profundidade {current}: {count} de "
+            f"{total} jogadas perfeitas"
+        )
+    if errors:
+        print("\nDivergências:")
+        print("\n".join(errors))
+        sys.exit(1)
+    print("\nA avaliação concorda com o jogo perfeito.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+import argparse
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from collections import Counter
+from typing import Iterable, Iterator, NamedTuple, Optional
+from Engine.Position import Position
+from Engine.SolvedTable import _rules_digest
+from Move import Move
+from TicTacToe.Game import Game
+
+# Identificação e versão do formato do arquivo.
+MAGIC = b"TTTL"
+VERSION = 1
+# Cabeçalho: identificação, versão, linhas, colunas, o
+# tamanho da sequência vitoriosa e o resumo das
+# regras. Cada partida é gravada em seguida como um
+# byte com a quantidade de jogadas, um byte por
+# jogada e um byte com o resultado.
+HEADER = struct.Struct("<4sBBBB8s")
+# Uma jogada ocupa um byte: o índice da casa nos 7
+# bits mais baixos e, no mais alto, o jogador ('O').
+CELL_MASK = 0x7F
+PLAYER_O = 0x80
+# O maior tabuleiro aceito, limitado pelos bits do
+# índice da casa.
+MAX_CELLS = CELL_MASK + 1
+# O resultado de uma partida: empate, vitória de 'X',
+# vitória de 'O' ou partida abandonada antes do fim.
+DRAW, X_WINS, O_WINS, UNFINISHED = 0, 1, 2, 3
+# Quantos bytes são acumulados antes de serem
+# gravados, de uma só vez, no arquivo.
+BATCH_SIZE = 1 << 12
+
+
+def default_path(rows: int, cols: int, k: int) -> str:
+    """Retorna o caminho padrão do registro de um
+    tabuleiro, ao lado deste módulo.
+
+    Args:
+        rows (int): A quantidade de linhas.
+        cols (int): A quantidade de colunas.
+        k (int): O tamanho da sequência vitoriosa.
+
+    Returns:
+        str: O caminho do arquivo."""
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        f"games-{rows}x{cols}-{k}.bin",
+    )
+
+
+def _header(game: Game) -> bytes:
+    """Monta o cabeçalho do registro das partidas de
+    um jogo.
+
+    Args:
+        game (Game): O jogo cujas regras as partidas
+        seguem.
+
+    Returns:
+        bytes: O cabeçalho."""
+    rows, cols = game.rows, game.cols
+    win_masks = Position.get_win_masks(
+        game.winning_positions, cols
+    )
+    return HEADER.pack(
+        MAGIC,
+        VERSION,
+        rows,
+        cols,
+        game.k,
+        _rules_digest(rows, cols, win_masks),
+    )
+
+
+def game_result(game: Game) -> int:
+    """Retorna o resultado de uma partida, no estado
+    em que ela está.
+
+    Args:
+        game (Game): O jogo, com a vitória já
+        verificada ('check_move').
+
+    Returns:
+        int: 'X_WINS', 'O_WINS', 'DRAW' ou, caso a
+        partida não tenha terminado, 'UNFINISHED'."""
+    if game._has_winner:
+        if game._history[-1].label == "X":
+            return X_WINS
+        return O_WINS
+    if game.is_tied():
+        return DRAW
+    return UNFINISHED
+
+
+class Outcomes(NamedTuple):
+    """A quantidade de partidas de cada resultado."""
+
+    x_wins: int = 0
+    o_wins: int = 0
+    draws: int = 0
+    unfinished: int = 0
+
+    @property
+    def games(self) -> int:
+        """A quantidade total de partidas."""
+        return sum(self)
+
+    def win_rate(self, label: str) -> float:
+        """Retorna a taxa de vitórias de um jogador,
+        entre as partidas terminadas.
+
+        Args:
+            label (str): O 'símbolo' do jogador.
+
+        Returns:
+            float: A fração das partidas terminadas
+            vencidas pelo jogador."""
+        finished = self.x_wins + self.o_wins + self.draws
+        wins = self.x_wins if label == "X" else self.o_wins
+        return wins / finished if finished else 0.0
+
+
+class GameLogWriter:
+    """Grava partidas no fim de um registro binário,
+    somente por acréscimos.
+
+    As partidas são acumuladas em memória e gravadas em
+    lotes por outra 'thread', de modo que registrar uma
+    partida nunca espera pelo disco."""
+
+    def __init__(
+        self,
+        game: Game,
+        path: Optional[str] = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            game (Game): O jogo cujas regras as
+            partidas seguem.
+            path (str, optional): O caminho do arquivo,
+            criado caso não exista. Valor padrão:
+            'default_path' do tabuleiro.
+            batch_size (int, optional): Quantos bytes
+            são acumulados antes de cada gravação.
+            Valor padrão: 'BATCH_SIZE'.
+
+        Raises:
+            ValueError: Caso o tabuleiro seja grande
+            demais, ou o arquivo exista com outras
+            regras.
+        """
+        if game.rows * game.cols > MAX_CELLS:
+            raise ValueError(
+                "Tabuleiro grande demais: "
+                f"{game.rows}x{game.cols}."
+            )
+        if path is None:
+            path = default_path(game.rows, game.cols, game.k)
+        self.path = path
+        self.batch_size = batch_size
+        self._cols = game.cols
+        header = _header(game)
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(header)
+            self._file.flush()
+        else:
+            with open(path, "rb") as file:
+                found = file.read(HEADER.size)
+            if found != header:
+                self._file.close()
+                raise ValueError(
+                    f"O registro '{path}' segue outras "
+                    "regras."
+                )
+            # Descarta uma partida incompleta deixada
+            # por uma gravação interrompida, para que as
+            # novas partidas não fiquem depois dela,
+            # fora do alcance do leitor.
+            log = GameLog.load(game, path)
+            end = log.end()
+            log.close()
+            if end < self._file.tell():
+                self._file.truncate(end)
+        # As partidas ainda não enviadas à 'thread' de
+        # gravação.
+        self._buffer = bytearray()
+        # Os lotes a serem gravados; None encerra a
+        # 'thread'.
+        self._batches = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_batches, daemon=True
+        )
+        self._writer.start()
+
+    def record(self, moves: Iterable[Move], result: int) -> None:
+        """Registra uma partida.
+
+        Args:
+            moves (Iterable[Move]): As jogadas, em
+            ordem.
+            result (int): O resultado: 'DRAW',
+            'X_WINS', 'O_WINS' ou 'UNFINISHED'.
+        """
+        cols = self._cols
+        buffer = self._buffer
+        start = len(buffer)
+        # Reserva o byte da quantidade de jogadas.
+        buffer.append(0)
+        for move in moves:
+            cell = move.row * cols + move.col
+            buffer.append(
+                cell | PLAYER_O if move.label == "O" else cell
+            )
+        buffer[start] = len(buffer) - start - 1
+        buffer.append(result)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Envia as partidas acumuladas para a
+        gravação, sem esperar por ela."""
+        if self._buffer:
+            self._batches.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _write_batches(self) -> None:
+        """Grava os lotes, fora da 'thread' de quem
+        registra as partidas."""
+        while (batch := self._batches.get()) is not None:
+            self._file.write(batch)
+            self._file.flush()
+
+    def close(self) -> None:
+        """Grava as partidas pendentes e fecha o
+        arquivo."""
+        self.flush()
+        self._batches.put(None)
+        self._writer.join()
+        self._file.close()
+
+
+class GameLog:
+    """Leitor, mapeado em memória, de um registro de
+    partidas.
+
+    As partidas são percorridas diretamente nos bytes
+    do arquivo, sem criar um objeto por partida ou por
+    jogada, de modo que consultas sobre milhões de
+    partidas não carregam o registro na memória."""
+
+    def __init__(
+        self, data: mmap.mmap, rows: int, cols: int, k: int
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            data (mmap.mmap): O conteúdo do arquivo.
+            rows (int): A quantidade de linhas.
+            cols (int): A quantidade de colunas.
+            k (int): O tamanho da sequência vitoriosa.
+        """
+        self._data = data
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+
+    @classmethod
+    def load(
+        cls, game: Game, path: Optional[str] = None
+    ) -> Optional["GameLog"]:
+        """Abre um registro, caso ele exista e
+        corresponda às regras de 'game'.
+
+        Args:
+            game (Game): O jogo cujas regras as
+            partidas devem seguir.
+            path (str, optional): O caminho do
+            arquivo. Valor padrão: 'default_path' do
+            tabuleiro.
+
+        Returns:
+            Optional[GameLog]: O registro, ou None caso
+            esteja ausente ou siga outras regras."""
+        if path is None:
+            path = default_path(game.rows, game.cols, game.k)
+        try:
+            with open(path, "rb") as file:
+                data = mmap.mmap(
+                    file.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ,
+                )
+        except (OSError, ValueError):
+            return None
+        if data[: HEADER.size] != _header(game):
+            data.close()
+            return None
+        return cls(data, game.rows, game.cols, game.k)
+
+    def close(self) -> None:
+        """Fecha o mapeamento do arquivo."""
+        self._data.close()
+
+    def offsets(self) -> Iterator[int]:
+        """Percorre as partidas, na ordem em que foram
+        registradas.
+
+        Uma partida incompleta ou inválida no fim do
+        arquivo (uma gravação interrompida) encerra a
+        leitura.
+
+        Returns:
+            Iterator[int]: A posição, no arquivo, do
+            início de cada partida (o byte com a
+            quantidade de jogadas)."""
+        data = self._data
+        end = len(data)
+        cells = self.rows * self.cols
+        offset = HEADER.size
+        while offset < end:
+            count = data[offset]
+            following = offset + count + 2
+            if (
+                count > cells
+                or following > end
+                or data[following - 1] > UNFINISHED
+            ):
+                return
+            yield offset
+            offset = following
+
+    def end(self) -> int:
+        """Retorna o fim da última partida válida.
+
+        Returns:
+            int: A posição, no arquivo, do primeiro
+            byte após a última partida válida (o fim do
+            cabeçalho, caso não haja partidas)."""
+        end = HEADER.size
+        for offset in self.offsets():
+            end = offset + self._data[offset] + 2
+        return end
+
+    def games(self) -> Iterator[tuple[bytes, int]]:
+        """Percorre as partidas.
+
+        As consultas deste leitor não usam este
+        método: elas leem os bytes diretamente, sem
+        criar um objeto por partida.
+
+        Returns:
+            Iterator[tuple[bytes, int]]: As jogadas de
+            cada partida, um byte por jogada (o índice
+            da casa, com 'PLAYER_O' nas de 'O'), e o
+            seu resultado."""
+        data = self._data
+        for offset in self.offsets():
+            following = offset + data[offset] + 1
+            yield data[offset + 1 : following], data[following]
+
+    def __len__(self) -> int:
+        """A quantidade de partidas registradas."""
+        return sum(1 for _ in self.offsets())
+
+    def results(self) -> Outcomes:
+        """Conta os resultados de todas as partidas.
+
+        Returns:
+            Outcomes: A quantidade de partidas de cada
+            resultado."""
+        data = self._data
+        counts = [0] * (UNFINISHED + 1)
+        for offset in self.offsets():
+            counts[data[offset + data[offset] + 1]] += 1
+        return self._outcomes(counts)
+
+    def openings(
+        self, depth: int = 1
+    ) -> Counter[tuple[tuple[int, int], ...]]:
+        """Conta as aberturas das partidas: as suas
+        primeiras jogadas.
+
+        Args:
+            depth (int, optional): A quantidade de
+            jogadas de cada abertura. Valor padrão: 1.
+
+        Returns:
+            Counter[tuple[tuple[int, int], ...]]: A
+            quantidade de partidas de cada abertura,
+            pelas coordenadas ('row' e 'col') das suas
+            jogadas. Partidas mais curtas são
+            ignoradas."""
+        data = self._data
+        # Conta pelos bytes e converte somente as
+        # aberturas distintas.
+        counts = Counter(
+            data[offset + 1 : offset + 1 + depth]
+            for offset in self.offsets()
+            if data[offset] >= depth
+        )
+        return Counter(
+            {
+                tuple(
+                    divmod(byte & CELL_MASK, self.cols)
+                    for byte in opening
+                ): count
+                for opening, count in counts.items()
+            }
+        )
+
+    def results_by_first_move(
+        self,
+    ) -> dict[tuple[int, int], Outcomes]:
+        """Conta os resultados das partidas pela sua
+        primeira jogada.
+
+        Returns:
+            dict[tuple[int, int], Outcomes]: Os
+            resultados, pelas coordenadas ('row' e
+            'col') da primeira jogada."""
+        data = self._data
+        cells = self.rows * self.cols
+        counts = [[0] * (UNFINISHED + 1) for _ in range(cells)]
+        for offset in self.offsets():
+            count = data[offset]
+            if count:
+                cell = data[offset + 1] & CELL_MASK
+                counts[cell][data[offset + count + 1]] += 1
+        return {
+            divmod(cell, self.cols): self._outcomes(outcomes)
+            for cell, outcomes in enumerate(counts)
+            if any(outcomes)
+        }
+
+    @staticmethod
+    def _outcomes(counts: list[int]) -> Outcomes:
+        """Converte as contagens, pelo resultado, em
+        'Outcomes'.
+
+        Args:
+            counts (list[int]): A quantidade de
+            partidas de cada resultado.
+
+        Returns:
+            Outcomes: As mesmas contagens."""
+        return Outcomes(
+            x_wins=counts[X_WINS],
+            o_wins=counts[O_WINS],
+            draws=counts[DRAW],
+            unfinished=counts[UNFINISHED],
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Resume o registro das partidas "
+        "jogadas em um tabuleiro."
+    )
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument(
+        "--path",
+        default=None,
+        help="O arquivo do registro (padrão: ao lado "
+        "deste módulo).",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Quantas aberturas exibir.",
+    )
+    args = parser.parse_args()
+    game = Game(args.rows, args.cols, args.k)
+    log = GameLog.load(game, args.path)
+    if log is None:
+        parser.exit(1, "Registro ausente ou de outras regras.\n")
+    start = time.perf_counter()
+    results = log.results()
+    print(
+        f"{results.games} partidas: "
+        f"{results.x_wins} vitórias de X, "
+        f"{results.o_wins} de O, {results.draws} empates "
+        f"e {results.unfinished} abandonadas."
+    )
+    print("aberturas mais frequentes:")
+    for opening, count in log.openings(2).most_common(args.top):
+        print(f"  {opening}: {count}")
+    print("por primeira jogada:")
+    by_move = log.results_by_first_move()
+    for coords, outcomes in sorted(by_move.items()):
+        print(
+            f"  {coords}: {outcomes.games} partidas, "
+            f"X vence {outcomes.win_rate('X'):.1%}, "
+            f"O vence {outcomes.win_rate('O'):.1%}"
+        )
+    print(f"({time.perf_counter() - start:.2f}s)")
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,661 @@
+import math
+import multiprocessing
+import random
+import threading
+import time
+from typing import Optional
+from Engine.Evaluation import EVAL_BASE, evaluate
+from Engine.Position import Position
+from Engine.Search import NEARBY_LIMIT, SearchCancelled
+from TicTacToe.Game import Game
+
+# A constante de exploração do UCT.
+EXPLORATION = 0.7
+# O alargamento progressivo: um nó com 'n' visitas
+# possui no máximo 'WIDENING * sqrt(n)' filhos.
+WIDENING = 2
+# A quantidade máxima de jogadas aleatórias de cada
+# simulação. Em tabuleiros grandes, simulações até o
+# fim do jogo são longas e pouco informativas; depois
+# delas, o resultado é estimado pela avaliação
+# estática, como 'tanh(avaliação / EVAL_SCALE)'.
+PLAYOUT_LIMIT = 4
+EVAL_SCALE = 64
+# A quantidade de simulações quando não há limite de
+# tempo nem de simulações.
+DEFAULT_PLAYOUTS = 2000
+# A cada quantas simulações a busca verifica se deve
+# parar (menos um, usado como máscara).
+CHECK_INTERVAL = 8 - 1
+# O intervalo, em segundos, entre as verificações do
+# cancelamento enquanto os processos buscam.
+WAIT_INTERVAL = 0.01
+
+
+# As casas vizinhas de cada casa, já calculadas, por
+# tamanho de tabuleiro.
+_neighbors: dict[tuple[int, int], tuple[int, ...]] = {}
+
+
+def get_neighbors(pos: Position) -> tuple[int, ...]:
+    """Retorna, para cada casa do tabuleiro de uma
+    posição, a máscara das suas casas vizinhas
+    (inclusive nas diagonais), calculando-as somente
+    na primeira vez.
+
+    Args:
+        pos (Position): Uma posição do tabuleiro.
+
+    Returns:
+        tuple[int, ...]: A máscara das vizinhas de
+        cada casa."""
+    key = (pos.rows, pos.cols)
+    if key not in _neighbors:
+        work = Position(pos.rows, pos.cols, pos.win_masks)
+        masks = []
+        for index in range(pos.rows * pos.cols):
+            work.x = 1 << index
+            masks.append(work.nearby())
+        _neighbors[key] = tuple(masks)
+    return _neighbors[key]
+
+
+class _Node:
+    """Um nó da árvore de busca."""
+
+    __slots__ = (
+        "move",
+        "parent",
+        "children",
+        "untried",
+        "visits",
+        "wins",
+        "isMax",
+        "result",
+    )
+
+    def __init__(
+        self, move: Optional[int], parent, isMax: bool
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            move (Optional[int]): O bit da jogada que
+            levou ao nó (None na raiz).
+            parent (_Node): O nó pai (None na raiz).
+            isMax (bool): Se é o turno de 'X' no nó.
+        """
+        self.move = move
+        self.parent = parent
+        self.children = []
+        # As jogadas ainda não expandidas, calculadas
+        # na primeira visita ao nó.
+        self.untried = None
+        self.visits = 0
+        # As vitórias (empates valem meia vitória, e
+        # estimativas, uma fração) do jogador que fez a
+        # jogada do nó.
+        self.wins = 0.0
+        self.isMax = isMax
+        # O resultado do jogo (1 para vitória de 'X',
+        # -1 para vitória de 'O' e 0 para empate), caso
+        # o nó seja terminal.
+        self.result = None
+
+
+class MCTS:
+    """Motor de busca do 'bot' por Monte Carlo Tree
+    Search (UCT), para tabuleiros grandes, onde a
+    busca alfa-beta não chega ao fim do jogo.
+
+    Possui a mesma interface de 'Search' ('search' e
+    'best_move'). Com 'processes' maior que 1, cada
+    processo constrói a sua própria árvore a partir da
+    raiz (paralelismo na raiz), e as visitas das
+    jogadas da raiz são somadas ao final.
+
+    É experimental e usado somente pelo torneio
+    ('Engine.Tournament'): com o mesmo tempo por
+    jogada, ainda é mais fraco que a busca alfa-beta
+    nos tabuleiros grandes, e por isso não é oferecido
+    pelas interfaces."""
+
+    def __init__(
+        self,
+        playouts: Optional[int] = None,
+        processes: int = 1,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            playouts (int, optional): A quantidade
+            máxima de simulações por jogada (somando
+            todos os processos). Valor padrão: None,
+            isto é, limitada somente pelo tempo (ou
+            'DEFAULT_PLAYOUTS', sem limite de tempo).
+            processes (int, optional): A quantidade de
+            processos da busca. Valor padrão: 1.
+            seed (int, optional): A semente das
+            simulações. Valor padrão: None, isto é,
+            aleatória.
+        """
+        self.playouts = playouts
+        self.processes = processes
+        self._rng = random.Random(seed)
+        # A quantidade de simulações e a profundidade
+        # máxima da árvore na última busca.
+        self.nodes = 0
+        self.completed_depth = 0
+        # O conjunto de processos da busca paralela,
+        # criado já no construtor, para que a primeira
+        # busca não espere os processos iniciarem. O
+        # 'spawn' evita copiar, para os processos, as
+        # 'threads' de quem os cria (como a interface
+        # gráfica).
+        self._pool = None
+        if processes > 1:
+            self._start_pool()
+
+    def best_move(
+        self,
+        game: Game,
+        time_budget: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> tuple[int, int]:
+        """Escolhe a melhor jogada para o jogador do
+        turno atual de um jogo.
+
+        Args:
+            game (Game): O jogo, ainda não terminado.
+            time_budget (float, optional): O tempo
+            máximo da busca, em segundos. Valor padrão:
+            None, isto é, sem limite.
+            stop (threading.Event, optional): Um evento
+            que, quando ativado, cancela a busca. Valor
+            padrão: None.
+
+        Returns:
+            tuple[int, int]: As coordenadas ('x' e 'y')
+            da melhor jogada."""
+        return self.search(
+            game.position,
+            game._get_player_label() == "X",
+            time_budget,
+            stop,
+        )
+
+    def search(
+        self,
+        pos: Position,
+        isMax: bool,
+        time_budget: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> tuple[int, int]:
+        """Escolhe a melhor jogada de uma posição: a
+        jogada da raiz mais visitada.
+
+        Args:
+            pos (Position): A posição, ainda não
+            terminada. Não é alterada.
+            isMax: Se é o turno de 'X'.
+            time_budget (float, optional): O tempo
+            máximo da busca, em segundos. Valor padrão:
+            None, isto é, sem limite.
+            stop (threading.Event, optional): Um evento
+            que, quando ativado, cancela a busca. Valor
+            padrão: None.
+
+        Raises:
+            SearchCancelled: Caso 'stop' seja ativado.
+
+        Returns:
+            tuple[int, int]: As coordenadas ('x' e 'y')
+            da melhor jogada."""
+        self.nodes = 0
+        self.completed_depth = 0
+        # Jogadas forçadas dispensam a busca: vencer
+        # imediatamente ou bloquear a vitória imediata
+        # do adversário.
+        forced = self._forced_move(pos, isMax)
+        if forced is not None:
+            return pos.to_coords(forced)
+
+        playouts = self.playouts
+        if playouts is None and time_budget is None:
+            playouts = DEFAULT_PLAYOUTS
+        deadline = (
+            time.monotonic() + time_budget
+            if time_budget is not None
+            else None
+        )
+        # Os processos encerrados por um cancelamento
+        # são recriados na busca seguinte.
+        if self._pool is None and self.processes > 1:
+            self._start_pool()
+        if self._pool is not None:
+            stats = self._search_parallel(
+                pos, isMax, playouts, deadline, stop
+            )
+        else:
+            stats = self.tree_search(
+                pos.x, pos.o, pos, isMax, playouts,
+                deadline, stop,
+            )
+        visits = stats["visits"]
+        # Sem nenhuma simulação, usa a primeira jogada
+        # relevante.
+        if not visits:
+            moves = pos.candidates(NEARBY_LIMIT)
+            return pos.to_coords(moves & -moves)
+        bit = max(visits, key=lambda move: (visits[move], -move))
+        return pos.to_coords(bit)
+
+    def close(self) -> None:
+        """Encerra o conjunto de processos, caso
+        exista. Depois disso, a busca usa um único
+        processo."""
+        self.processes = 1
+        self._stop_pool()
+
+    def _start_pool(self) -> None:
+        """Cria o conjunto de processos da busca
+        paralela."""
+        context = multiprocessing.get_context("spawn")
+        self._pool = context.Pool(self.processes)
+
+    def _stop_pool(self) -> None:
+        """Encerra o conjunto de processos, caso
+        exista, interrompendo as buscas em andamento
+        nele."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _search_parallel(
+        self,
+        pos: Position,
+        isMax: bool,
+        playouts: Optional[int],
+        deadline: Optional[float],
+        stop: Optional[threading.Event],
+    ) -> dict:
+        """Distribui a busca entre os processos e soma
+        as visitas das jogadas da raiz.
+
+        O prazo é compartilhado com os processos, já
+        que 'time.monotonic' é o mesmo em todo o
+        sistema.
+
+        Returns:
+            dict: As estatísticas somadas."""
+        tasks = []
+        for index in range(self.processes):
+            # Divide as simulações entre os processos.
+            share = None
+            if playouts is not None:
+                share = playouts // self.processes + (
+                    index < playouts % self.processes
+                )
+            tasks.append(
+                (
+                    pos.rows,
+                    pos.cols,
+                    pos.win_masks,
+                    pos.x,
+                    pos.o,
+                    isMax,
+                    share,
+                    deadline,
+                    self._rng.getrandbits(64),
+                )
+            )
+        result = self._pool.map_async(_run_worker, tasks)
+        while not result.ready():
+            if stop is not None and stop.is_set():
+                # Os processos não verificam o evento:
+                # são encerrados, para não continuarem
+                # buscando até o prazo.
+                self._stop_pool()
+                raise SearchCancelled()
+            result.wait(WAIT_INTERVAL)
+        visits = {}
+        for stats in result.get():
+            for move, count in stats["visits"].items():
+                visits[move] = visits.get(move, 0) + count
+            self.nodes += stats["playouts"]
+            self.completed_depth = max(
+                self.completed_depth, stats["depth"]
+            )
+        return {"visits": visits}
+
+    def _forced_move(
+        self, pos: Position, isMax: bool
+    ) -> Optional[int]:
+        """Procura uma jogada que vence imediatamente
+        ou, não havendo, uma que bloqueia a vitória
+        imediata do adversário.
+
+        Uma casa que completa uma sequência é sempre
+        vizinha de alguma casa ocupada, logo basta
+        verificar as jogadas relevantes.
+
+        Args:
+            pos (Position): A posição.
+            isMax: Se é o turno de 'X'.
+
+        Returns:
+            Optional[int]: O bit da jogada, ou None.
+        """
+        own, other = (pos.x, pos.o) if isMax else (pos.o, pos.x)
+        block = None
+        moves = pos.candidates(NEARBY_LIMIT)
+        while moves:
+            bit = moves & -moves
+            if pos.wins_at(bit, own | bit):
+                return bit
+            if block is None and pos.wins_at(bit, other | bit):
+                block = bit
+            moves ^= bit
+        return block
+
+    def _ordered_moves(self, pos: Position) -> list[int]:
+        """Ordena as jogadas relevantes de uma posição
+        pela sua importância: cada sequência que passa
+        pela casa e contém 'n' 'símbolos' de um único
+        jogador vale 'EVAL_BASE ** n' (seja para
+        avançar a sequência, seja para bloqueá-la).
+
+        Args:
+            pos (Position): A posição.
+
+        Returns:
+            list[int]: Os bits das jogadas, da menos
+            para a mais importante (a próxima a ser
+            expandida é a última)."""
+        x, o = pos.x, pos.o
+        lines_through = pos.lines_through
+        scored = []
+        moves = pos.candidates(NEARBY_LIMIT)
+        while moves:
+            bit = moves & -moves
+            score = 0
+            for mask in lines_through[bit.bit_length() - 1]:
+                x_line = x & mask
+                o_line = o & mask
+                if not o_line:
+                    score += EVAL_BASE ** x_line.bit_count()
+                elif not x_line:
+                    score += EVAL_BASE ** o_line.bit_count()
+            # Desempata aleatoriamente.
+            scored.append((score, self._rng.random(), bit))
+            moves ^= bit
+        scored.sort()
+        return [bit for _, _, bit in scored]
+
+    def tree_search(
+        self,
+        x: int,
+        o: int,
+        pos: Position,
+        isMax: bool,
+        playouts: Optional[int],
+        deadline: Optional[float],
+        stop: Optional[threading.Event] = None,
+    ) -> dict:
+        """Constrói a árvore de busca em um único
+        processo.
+
+        Args:
+            x (int): As casas ocupadas por 'X'.
+            o (int): As casas ocupadas por 'O'.
+            pos (Position): Uma posição do mesmo
+            tabuleiro, usada para as sequências
+            vitoriosas e as jogadas relevantes.
+            isMax: Se é o turno de 'X'.
+            playouts (Optional[int]): A quantidade
+            máxima de simulações.
+            deadline (Optional[float]): O instante (em
+            'time.monotonic') em que o tempo se esgota.
+            stop (threading.Event, optional): Um evento
+            que, quando ativado, cancela a busca.
+
+        Raises:
+            SearchCancelled: Caso 'stop' seja ativado.
+
+        Returns:
+            dict: As visitas de cada jogada da raiz
+            ('visits'), a quantidade de simulações
+            ('playouts') e a profundidade máxima
+            ('depth')."""
+        rng = self._rng
+        # Uma posição auxiliar, alterada ao descer na
+        # árvore e restaurada a cada simulação (sem
+        # manter os 'hashes', não usados aqui).
+        work = Position(pos.rows, pos.cols, pos.win_masks, x, o)
+        root = _Node(None, None, isMax)
+        count = 0
+        max_depth = 0
+        while playouts is None or count < playouts:
+            # Faz ao menos uma simulação, mesmo que o
+            # tempo já tenha se esgotado.
+            if count and not count & CHECK_INTERVAL:
+                if stop is not None and stop.is_set():
+                    raise SearchCancelled()
+                if (
+                    deadline is not None
+                    and time.monotonic() >= deadline
+                ):
+                    break
+            count += 1
+            work.x, work.o = x, o
+            node = root
+            depth = 0
+
+            # Seleção: desce pelos nós já expandidos,
+            # escolhendo o filho de maior UCT.
+            while node.result is None:
+                if node.untried is None:
+                    # Uma jogada forçada é o único filho
+                    # do nó.
+                    forced = self._forced_move(work, node.isMax)
+                    if forced is not None:
+                        node.untried = [forced]
+                    else:
+                        node.untried = self._ordered_moves(work)
+                # Expande um novo filho somente quando o nó
+                # já foi visitado o suficiente, mantendo a
+                # busca nas jogadas mais promissoras.
+                if node.untried and (
+                    len(node.children)
+                    <= WIDENING * math.sqrt(node.visits)
+                ):
+                    break
+                if not node.children:
+                    break
+                log_visits = math.log(node.visits)
+                node = max(
+                    node.children,
+                    key=lambda child: (
+                        child.wins / child.visits
+                        + EXPLORATION
+                        * math.sqrt(log_visits / child.visits)
+                    ),
+                )
+                if node.isMax:
+                    work.o |= node.move
+                else:
+                    work.x |= node.move
+                depth += 1
+
+            # Expansão: adiciona um filho ainda não
+            # visitado.
+            if node.result is None and node.untried:
+                bit = node.untried.pop()
+                child = _Node(bit, node, not node.isMax)
+                if node.isMax:
+                    work.x |= bit
+                    stones = work.x
+                else:
+                    work.o |= bit
+                    stones = work.o
+                if work.wins_at(bit, stones):
+                    child.result = 1 if node.isMax else -1
+                elif work.is_full():
+                    child.result = 0
+                node.children.append(child)
+                node = child
+                depth += 1
+            max_depth = max(max_depth, depth)
+
+            # Simulação: joga aleatoriamente até o fim.
+            if node.result is not None:
+                result = node.result
+            else:
+                result = self._playout(work, node.isMax)
+
+            # Retropropagação: cada nó soma o resultado
+            # (entre 0 e 1) do ponto de vista de quem fez
+            # a sua jogada.
+            reward = (result + 1) / 2
+            while node is not None:
+                node.visits += 1
+                node.wins += 1 - reward if node.isMax else reward
+                node = node.parent
+
+        self.nodes = count
+        self.completed_depth = max_depth
+        return {
+            "visits": {
+                child.move: child.visits
+                for child in root.children
+            },
+            "playouts": count,
+            "depth": max_depth,
+        }
+
+    def _playout(self, pos: Position, isMax: bool) -> float:
+        """Simula o resto de um jogo a partir de uma
+        posição.
+
+        Cada jogador completa uma sequência quando
+        pode e, senão, bloqueia a sequência que o
+        adversário completaria; caso contrário, joga
+        em uma casa vazia aleatória, vizinha de alguma
+        casa ocupada. Após 'PLAYOUT_LIMIT' jogadas, o
+        resultado é estimado pela avaliação estática.
+
+        Args:
+            pos (Position): A posição. Não é alterada.
+            isMax: Se é o turno de 'X'.
+
+        Returns:
+            float: 1 para vitória de 'X', -1 para
+            vitória de 'O', 0 para empate, ou a
+            estimativa, entre -1 e 1."""
+        x, o = pos.x, pos.o
+        occupied = x | o
+        lines_through = pos.lines_through
+        # As casas que completariam uma sequência de
+        # cada jogador ('X' e 'O'), ou seja, as casas
+        # vazias de sequências em que falta uma única
+        # casa, sem nenhum 'símbolo' do adversário.
+        threats = ([], [])
+        for mask in pos.win_masks:
+            rest = mask & ~occupied
+            if rest and not rest & (rest - 1):
+                if not o & mask:
+                    threats[0].append(rest)
+                elif not x & mask:
+                    threats[1].append(rest)
+        # As casas vazias vizinhas das ocupadas, onde
+        # as jogadas aleatórias são feitas (como na
+        # busca, as casas distantes raramente importam).
+        neighbors = get_neighbors(pos)
+        frontier = []
+        nearby = pos.candidates(0)
+        while nearby:
+            bit = nearby & -nearby
+            frontier.append(bit)
+            nearby ^= bit
+        rng = self._rng
+        played = 0
+        while True:
+            if played == PLAYOUT_LIMIT:
+                score = evaluate(x, o, pos.win_masks, isMax)
+                return math.tanh(score / EVAL_SCALE)
+            played += 1
+            own = threats[0 if isMax else 1]
+            for bit in own:
+                if not occupied & bit:
+                    # Completa a sequência e vence.
+                    return 1 if isMax else -1
+            move = None
+            for bit in threats[1 if isMax else 0]:
+                if not occupied & bit:
+                    move = bit
+                    break
+            while move is None:
+                if not frontier:
+                    return 0
+                # Retira uma casa aleatória da fronteira.
+                index = rng.randrange(len(frontier))
+                frontier[index], frontier[-1] = (
+                    frontier[-1],
+                    frontier[index],
+                )
+                bit = frontier.pop()
+                if not occupied & bit:
+                    move = bit
+            cell = move.bit_length() - 1
+            rest = neighbors[cell] & ~occupied
+            while rest:
+                bit = rest & -rest
+                frontier.append(bit)
+                rest ^= bit
+            occupied |= move
+            if isMax:
+                x |= move
+                stones, other = x, o
+            else:
+                o |= move
+                stones, other = o, x
+            # Registra as novas casas que completariam
+            # uma sequência do jogador.
+            for mask in lines_through[cell]:
+                if other & mask:
+                    continue
+                rest = mask & ~occupied
+                if rest and not rest & (rest - 1):
+                    own.append(rest)
+            isMax = not isMax
+
+
+def _run_worker(task: tuple) -> dict:
+    """Executa, em um processo do conjunto, a busca a
+    partir da raiz.
+
+    Args:
+        task (tuple): O tabuleiro ('rows', 'cols' e
+        'win_masks'), a posição ('x' e 'o'), o turno,
+        as simulações, o prazo e a semente.
+
+    Returns:
+        dict: As estatísticas de 'MCTS.tree_search'."""
+    (
+        rows,
+        cols,
+        win_masks,
+        x,
+        o,
+        isMax,
+        playouts,
+        deadline,
+        seed,
+    ) = task
+    pos = Position(rows, cols, win_masks, x, o)
+    engine = MCTS(seed=seed)
+    return engine.tree_search(
+        x, o, pos, isMax, playouts, deadline
+    )
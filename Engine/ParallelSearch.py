@@ -0,0 +1,357 @@
+import argparse
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from typing import Optional
+from Engine.Position import Position
+from Engine.Search import Search, SearchTimeout
+from Engine.SharedTable import SharedTranspositionTable
+from Engine.SolvedTable import SolvedTable
+
+# O maior valor do ruído somado ao histórico de podas
+# de cada casa nos processos auxiliares, para que cada
+# um ordene as jogadas de um jeito diferente.
+HISTORY_NOISE = 16
+
+
+class ParallelSearch(Search):
+    """Busca alfa-beta paralela ('Lazy SMP').
+
+    O processo principal e os processos auxiliares
+    buscam a mesma raiz, por aprofundamento iterativo,
+    compartilhando uma única tabela de transposição em
+    memória compartilhada. Cada auxiliar ordena as
+    jogadas de um jeito diferente (e metade deles busca
+    um nível mais fundo), de modo que os processos
+    exploram partes diferentes da árvore e aproveitam,
+    pela tabela, os resultados uns dos outros.
+
+    A jogada escolhida é a do processo que concluiu a
+    maior profundidade (o principal, em caso de
+    empate)."""
+
+    def __init__(
+        self,
+        processes: int = 2,
+        slots: int = 1 << 20,
+        solved: Optional[SolvedTable] = None,
+        depth: Optional[int] = None,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            processes (int, optional): A quantidade de
+            processos da busca, incluindo o principal.
+            Valor padrão: 2.
+            slots (int, optional): A quantidade de
+            entradas da tabela compartilhada. Valor
+            padrão: 2^20.
+            solved (SolvedTable, optional): A tabela
+            com o jogo resolvido. Valor padrão: None.
+            depth (int, optional): A profundidade
+            máxima da busca. Valor padrão: None, isto
+            é, 'default_depth' do tabuleiro.
+        """
+        self._shared = SharedTranspositionTable(slots)
+        super().__init__(
+            table=self._shared, solved=solved, depth=depth
+        )
+        self.processes = processes
+        # A quantidade de nós visitados, na última
+        # busca, somando todos os processos.
+        self.total_nodes = 0
+        # O evento que interrompe os auxiliares quando
+        # o processo principal termina, e o conjunto de
+        # processos auxiliares, criado já no construtor
+        # (com 'spawn', como em 'MCTS').
+        self._pool = None
+        self._halt = None
+        if processes > 1:
+            context = multiprocessing.get_context("spawn")
+            self._halt = context.Event()
+            self._pool = context.Pool(
+                processes - 1,
+                initializer=_init_helper,
+                initargs=(
+                    self._shared.name,
+                    self._shared.slots,
+                    self._halt,
+                ),
+            )
+
+    def search(
+        self,
+        pos: Position,
+        isMax: bool,
+        time_budget: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> tuple[int, int]:
+        """Escolhe a melhor jogada de uma posição,
+        buscando-a em todos os processos.
+
+        Args:
+            pos (Position): A posição, ainda não
+            terminada. É restaurada ao final da busca.
+            isMax: Se é o turno de 'X'.
+            time_budget (float, optional): O tempo
+            máximo da busca, em segundos. Valor padrão:
+            None, isto é, sem limite.
+            stop (threading.Event, optional): Um evento
+            que, quando ativado, cancela a busca. Valor
+            padrão: None.
+
+        Raises:
+            SearchCancelled: Caso 'stop' seja ativado.
+
+        Returns:
+            tuple[int, int]: As coordenadas ('x' e 'y')
+            da melhor jogada."""
+        # Sem auxiliares, ou com o jogo resolvido,
+        # busca somente no processo principal.
+        if (
+            self._pool is None
+            or self._solved_move(pos) is not None
+        ):
+            move = super().search(pos, isMax, time_budget, stop)
+            self.total_nodes = self.nodes
+            return move
+
+        deadline = (
+            time.monotonic() + time_budget
+            if time_budget is not None
+            else None
+        )
+        self._halt.clear()
+        tasks = [
+            (
+                pos.rows,
+                pos.cols,
+                pos.win_masks,
+                pos.x,
+                pos.o,
+                isMax,
+                self.depth,
+                deadline,
+                index,
+            )
+            for index in range(1, self.processes)
+        ]
+        result = self._pool.map_async(_run_helper, tasks)
+        try:
+            move = super().search(pos, isMax, time_budget, stop)
+        finally:
+            # Interrompe os auxiliares, que devolvem a
+            # jogada da última profundidade concluída,
+            # e os espera, já que a próxima busca usa a
+            # mesma tabela e o mesmo evento.
+            self._halt.set()
+            result.wait()
+        self.total_nodes = self.nodes
+        for depth, coords, nodes in result.get():
+            self.total_nodes += nodes
+            if depth > self.completed_depth:
+                self.completed_depth = depth
+                move = coords
+        return move
+
+    def close(self) -> None:
+        """Encerra os processos auxiliares e remove a
+        tabela compartilhada."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._shared.close()
+
+
+class _HelperSearch(Search):
+    """A busca de um processo auxiliar: ordena as
+    jogadas com um ruído no histórico de podas e, nos
+    auxiliares de índice ímpar, busca cada iteração um
+    nível mais fundo.
+
+    É interrompida pelo evento 'halt', tratado como o
+    fim do tempo, de modo que devolve a jogada da
+    última profundidade concluída."""
+
+    def __init__(
+        self,
+        table: SharedTranspositionTable,
+        halt,
+        index: int,
+        depth: Optional[int] = None,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            table (SharedTranspositionTable): A tabela
+            compartilhada.
+            halt (multiprocessing.Event): O evento que
+            interrompe a busca.
+            index (int): O índice do auxiliar.
+            depth (int, optional): A profundidade
+            máxima da busca. Valor padrão: None.
+        """
+        super().__init__(table=table, depth=depth)
+        self._halt = halt
+        self._rng = random.Random(index)
+        self._offset = index % 2
+        # A profundidade realmente buscada na última
+        # iteração.
+        self.searched_depth = 0
+
+    def _check_limits(self) -> None:
+        """Interrompe a busca caso o processo principal
+        tenha terminado, ou pelos limites de 'Search'.
+
+        Raises:
+            SearchTimeout: Caso o processo principal
+            tenha terminado ou o tempo tenha se
+            esgotado."""
+        if self._halt.is_set():
+            raise SearchTimeout()
+        super()._check_limits()
+
+    def _reset_ordering(self, pos: Position, depth: int) -> None:
+        """Limpa a ordenação, como em 'Search', e soma
+        um ruído ao histórico de podas.
+
+        Args:
+            pos (Position): A posição da raiz.
+            depth (int): A maior profundidade a ser
+            buscada.
+        """
+        super()._reset_ordering(pos, depth + self._offset)
+        for history in self._history:
+            for cell in range(len(history)):
+                history[cell] = self._rng.randrange(HISTORY_NOISE)
+
+    def _root(
+        self, pos: Position, isMax, alpha, beta, depth: int
+    ):
+        """Busca a raiz como em 'Search', com a
+        profundidade deslocada pelo índice do auxiliar.
+
+        Returns:
+            O melhor valor encontrado e a melhor jogada
+            ('x' e 'y')."""
+        depth = min(depth + self._offset, pos.empty.bit_count())
+        if self.depth is not None:
+            depth = min(depth, self.depth)
+        result = super()._root(pos, isMax, alpha, beta, depth)
+        self.searched_depth = depth
+        return result
+
+
+# A tabela compartilhada e o evento de interrupção de
+# cada processo auxiliar, obtidos ao iniciar o
+# processo.
+_helper_args: tuple = ()
+
+
+def _init_helper(name: str, slots: int, halt) -> None:
+    """Inicializa um processo auxiliar, acessando a
+    tabela compartilhada.
+
+    Args:
+        name (str): O nome da tabela compartilhada.
+        slots (int): A quantidade de entradas da
+        tabela.
+        halt (multiprocessing.Event): O evento que
+        interrompe as buscas.
+    """
+    global _helper_args
+    _helper_args = (
+        SharedTranspositionTable(slots, name=name),
+        halt,
+    )
+
+
+def _run_helper(task: tuple) -> tuple:
+    """Executa, em um processo auxiliar, a busca a
+    partir da raiz.
+
+    Args:
+        task (tuple): O tabuleiro ('rows', 'cols' e
+        'win_masks'), a posição ('x' e 'o'), o turno, a
+        profundidade máxima, o prazo e o índice do
+        auxiliar.
+
+    Returns:
+        tuple: A profundidade concluída (0 caso
+        nenhuma), a melhor jogada e os nós
+        visitados."""
+    rows, cols, win_masks, x, o, isMax, depth, deadline, index = (
+        task
+    )
+    table, halt = _helper_args
+    engine = _HelperSearch(table, halt, index, depth)
+    pos = Position(rows, cols, win_masks, x, o)
+    # Um evento local, nunca ativado, faz com que a
+    # busca verifique os seus limites (e, assim, o
+    # evento 'halt') mesmo sem prazo.
+    time_budget = (
+        max(0.0, deadline - time.monotonic())
+        if deadline is not None
+        else None
+    )
+    coords = engine.search(
+        pos, isMax, time_budget, threading.Event()
+    )
+    depth = engine.searched_depth if engine.completed_depth else 0
+    return (depth, coords, engine.nodes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Mede a vazão (nós por segundo, "
+        "somando os processos) e a profundidade "
+        "alcançada pela busca paralela."
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="As quantidades de processos a comparar.",
+    )
+    parser.add_argument(
+        "--time",
+        type=float,
+        default=1.0,
+        help="O tempo, em segundos, de cada busca.",
+    )
+    args = parser.parse_args()
+
+    # Garante que nada aqui dependa do 'tkinter'.
+    sys.modules["tkinter"] = None
+    from Engine.Benchmark import CORPUS, load_case
+
+    cases = [case for case in CORPUS if case.rows > 3]
+    print(
+        f"{'posição':<12}{'processos':>10}{'nós':>10}"
+        f"{'nós/s':>12}{'prof.':>7}{'jogada':>10}"
+    )
+    for case in cases:
+        for processes in args.processes:
+            engine = ParallelSearch(processes)
+            try:
+                game = load_case(case)
+                start = time.perf_counter()
+                move = engine.best_move(game, args.time)
+                elapsed = time.perf_counter() - start
+            finally:
+                engine.close()
+            print(
+                f"{case.name:<12}{processes:>10}"
+                f"{engine.total_nodes:>10}"
+                f"{engine.total_nodes / elapsed:>12.0f}"
+                f"{engine.completed_depth:>7}"
+                f"{str(move):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
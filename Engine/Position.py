@@ -0,0 +1,329 @@
+from typing import Any, Iterator
+from Engine.Zobrist import HASH_MASK, get_zobrist
+from Move import Move
+
+# As máscaras das sequências que passam por cada casa,
+# já calculadas, por conjunto de sequências.
+_lines_through: dict[
+    tuple[int, tuple[int, ...]], tuple[tuple[int, ...], ...]
+] = {}
+
+
+def get_lines_through(
+    cells: int, win_masks: tuple[int, ...]
+) -> tuple[tuple[int, ...], ...]:
+    """Retorna, para cada casa, as máscaras das
+    sequências vitoriosas que passam por ela,
+    calculando-as somente na primeira vez.
+
+    Args:
+        cells (int): A quantidade de casas.
+        win_masks (tuple[int, ...]): As máscaras das
+        sequências vitoriosas.
+
+    Returns:
+        tuple[tuple[int, ...], ...]: As máscaras das
+        sequências de cada casa."""
+    key = (cells, win_masks)
+    if key not in _lines_through:
+        lines = [[] for _ in range(cells)]
+        for mask in win_masks:
+            rest = mask
+            while rest:
+                bit = rest & -rest
+                lines[bit.bit_length() - 1].append(mask)
+                rest ^= bit
+        _lines_through[key] = tuple(
+            tuple(masks) for masks in lines
+        )
+    return _lines_through[key]
+
+
+class Position:
+    """Representação compacta (bitboard) de um estado
+    do jogo da velha.
+
+    Cada jogador é representado por um único inteiro,
+    onde o bit 'row * cols + col' indica se a casa
+    ('row', 'col') foi ocupada por ele."""
+
+    __slots__ = (
+        "rows",
+        "cols",
+        "x",
+        "o",
+        "win_masks",
+        "full_mask",
+        "lines_through",
+        "zobrist",
+        "hashes",
+        "_inner_cols",
+    )
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        win_masks: tuple[int, ...],
+        x: int = 0,
+        o: int = 0,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            rows (int): A quantidade de linhas do
+            tabuleiro.
+            cols (int): A quantidade de colunas do
+            tabuleiro.
+            win_masks (tuple[int, ...]): As máscaras
+            das sequências vitoriosas.
+            x (int, optional): As casas ocupadas por
+            'X'. Valor padrão: 0.
+            o (int, optional): As casas ocupadas por
+            'O'. Valor padrão: 0.
+        """
+        self.rows = rows
+        self.cols = cols
+        # As casas ocupadas por cada jogador.
+        self.x = x
+        self.o = o
+        # As máscaras das sequências vitoriosas.
+        self.win_masks = win_masks
+        # A máscara com todas as casas do tabuleiro.
+        self.full_mask = (1 << (rows * cols)) - 1
+        # As sequências que passam por cada casa.
+        self.lines_through = get_lines_through(
+            rows * cols, win_masks
+        )
+        # As máscaras das casas que não estão na
+        # primeira e na última coluna, usadas para
+        # deslocar bits sem 'trocar' de linha.
+        first_col = sum(
+            1 << (row * cols) for row in range(rows)
+        )
+        self._inner_cols = (
+            self.full_mask & ~first_col,
+            self.full_mask & ~(first_col << (cols - 1)),
+        )
+        # As chaves de Zobrist do tabuleiro e os
+        # 'hashes' da posição em cada simetria. Quem
+        # altera 'x' ou 'o' deve aplicar, com XOR, a
+        # chave da casa em 'hashes'.
+        self.zobrist = get_zobrist(rows, cols)
+        self.hashes = self.zobrist.hashes(x, o)
+
+    @property
+    def hash(self) -> int:
+        """O 'hash' de Zobrist, de 64 bits, da posição
+        (incluindo o jogador do turno)."""
+        return self.hashes & HASH_MASK
+
+    @staticmethod
+    def get_win_masks(
+        winning_positions: list[Any], cols: int
+    ) -> tuple[int, ...]:
+        """Converte as sequências vitoriosas, vindas de
+        'Game._get_winning_positions', em máscaras.
+
+        Args:
+            winning_positions (list[Any]): As
+            sequências das posições vitoriosas.
+            cols (int): A quantidade de colunas do
+            tabuleiro.
+
+        Returns:
+            tuple[int, ...]: Uma máscara por sequência
+            vitoriosa."""
+        masks = []
+        for combo in winning_positions:
+            mask = 0
+            for row, col in combo:
+                mask |= 1 << (row * cols + col)
+            masks.append(mask)
+        return tuple(masks)
+
+    @classmethod
+    def from_moves(
+        cls,
+        moves: list[list[Move]],
+        winning_positions: list[Any],
+    ) -> "Position":
+        """Cria uma posição a partir do 'Grid' de
+        jogadas usado por 'Game'.
+
+        Args:
+            moves (list[list[Move]]): O estado atual
+            do jogo ('Game._current_moves').
+            winning_positions (list[Any]): As
+            sequências das posições vitoriosas.
+
+        Returns:
+            Position: A posição equivalente."""
+        rows, cols = len(moves), len(moves[0])
+        x = o = 0
+        for row in moves:
+            for move in row:
+                bit = 1 << (move.row * cols + move.col)
+                if move.label == "X":
+                    x |= bit
+                elif move.label == "O":
+                    o |= bit
+        win_masks = cls.get_win_masks(
+            winning_positions, cols
+        )
+        return cls(rows, cols, win_masks, x, o)
+
+    def to_moves(self) -> list[list[Move]]:
+        """Converte a posição no 'Grid' de jogadas
+        usado por 'Game'.
+
+        Returns:
+            list[list[Move]]: O estado do jogo
+            equivalente."""
+        return [
+            [
+                Move(row, col, self.get_label(row, col))
+                for col in range(self.cols)
+            ]
+            for row in range(self.rows)
+        ]
+
+    def copy(self) -> "Position":
+        """Retorna uma cópia da posição.
+
+        Returns:
+            Position: A cópia da posição."""
+        return Position(
+            self.rows,
+            self.cols,
+            self.win_masks,
+            self.x,
+            self.o,
+        )
+
+    def get_label(self, row: int, col: int) -> str:
+        """Retorna o 'símbolo' contido em uma casa.
+
+        Args:
+            row (int): O índice da linha da casa.
+            col (int): O índice da coluna da casa.
+
+        Returns:
+            str: O 'símbolo' contido na casa."""
+        bit = 1 << (row * self.cols + col)
+        if self.x & bit:
+            return "X"
+        if self.o & bit:
+            return "O"
+        return ""
+
+    def to_coords(self, bit: int) -> tuple[int, int]:
+        """Converte o bit de uma casa em suas
+        coordenadas.
+
+        Args:
+            bit (int): O bit referente à casa.
+
+        Returns:
+            tuple[int, int]: A linha e a coluna da
+            casa."""
+        return divmod(bit.bit_length() - 1, self.cols)
+
+    @property
+    def empty(self) -> int:
+        """A máscara das casas ainda vazias."""
+        return self.full_mask & ~(self.x | self.o)
+
+    def legal_moves(self) -> Iterator[int]:
+        """Itera sobre as casas vazias, na ordem das
+        linhas, retornando o bit de cada uma.
+
+        Yields:
+            int: O bit de uma casa vazia."""
+        empty = self.full_mask & ~(self.x | self.o)
+        while empty:
+            bit = empty & -empty
+            yield bit
+            empty ^= bit
+
+    def nearby(self) -> int:
+        """Retorna a máscara das casas vazias vizinhas
+        (inclusive nas diagonais) de alguma casa
+        ocupada.
+
+        Returns:
+            int: A máscara das casas vizinhas."""
+        occupied = self.x | self.o
+        not_first, not_last = self._inner_cols
+        # Expande as casas ocupadas para os lados e,
+        # então, para cima e para baixo.
+        spread = (
+            occupied
+            | ((occupied << 1) & not_first)
+            | ((occupied >> 1) & not_last)
+        )
+        spread |= (spread << self.cols) | (
+            spread >> self.cols
+        )
+        return spread & self.full_mask & ~occupied
+
+    def candidates(self, nearby_limit: int) -> int:
+        """Retorna a máscara das jogadas relevantes.
+
+        Em tabuleiros com mais de 'nearby_limit'
+        casas, somente as casas vizinhas das já
+        ocupadas são relevantes (ou o centro, caso o
+        tabuleiro esteja vazio).
+
+        Args:
+            nearby_limit (int): A quantidade máxima de
+            casas em que todas as casas vazias são
+            consideradas.
+
+        Returns:
+            int: A máscara das jogadas."""
+        if self.rows * self.cols <= nearby_limit:
+            return self.empty
+        nearby = self.nearby()
+        if nearby or self.x | self.o:
+            return nearby
+        center = (self.rows // 2) * self.cols + self.cols // 2
+        return 1 << center
+
+    def has_winner(self) -> bool:
+        """Verifica se algum jogador completou uma
+        sequência vitoriosa.
+
+        Returns:
+            bool: Se existe um vencedor."""
+        x, o = self.x, self.o
+        for mask in self.win_masks:
+            if x & mask == mask or o & mask == mask:
+                return True
+        return False
+
+    def wins_at(self, bit: int, stones: int) -> bool:
+        """Verifica se as casas de um jogador completam
+        alguma sequência que passa por uma casa.
+
+        Args:
+            bit (int): O bit da casa, geralmente a
+            última jogada.
+            stones (int): As casas do jogador que a
+            ocupou.
+
+        Returns:
+            bool: Se alguma sequência foi completada."""
+        for mask in self.lines_through[
+            bit.bit_length() - 1
+        ]:
+            if stones & mask == mask:
+                return True
+        return False
+
+    def is_full(self) -> bool:
+        """Verifica se todas as casas estão ocupadas.
+
+        Returns:
+            bool: Se o tabuleiro está cheio."""
+        return (self.x | self.o) == self.full_mask
@@ -0,0 +1,939 @@
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+from Engine.Evaluation import DEFAULT_WEIGHTS, Evaluator, Weights
+from Engine.Position import Position
+from Engine.SolvedTable import SolvedTable
+from Engine.TranspositionTable import (
+    EXACT,
+    LOWER,
+    UPPER,
+    TranspositionTable,
+)
+from TicTacToe.Game import Game
+
+# O valor de uma vitória de 'X' (ou, negativo, de
+# 'O'). É descontado pela quantidade de casas ocupadas,
+# de modo que vitórias mais rápidas valem mais.
+WIN = 1 << 30
+# Tabuleiros com mais casas do que isto só consideram
+# as casas vizinhas das já ocupadas.
+NEARBY_LIMIT = 16
+# A cada quantos nós a busca verifica se deve parar
+# (menos um, usado como máscara).
+CHECK_INTERVAL = 16 - 1
+
+
+class Difficulty(NamedTuple):
+    """Um nível de dificuldade do 'bot'."""
+
+    # O nome do nível, usado na linha de comando.
+    name: str
+    # O nome exibido na interface.
+    label: str
+    # A profundidade máxima da busca (None para não
+    # limitar a profundidade).
+    depth: Optional[int]
+    # O tempo máximo, em segundos, de cada jogada.
+    time_budget: Optional[float]
+
+
+# Os níveis de dificuldade, do mais fácil ao mais
+# difícil. Todos limitam o tempo de cada jogada,
+# qualquer que seja o tamanho do tabuleiro.
+DIFFICULTIES = (
+    Difficulty("facil", "Fácil", 1, 0.05),
+    Difficulty("medio", "Médio", 3, 0.05),
+    Difficulty("dificil", "Difícil", None, 0.05),
+    Difficulty("maximo", "Máximo", None, 1.0),
+)
+# O nível de dificuldade padrão.
+DEFAULT_DIFFICULTY = "dificil"
+
+
+def get_difficulty(name: str) -> Difficulty:
+    """Retorna um nível de dificuldade pelo nome.
+
+    Args:
+        name (str): O nome do nível.
+
+    Raises:
+        ValueError: Caso o nível não exista.
+
+    Returns:
+        Difficulty: O nível de dificuldade."""
+    for difficulty in DIFFICULTIES:
+        if difficulty.name == name:
+            return difficulty
+    raise ValueError(f"Dificuldade desconhecida: {name!r}.")
+
+
+class SearchAborted(Exception):
+    """A busca foi interrompida antes de terminar."""
+
+
+class SearchTimeout(SearchAborted):
+    """O tempo da busca se esgotou."""
+
+
+class SearchCancelled(SearchAborted):
+    """A busca foi cancelada por quem a iniciou."""
+
+
+def default_depth(rows: int, cols: int) -> int:
+    """Retorna a profundidade padrão da busca para um
+    tabuleiro, mantendo o tempo de resposta limitado.
+
+    Args:
+        rows (int): A quantidade de linhas.
+        cols (int): A quantidade de colunas.
+
+    Returns:
+        int: A profundidade máxima, em jogadas."""
+    cells = rows * cols
+    # O jogo clássico é resolvido até o final.
+    if cells <= 9:
+        return cells
+    if cells <= 16:
+        return 6
+    if cells <= 25:
+        return 4
+    if cells <= 49:
+        return 3
+    return 2
+
+
+class Search:
+    """Motor de busca do 'bot': 'Minimax' com podagem
+    alfa-beta sobre uma 'Position'.
+
+    Não depende do 'tkinter', podendo ser usado tanto
+    pelo 'Board' quanto por processos sem tela."""
+
+    def __init__(
+        self,
+        table: Optional[TranspositionTable] = None,
+        solved: Optional[SolvedTable] = None,
+        depth: Optional[int] = None,
+        weights: Weights = DEFAULT_WEIGHTS,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            table (TranspositionTable, optional): A
+            tabela de transposição, compartilhada entre
+            jogadas e partidas. Valor padrão: uma nova
+            tabela.
+            solved (SolvedTable, optional): A tabela
+            com o jogo resolvido, consultada somente
+            pelas buscas sem limite de profundidade.
+            Valor padrão: None, isto é, sempre realiza
+            a busca.
+            depth (int, optional): A profundidade
+            máxima da busca. Valor padrão: None, isto
+            é, 'default_depth' do tabuleiro.
+            weights (Weights, optional): Os pesos da
+            avaliação estática. Valor padrão:
+            'DEFAULT_WEIGHTS'.
+        """
+        # A tabela de transposição do 'Minimax'.
+        self._table = (
+            table
+            if table is not None
+            else TranspositionTable()
+        )
+        # A tabela com o jogo resolvido.
+        self._solved = solved
+        # A profundidade máxima da busca.
+        self.depth = depth
+        # Os pesos da avaliação estática e a avaliação
+        # incremental da busca atual.
+        self.weights = weights
+        self._evaluator = None
+        # A quantidade de nós visitados na última
+        # busca.
+        self.nodes = 0
+        # Os limites da busca atual: o instante (em
+        # 'time.monotonic') em que o tempo se esgota e
+        # o evento que a cancela.
+        self._deadline = None
+        self._stop = None
+        self._limited = False
+        # A maior profundidade concluída na última
+        # busca.
+        self.completed_depth = 0
+        # A profundidade da raiz e a melhor jogada já
+        # encontrada nela, usada caso o tempo se
+        # esgote.
+        self._root_depth = 0
+        self._root_best = None
+        # As jogadas 'killer' e o histórico de podas
+        # da busca atual.
+        self._killers = []
+        self._history = ([], [])
+
+    def best_move(
+        self,
+        game: Game,
+        time_budget: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> tuple[int, int]:
+        """Escolhe a melhor jogada para o jogador do
+        turno atual de um jogo.
+
+        A busca faz e desfaz as jogadas na própria
+        posição do jogo, sem cópias.
+
+        Args:
+            game (Game): O jogo, ainda não terminado.
+            time_budget (float, optional): O tempo
+            máximo da busca, em segundos. Valor padrão:
+            None, isto é, sem limite.
+            stop (threading.Event, optional): Um evento
+            que, quando ativado, cancela a busca. Valor
+            padrão: None.
+
+        Returns:
+            tuple[int, int]: As coordenadas ('x' e 'y')
+            da melhor jogada."""
+        return self.search(
+            game.position,
+            game._get_player_label() == "X",
+            time_budget,
+            stop,
+        )
+
+    def search(
+        self,
+        pos: Position,
+        isMax: bool,
+        time_budget: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> tuple[int, int]:
+        """Escolhe a melhor jogada de uma posição.
+
+        A busca é feita por aprofundamento iterativo.
+        Caso o tempo se esgote, retorna a melhor jogada
+        da última profundidade concluída.
+
+        Args:
+            pos (Position): A posição, ainda não
+            terminada. É restaurada ao final da busca.
+            isMax: Se é o turno de 'X'.
+            time_budget (float, optional): O tempo
+            máximo da busca, em segundos. Valor padrão:
+            None, isto é, sem limite.
+            stop (threading.Event, optional): Um evento
+            que, quando ativado, cancela a busca. Valor
+            padrão: None.
+
+        Raises:
+            SearchCancelled: Caso 'stop' seja ativado.
+
+        Returns:
+            tuple[int, int]: As coordenadas ('x' e 'y')
+            da melhor jogada."""
+        solved = self._solved_move(pos)
+        if solved is not None:
+            return solved
+
+        depth = self._start(pos, time_budget, stop)
+        # O valor de uma vitória (ou derrota) forçada.
+        forced = WIN - pos.rows * pos.cols
+        best_move = None
+        x, o, hashes = pos.x, pos.o, pos.hashes
+        try:
+            # Aprofundamento iterativo: busca com
+            # profundidades crescentes, cada uma
+            # ordenando as jogadas da seguinte pela
+            # tabela de transposição, pelas jogadas
+            # 'killer' e pelo histórico.
+            for current in range(1, depth + 1):
+                value, best_move = self._root(
+                    pos,
+                    isMax,
+                    float("-inf"),
+                    float("inf"),
+                    current,
+                )
+                self.completed_depth = current
+                # Uma vitória (ou derrota) forçada não
+                # muda com buscas mais profundas.
+                if abs(value) >= forced:
+                    break
+            return best_move
+        except SearchTimeout:
+            # Restaura a posição, alterada no meio da
+            # busca, e usa a melhor jogada da última
+            # profundidade concluída.
+            pos.x, pos.o, pos.hashes = x, o, hashes
+            if best_move is not None:
+                return best_move
+            bit = self._root_best
+            if bit is None:
+                moves = self._candidates(pos)
+                bit = moves & -moves
+            return pos.to_coords(bit)
+        except SearchCancelled:
+            pos.x, pos.o, pos.hashes = x, o, hashes
+            raise
+        finally:
+            self._limited = False
+
+    def _solved_move(
+        self, pos: Position
+    ) -> Optional[tuple[int, int]]:
+        """Consulta a tabela com o jogo resolvido, caso
+        ela tenha sido carregada e a profundidade da
+        busca não seja limitada.
+
+        Com a profundidade limitada (pelos níveis de
+        dificuldade mais fáceis), a tabela é ignorada:
+        a busca é feita com esse limite, e o 'bot' não
+        joga perfeitamente. O tempo máximo não impede
+        a consulta, pois a tabela responde de imediato
+        com a jogada que a busca completa encontraria.
+
+        Args:
+            pos (Position): A posição.
+
+        Returns:
+            Optional[tuple[int, int]]: As coordenadas
+            ('x' e 'y') da melhor jogada, ou None caso
+            a busca deva ser feita."""
+        if self._solved is None or self.depth is not None:
+            return None
+        res = self._solved.lookup(pos)
+        return res[1] if res is not None else None
+
+    def analyze(
+        self,
+        pos: Position,
+        isMax: bool,
+        time_budget: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+        on_depth: Optional[Callable[[int, dict], None]] = None,
+    ) -> dict[tuple[int, int], int]:
+        """Avalia todas as jogadas de uma posição (o
+        modo de análise, ou 'multi-PV').
+
+        Ao contrário de 'search', que só prova que as
+        demais jogadas não superam a melhor, cada
+        jogada da raiz recebe o seu valor exato, com a
+        janela completa. Todas são buscadas em uma
+        única busca por aprofundamento iterativo, que
+        compartilha a tabela de transposição e a
+        ordenação entre as jogadas e as profundidades.
+
+        Args:
+            pos (Position): A posição, ainda não
+            terminada. É restaurada ao final da busca.
+            isMax: Se é o turno de 'X'.
+            time_budget (float, optional): O tempo
+            máximo da busca, em segundos. Valor padrão:
+            None, isto é, sem limite.
+            stop (threading.Event, optional): Um evento
+            que, quando ativado, cancela a busca. Valor
+            padrão: None.
+            on_depth (Callable, optional): Chamada ao
+            concluir cada profundidade, com ela e com os
+            valores das jogadas. Valor padrão: None.
+
+        Raises:
+            SearchCancelled: Caso 'stop' seja ativado.
+
+        Returns:
+            dict[tuple[int, int], int]: O valor de cada
+            jogada considerada (pelas suas coordenadas),
+            do ponto de vista de 'X', na última
+            profundidade concluída."""
+        depth = self._start(pos, time_budget, stop)
+        forced = WIN - pos.rows * pos.cols
+        # Os valores da última profundidade concluída,
+        # do ponto de vista do jogador do turno.
+        scores = {}
+        moves = self._candidates(pos)
+        while moves:
+            bit = moves & -moves
+            scores[bit] = 0
+            moves ^= bit
+        keys = pos.zobrist.x if isMax else pos.zobrist.o
+        x, o, hashes = pos.x, pos.o, pos.hashes
+        try:
+            for current in range(1, depth + 1):
+                self._root_depth = current
+                self._evaluator = Evaluator(pos, self.weights)
+                evaluator = self._evaluator
+                # As jogadas são buscadas da melhor para
+                # a pior da profundidade anterior.
+                values = {}
+                order = sorted(scores, key=scores.get, reverse=True)
+                for bit in order:
+                    cell = bit.bit_length() - 1
+                    if isMax:
+                        pos.x |= bit
+                    else:
+                        pos.o |= bit
+                    pos.hashes ^= keys[cell]
+                    evaluator.push(cell, isMax)
+                    values[bit] = -self._negamax(
+                        pos,
+                        float("-inf"),
+                        float("inf"),
+                        current - 1,
+                        not isMax,
+                        bit,
+                    )[0]
+                    evaluator.pop(cell, isMax)
+                    if isMax:
+                        pos.x ^= bit
+                    else:
+                        pos.o ^= bit
+                    pos.hashes ^= keys[cell]
+                scores = values
+                self.completed_depth = current
+                if on_depth is not None:
+                    on_depth(
+                        current, self._to_coords(pos, scores, isMax)
+                    )
+                # Com todas as jogadas resolvidas (vitórias,
+                # derrotas ou o fim do jogo), buscas mais
+                # profundas não mudam os valores.
+                if all(
+                    abs(value) >= forced for value in scores.values()
+                ):
+                    break
+        except SearchTimeout:
+            pos.x, pos.o, pos.hashes = x, o, hashes
+        except SearchCancelled:
+            pos.x, pos.o, pos.hashes = x, o, hashes
+            raise
+        finally:
+            self._limited = False
+        if not self.completed_depth:
+            return {}
+        return self._to_coords(pos, scores, isMax)
+
+    @staticmethod
+    def _to_coords(
+        pos: Position, scores: dict, isMax: bool
+    ) -> dict[tuple[int, int], int]:
+        """Converte os valores das jogadas, pelos seus
+        bits e do ponto de vista do jogador do turno,
+        em valores pelas coordenadas e do ponto de
+        vista de 'X'.
+
+        Args:
+            pos (Position): A posição.
+            scores (dict): Os valores, pelo bit.
+            isMax: Se é o turno de 'X'.
+
+        Returns:
+            dict[tuple[int, int], int]: Os valores,
+            pelas coordenadas."""
+        return {
+            pos.to_coords(bit): value if isMax else -value
+            for bit, value in scores.items()
+        }
+
+    def _start(
+        self,
+        pos: Position,
+        time_budget: Optional[float],
+        stop: Optional[threading.Event],
+    ) -> int:
+        """Prepara uma nova busca: zera os contadores,
+        define os seus limites e limpa a ordenação.
+
+        Args:
+            pos (Position): A posição da raiz.
+            time_budget (float, optional): O tempo
+            máximo da busca, em segundos.
+            stop (threading.Event, optional): O evento
+            que cancela a busca.
+
+        Returns:
+            int: A maior profundidade a ser buscada."""
+        self.nodes = 0
+        self.completed_depth = 0
+        self._deadline = (
+            time.monotonic() + time_budget
+            if time_budget is not None
+            else None
+        )
+        self._stop = stop
+        self._limited = (
+            self._deadline is not None or stop is not None
+        )
+        # Com um limite de tempo, a busca se aprofunda
+        # até o fim do jogo (ou até a profundidade
+        # máxima, se houver); sem ele, até a
+        # profundidade padrão do tabuleiro.
+        empty = pos.empty.bit_count()
+        depth = self.depth
+        if depth is None:
+            if self._deadline is not None:
+                depth = empty
+            else:
+                depth = default_depth(pos.rows, pos.cols)
+        depth = max(1, min(depth, empty))
+        self._reset_ordering(pos, depth)
+        return depth
+
+    def close(self) -> None:
+        """Libera os recursos do motor. A busca
+        alfa-beta não possui recursos a liberar; o
+        método existe para manter a mesma interface
+        dos demais motores."""
+
+    def _check_limits(self) -> None:
+        """Interrompe a busca caso ela tenha sido
+        cancelada ou o seu tempo tenha se esgotado.
+
+        Raises:
+            SearchCancelled: Caso a busca tenha sido
+            cancelada.
+            SearchTimeout: Caso o tempo tenha se
+            esgotado."""
+        if self._stop is not None and self._stop.is_set():
+            raise SearchCancelled()
+        if (
+            self._deadline is not None
+            and time.monotonic() >= self._deadline
+        ):
+            raise SearchTimeout()
+
+    def _minimax_check_move(
+        self, pos: Position, isMax: bool, last
+    ) -> bool:
+        """Verifica se algum jogador fez uma sequência
+        vitoriosa no estado atual do jogo.
+
+        Args:
+            pos (Position): O estado atual do jogo.
+            isMax: Indica se está no turno de
+            'X' ou 'O'.
+            last: O bit da última jogada, ou None
+            caso seja desconhecida.
+
+        Returns:
+            bool: Se algum jogador venceu com alguma
+            sequência."""
+        if last is None:
+            return pos.has_winner()
+        # Somente as sequências que passam pela última
+        # jogada, feita pelo jogador do turno anterior,
+        # podem ter sido completadas.
+        return pos.wins_at(last, pos.o if isMax else pos.x)
+
+    def _minimax_tie(
+        self, pos: Position, has_winner: bool
+    ) -> bool:
+        """Verifica se o estado atual do jogo está
+        empatado.
+
+        Args:
+            pos (Position): O estado atual do jogo.
+            has_winner: Se o jogo possui
+            vencedores.
+
+        Returns:
+            bool: Se o estado atual do jogo está
+            empatado ou não."""
+        return has_winner and pos.is_full()
+
+    def _minimax_heuristic(
+        self, pos: Position, isMax: bool, last=None
+    ) -> int:
+        """Retorna a heurística do estado atual.
+
+        Args:
+            pos (Position): O estado atual do jogo.
+            isMax: Indica se está no turno de
+            'X' ou 'O'.
+            last (optional): O bit da última jogada.
+            Valor padrão: None.
+
+        Returns:
+            int: Um valor heurística referente ao
+            estado atual do jogo."""
+        # Verifica se existe vencedores no estado
+        # atual do jogo.
+        has_winner = self._minimax_check_move(
+            pos, isMax, last
+        )
+
+        # Verifica se o estado atual do jogo está
+        # empatado e, então, retorna 0.
+        if self._minimax_tie(pos, not has_winner):
+            return 0
+        # Verifica se o estado atual do jogo possui
+        # vencedores e, então, retorna 'WIN' (caso o
+        # 'X' vença) ou '-WIN' (caso o 'O' vença),
+        # descontado pelas casas já ocupadas.
+        elif has_winner:
+            value = WIN - (pos.x | pos.o).bit_count()
+            return -value if isMax else value
+        # Se o jogo não tiver terminado, retorna -2.
+        else:
+            return -2
+
+    def _evaluate(self, pos: Position, isMax: bool) -> int:
+        """Avaliação estática de uma posição não
+        terminada, usada ao atingir a profundidade
+        máxima.
+
+        É a avaliação de 'Engine.Evaluation', mantida
+        incrementalmente a cada jogada feita e desfeita
+        pela busca.
+
+        Args:
+            pos (Position): O estado atual do jogo.
+            isMax: Se é o turno de 'X'.
+
+        Returns:
+            int: A avaliação, positiva quando favorece
+            'X' e negativa quando favorece 'O'."""
+        return self._evaluator.value(isMax)
+
+    def _candidates(self, pos: Position) -> int:
+        """Retorna a máscara das jogadas consideradas
+        pela busca.
+
+        Em tabuleiros grandes, somente as casas
+        vizinhas das já ocupadas são consideradas (ou
+        o centro, caso o tabuleiro esteja vazio).
+
+        Args:
+            pos (Position): O estado atual do jogo.
+
+        Returns:
+            int: A máscara das jogadas."""
+        return pos.candidates(NEARBY_LIMIT)
+
+    def _ordered_moves(
+        self, pos: Position, first, ply: int, isMax: bool
+    ):
+        """Itera sobre as jogadas consideradas, da mais
+        para a menos promissora: a jogada sugerida pela
+        tabela de transposição, as jogadas 'killer' da
+        profundidade, e as demais, pelo histórico de
+        podas e, então, pela quantidade de sequências
+        que passam pela casa (centro e cantos antes das
+        bordas).
+
+        Args:
+            pos (Position): O estado atual do
+            tabuleiro.
+            first: O bit da jogada a ser tentada
+            primeiro, ou None.
+            ply (int): A distância até a raiz.
+            isMax: Se é o turno de 'X'.
+
+        Yields:
+            int: O bit de uma casa vazia."""
+        moves = self._candidates(pos)
+        if first is not None and moves & first:
+            yield first
+            moves ^= first
+        for killer in self._killers[ply]:
+            if killer is not None and moves & killer:
+                yield killer
+                moves ^= killer
+        history = self._history[0 if isMax else 1]
+        lines_through = pos.lines_through
+        rest = []
+        while moves:
+            bit = moves & -moves
+            cell = bit.bit_length() - 1
+            rest.append(
+                (-history[cell], -len(lines_through[cell]), bit)
+            )
+            moves ^= bit
+        rest.sort()
+        for _, _, bit in rest:
+            yield bit
+
+    def _record_cutoff(
+        self, bit: int, ply: int, depth: int, isMax: bool
+    ) -> None:
+        """Registra a jogada que causou uma poda, para
+        que seja tentada antes nas próximas posições.
+
+        Args:
+            bit (int): O bit da jogada.
+            ply (int): A distância até a raiz.
+            depth (int): A profundidade restante.
+            isMax: Se é o turno de 'X'.
+        """
+        killers = self._killers[ply]
+        if killers[0] != bit:
+            killers[1] = killers[0]
+            killers[0] = bit
+        cell = bit.bit_length() - 1
+        self._history[0 if isMax else 1][cell] += depth * depth
+
+    def _negamax(
+        self,
+        pos: Position,
+        alpha,
+        beta,
+        depth: int,
+        isMax: bool,
+        last=None,
+    ):
+        """'Negamax' com podagem alfa-beta e busca por
+        variação principal: após a primeira jogada, as
+        demais são buscadas com uma janela nula, e só
+        são buscadas novamente, com a janela completa,
+        caso a superem.
+
+        Os valores são do ponto de vista do jogador do
+        turno, isto é, o valor de 'X' para 'X' e o
+        valor de 'X', negado, para 'O'.
+
+        Args:
+            pos (Position): O estado atual do
+            tabuleiro.
+            alpha: O melhor valor para alfa.
+            beta: O melhor valor para beta.
+            depth (int): A profundidade restante.
+            isMax: Se é o turno de 'X'.
+            last (optional): O bit da última jogada.
+            Valor padrão: None.
+
+        Returns:
+            O melhor valor encontrado e, também, o bit
+            da melhor jogada."""
+        # Verifica, de tempos em tempos, se a busca
+        # deve parar.
+        self.nodes += 1
+        if self._limited and not self.nodes & CHECK_INTERVAL:
+            self._check_limits()
+
+        # Pega a heurística da posição atual.
+        heuristic = self._minimax_heuristic(
+            pos, isMax, last
+        )
+        # Indica que o jogo terminou, isto é, não
+        # existe mais 'folhas' para serem exploradas.
+        if heuristic != -2:
+            return (heuristic if isMax else -heuristic, None)
+        # Atingiu a profundidade máxima, retornando a
+        # avaliação estática do estado atual.
+        if depth <= 0:
+            value = self._evaluate(pos, isMax)
+            return (value if isMax else -value, None)
+
+        # Consulta a tabela de transposição, que pode
+        # conter o valor (ou um limite) da posição.
+        key, sym = self._table.canonical(pos)
+        entry = self._table.get(pos, key, sym)
+        table_move = None
+        ply = self._root_depth - depth
+        if entry is not None:
+            value, flag, table_move, table_depth = entry
+            # O valor só é confiável se veio de uma
+            # busca pelo menos tão profunda quanto esta.
+            # Na raiz, somente a jogada é usada: um
+            # limite que estreitasse a janela faria com
+            # que uma jogada que não supera 'alpha'
+            # fosse escolhida como a melhor.
+            if table_depth >= depth and ply:
+                if flag == EXACT:
+                    return (value, table_move)
+                elif flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return (value, table_move)
+        alpha_orig, beta_orig = alpha, beta
+
+        # Valores bases (para melhor valor encontrado
+        # e melhor jogada).
+        best_value = float("-inf")
+        best_move = None
+        # As chaves de Zobrist das casas do jogador.
+        zobrist = pos.zobrist
+        keys = zobrist.x if isMax else zobrist.o
+        evaluator = self._evaluator
+
+        for bit in self._ordered_moves(
+            pos, table_move, ply, isMax
+        ):
+            # Registra o movimento, alterando o estado
+            # atual do jogo e a avaliação.
+            cell = bit.bit_length() - 1
+            if isMax:
+                pos.x |= bit
+            else:
+                pos.o |= bit
+            pos.hashes ^= keys[cell]
+            evaluator.push(cell, isMax)
+            if best_move is None:
+                # A primeira jogada, a mais promissora,
+                # é buscada com a janela completa.
+                value = -self._negamax(
+                    pos, -beta, -alpha, depth - 1,
+                    not isMax, bit,
+                )[0]
+            else:
+                # As demais só precisam provar que não
+                # superam 'alpha' (os valores são
+                # inteiros, e 'alpha' já é finito).
+                value = -self._negamax(
+                    pos, -alpha - 1, -alpha, depth - 1,
+                    not isMax, bit,
+                )[0]
+                if alpha < value < beta:
+                    value = -self._negamax(
+                        pos, -beta, -alpha, depth - 1,
+                        not isMax, bit,
+                    )[0]
+            # Restaura a posição alterada previamente.
+            evaluator.pop(cell, isMax)
+            if isMax:
+                pos.x ^= bit
+            else:
+                pos.o ^= bit
+            pos.hashes ^= keys[cell]
+
+            if value > best_value:
+                best_value = value
+                best_move = bit
+                if depth == self._root_depth:
+                    self._root_best = bit
+            if value > alpha:
+                alpha = value
+            # Se 'beta' <= 'alpha', a podagem é
+            # realizada neste ramo.
+            if beta <= alpha:
+                self._record_cutoff(bit, ply, depth, isMax)
+                break
+
+        # Registra o resultado na tabela de
+        # transposição, junto com o tipo de limite.
+        self._store(
+            pos, key, sym, best_value, best_move,
+            alpha_orig, beta_orig, depth,
+        )
+        # Retorna o melhor valor encontrado e o bit
+        # da melhor jogada.
+        return (best_value, best_move)
+
+    def _store(
+        self,
+        pos: Position,
+        key: int,
+        sym: int,
+        value,
+        move,
+        alpha,
+        beta,
+        depth: int,
+    ) -> None:
+        """Registra o resultado de uma busca na tabela
+        de transposição.
+
+        Args:
+            pos (Position): A posição buscada.
+            key (int): A chave canônica da posição.
+            sym (int): A simetria que produz a chave.
+            value: O melhor valor encontrado.
+            move: O bit da melhor jogada encontrada.
+            alpha: O valor de alfa no início da busca.
+            beta: O valor de beta no início da busca.
+            depth (int): A profundidade restante.
+        """
+        # Nenhuma jogada superou 'alpha', logo o valor
+        # é somente um limite superior.
+        if value <= alpha:
+            flag = UPPER
+        # Houve poda, logo o valor é somente um limite
+        # inferior.
+        elif value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._table.store(
+            pos, key, sym, value, flag, move, depth
+        )
+
+    def _minimax(
+        self, pos: Position, isMax, alpha, beta, depth: int
+    ):
+        """Algoritmo de 'Minimax', com podagem
+        alfa-beta, sobre '_negamax'.
+
+        Args:
+            pos (Position): O estado atual do
+            tabuleiro.
+            isMax: Se a jogada é de maximização
+            ou de minimização.
+            alpha: O melhor valor para alfa.
+            beta: O melhor valor para beta.
+            depth (int): A profundidade máxima.
+
+        Returns:
+            O melhor valor encontrado, para jogada de
+            maximização ou minimização, e, também, a
+            melhor jogada ('x' e 'y')."""
+        self._reset_ordering(pos, depth)
+        return self._root(pos, isMax, alpha, beta, depth)
+
+    def _reset_ordering(self, pos: Position, depth: int) -> None:
+        """Limpa as jogadas 'killer' e o histórico de
+        podas, usados na ordenação das jogadas.
+
+        Args:
+            pos (Position): A posição da raiz.
+            depth (int): A maior profundidade a ser
+            buscada.
+        """
+        # As jogadas 'killer' de cada profundidade e o
+        # histórico de podas de cada casa, por jogador.
+        self._killers = [[None, None] for _ in range(depth + 1)]
+        cells = pos.rows * pos.cols
+        self._history = ([0] * cells, [0] * cells)
+
+    def _root(
+        self, pos: Position, isMax, alpha, beta, depth: int
+    ):
+        """Busca a raiz com uma profundidade fixa,
+        mantendo a ordenação das buscas anteriores.
+
+        Args:
+            pos (Position): O estado atual do
+            tabuleiro.
+            isMax: Se é o turno de 'X'.
+            alpha: O melhor valor para alfa.
+            beta: O melhor valor para beta.
+            depth (int): A profundidade máxima.
+
+        Returns:
+            O melhor valor encontrado e a melhor jogada
+            ('x' e 'y')."""
+        self._root_depth = depth
+        self._root_best = None
+        # A avaliação incremental parte da raiz (a
+        # posição é restaurada mesmo quando uma busca
+        # é interrompida, mas a avaliação não).
+        self._evaluator = Evaluator(pos, self.weights)
+        # O 'Negamax' busca do ponto de vista do
+        # jogador do turno, logo a janela e o valor
+        # são negados no turno de 'O'.
+        if isMax:
+            value, bit = self._negamax(
+                pos, alpha, beta, depth, True
+            )
+        else:
+            value, bit = self._negamax(
+                pos, -beta, -alpha, depth, False
+            )
+            value = -value
+        # Converte o bit da melhor jogada em suas
+        # coordenadas ('x' e 'y').
+        if bit is None:
+            return (value, None)
+        return (value, pos.to_coords(bit))
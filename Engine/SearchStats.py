@@ -0,0 +1,269 @@
+import time
+from typing import Callable, Optional
+from Engine.Search import Search
+from Engine.TranspositionTable import EXACT, LOWER, UPPER
+
+# Os sinais do tipo de cada valor das jogadas da raiz:
+# exato, limite inferior ou limite superior.
+BOUND_SIGNS = {EXACT: "=", LOWER: ">=", UPPER: "<="}
+
+
+class _CountingTable:
+    """Envolve uma tabela de transposição, contando as
+    consultas e os acertos."""
+
+    def __init__(self, table, stats: "SearchStats") -> None:
+        """Construtor base.
+
+        Args:
+            table (TranspositionTable): A tabela
+            original.
+            stats (SearchStats): Onde registrar as
+            contagens.
+        """
+        self._table = table
+        self._stats = stats
+
+    def get(self, *args):
+        """Consulta a tabela original, contando o
+        acerto."""
+        entry = self._table.get(*args)
+        self._stats.cache_probes += 1
+        if entry is not None:
+            self._stats.cache_hits += 1
+        return entry
+
+    def __getattr__(self, name: str):
+        """Repassa os demais atributos para a tabela
+        original."""
+        return getattr(self._table, name)
+
+
+class SearchStats:
+    """Coletor opcional de estatísticas da busca
+    alfa-beta.
+
+    Ao ser ligado a um 'Search' (com 'attach'), envolve
+    os métodos da busca daquela instância; desligado,
+    a busca não executa nenhum código extra."""
+
+    def __init__(
+        self,
+        on_root_move: Optional[
+            Callable[
+                [tuple[int, int], float, int, "SearchStats"],
+                None,
+            ]
+        ] = None,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            on_root_move (Callable, optional): Função
+            chamada ao terminar a busca de cada jogada
+            da raiz, com as coordenadas da jogada, o
+            seu valor (do ponto de vista de 'X'), o
+            tipo do valor ('EXACT', 'LOWER' ou
+            'UPPER') e as estatísticas. Valor padrão:
+            None.
+        """
+        self.on_root_move = on_root_move
+        self.reset()
+
+    def reset(self) -> None:
+        """Zera as estatísticas."""
+        # Os nós visitados em cada profundidade (a
+        # raiz é a profundidade 0).
+        self.nodes_per_depth = []
+        # Os nós em que houve poda após buscar ao
+        # menos uma jogada, e quantos deles podaram
+        # já na primeira jogada.
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        # Os nós terminais (vitória ou empate) e as
+        # avaliações estáticas nas folhas.
+        self.terminal_hits = 0
+        self.evaluations = 0
+        # As consultas e os acertos na tabela de
+        # transposição.
+        self.cache_probes = 0
+        self.cache_hits = 0
+        # O tempo, em segundos, da última busca.
+        self.elapsed = 0.0
+        # As jogadas da raiz já buscadas, com as suas
+        # coordenadas, os seus valores e o tipo de
+        # cada valor: as buscas com a janela nula dão
+        # somente um limite ('LOWER' ou 'UPPER').
+        self.root_moves = []
+        # A quantidade de jogadas já buscadas em cada
+        # nó do caminho atual.
+        self._children = []
+
+    @property
+    def nodes(self) -> int:
+        """A quantidade total de nós visitados."""
+        return sum(self.nodes_per_depth)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """A fração das podas feitas já na primeira
+        jogada, indicando a qualidade da ordenação."""
+        if not self.beta_cutoffs:
+            return 0.0
+        return self.first_move_cutoffs / self.beta_cutoffs
+
+    def as_dict(self) -> dict:
+        """Retorna as estatísticas em um dicionário.
+
+        Returns:
+            dict: As estatísticas."""
+        return {
+            "nodes": self.nodes,
+            "nodes_per_depth": list(self.nodes_per_depth),
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_cutoff_rate": (
+                self.first_move_cutoff_rate
+            ),
+            "terminal_hits": self.terminal_hits,
+            "evaluations": self.evaluations,
+            "cache_probes": self.cache_probes,
+            "cache_hits": self.cache_hits,
+            "elapsed": self.elapsed,
+            "root_moves": [
+                [list(coords), value, bound]
+                for coords, value, bound in self.root_moves
+            ],
+        }
+
+    def format(self) -> str:
+        """Formata as estatísticas em poucas linhas,
+        para exibição.
+
+        Returns:
+            str: As estatísticas formatadas."""
+        nps = self.nodes / self.elapsed if self.elapsed else 0
+        return "\n".join(
+            (
+                f"nós: {self.nodes} "
+                f"({nps:.0f}/s, {self.elapsed * 1000:.1f} ms)",
+                "por profundidade: "
+                + " ".join(map(str, self.nodes_per_depth)),
+                f"podas: {self.beta_cutoffs} "
+                f"(1ª jogada: "
+                f"{self.first_move_cutoff_rate:.0%})",
+                f"terminais: {self.terminal_hits}  "
+                f"folhas: {self.evaluations}",
+                f"tabela: {self.cache_hits}/"
+                f"{self.cache_probes}",
+            )
+        )
+
+    def attach(self, search: Search) -> None:
+        """Liga o coletor a uma instância de 'Search'.
+
+        Args:
+            search (Search): A busca a ser
+            instrumentada.
+        """
+        # Ignora uma busca já instrumentada.
+        if isinstance(search._table, _CountingTable):
+            return
+        # Os métodos originais, ainda sem os
+        # envoltórios desta instância.
+        negamax = search._negamax
+        heuristic = search._minimax_heuristic
+        evaluate = search._evaluate
+        run = search.search
+        stats = self
+
+        def node(pos, alpha, beta, depth, isMax, last=None):
+            ply = search._root_depth - depth
+            counts = stats.nodes_per_depth
+            while len(counts) <= ply:
+                counts.append(0)
+            counts[ply] += 1
+            children = stats._children
+            if children:
+                children[-1] += 1
+            children.append(0)
+            try:
+                value, move = negamax(
+                    pos, alpha, beta, depth, isMax, last
+                )
+            finally:
+                searched = children.pop()
+            # Houve poda se o valor atingiu 'beta'
+            # depois de buscar alguma jogada.
+            if searched and value >= beta:
+                stats.beta_cutoffs += 1
+                if searched == 1:
+                    stats.first_move_cutoffs += 1
+            if ply == 1:
+                # Fora da janela, o valor é somente um
+                # limite, como nas buscas com a janela
+                # nula das jogadas após a primeira.
+                if value <= alpha:
+                    bound = UPPER
+                elif value >= beta:
+                    bound = LOWER
+                else:
+                    bound = EXACT
+                # O valor é do ponto de vista do jogador
+                # do turno; é registrado do ponto de
+                # vista de 'X', invertendo os limites.
+                coords = pos.to_coords(last)
+                value_x = value
+                if not isMax:
+                    value_x = -value
+                    if bound != EXACT:
+                        bound = LOWER + UPPER - bound
+                stats.root_moves.append(
+                    (coords, value_x, bound)
+                )
+                if stats.on_root_move:
+                    stats.on_root_move(
+                        coords, value_x, bound, stats
+                    )
+            return (value, move)
+
+        def counting_heuristic(pos, isMax, last=None):
+            value = heuristic(pos, isMax, last)
+            if value != -2:
+                stats.terminal_hits += 1
+            return value
+
+        def counting_evaluate(pos, isMax):
+            stats.evaluations += 1
+            return evaluate(pos, isMax)
+
+        def timed_search(*args, **kwargs):
+            stats.reset()
+            start = time.perf_counter()
+            try:
+                return run(*args, **kwargs)
+            finally:
+                stats.elapsed = time.perf_counter() - start
+
+        search._negamax = node
+        search._minimax_heuristic = counting_heuristic
+        search._evaluate = counting_evaluate
+        search.search = timed_search
+        search._table = _CountingTable(search._table, self)
+
+    @staticmethod
+    def detach(search: Search) -> None:
+        """Desliga o coletor de uma instância de
+        'Search', restaurando os métodos originais.
+
+        Args:
+            search (Search): A busca instrumentada.
+        """
+        for name in (
+            "_negamax",
+            "_minimax_heuristic",
+            "_evaluate",
+            "search",
+        ):
+            search.__dict__.pop(name, None)
+        if isinstance(search._table, _CountingTable):
+            search._table = search._table._table
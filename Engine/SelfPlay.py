@@ -0,0 +1,157 @@
+import random
+import sys
+import time
+from typing import NamedTuple, Optional
+from Engine.Search import Search
+from Engine.TranspositionTable import TranspositionTable
+from Move import Move
+from TicTacToe.Game import Game
+
+
+class SelfPlayResult(NamedTuple):
+    """Resultado agregado de um lote de partidas."""
+
+    # A quantidade de partidas jogadas.
+    games: int
+    # A quantidade de vitórias de 'X'.
+    x_wins: int
+    # A quantidade de vitórias de 'O'.
+    o_wins: int
+    # A quantidade de empates.
+    ties: int
+    # A quantidade total de jogadas feitas.
+    moves: int
+    # O tempo total, em segundos.
+    elapsed: float
+
+
+def play_game(
+    players: dict[str, Optional[Search]],
+    rng: random.Random,
+    rows: int = 3,
+    cols: int = 3,
+    k: int = 3,
+) -> tuple[str, int]:
+    """Joga uma partida completa, seguindo as regras
+    de 'Game'.
+
+    Args:
+        players (dict[str, Optional[Search]]): O
+        motor de cada jogador ('X' e 'O'), ou None
+        para um jogador que escolhe casas ao acaso.
+        rng (random.Random): O gerador de números
+        aleatórios do jogador aleatório.
+        rows (int, optional): A quantidade de linhas.
+        Valor padrão: 3.
+        cols (int, optional): A quantidade de colunas.
+        Valor padrão: 3.
+        k (int, optional): O tamanho da sequência
+        vitoriosa. Valor padrão: 3.
+
+    Returns:
+        tuple[str, int]: O 'símbolo' do vencedor ("" em
+        caso de empate) e a quantidade de jogadas."""
+    game = Game(rows, cols, k)
+    moves = 0
+    while True:
+        label = game._get_player_label()
+        engine = players[label]
+        if engine is None:
+            # Escolhe uma casa vazia qualquer.
+            row, col = rng.choice(
+                [
+                    (move.row, move.col)
+                    for row in game._current_moves
+                    for move in row
+                    if move.label == ""
+                ]
+            )
+        else:
+            row, col = engine.best_move(game)
+        game.make_move(Move(row, col, label))
+        moves += 1
+
+        # Verifica se a partida terminou.
+        game.check_move()
+        if game._has_winner:
+            return (label, moves)
+        if game.is_tied():
+            return ("", moves)
+
+
+def play_games(
+    n: int,
+    mode: str = "engine",
+    random_player: str = "X",
+    seed: Optional[int] = None,
+    table: Optional[TranspositionTable] = None,
+    rows: int = 3,
+    cols: int = 3,
+    k: int = 3,
+    depth: Optional[int] = None,
+) -> SelfPlayResult:
+    """Joga um lote de partidas sem interface gráfica.
+
+    Args:
+        n (int): A quantidade de partidas.
+        mode (str, optional): "engine" para motor
+        contra motor ou "random" para um jogador
+        aleatório contra o motor. Valor padrão:
+        "engine".
+        random_player (str, optional): O 'símbolo'
+        do jogador aleatório, no modo "random". Valor
+        padrão: "X".
+        seed (int, optional): A semente do jogador
+        aleatório. Valor padrão: None.
+        table (TranspositionTable, optional): A
+        tabela de transposição do motor, compartilhada
+        entre todas as partidas. Valor padrão: uma
+        nova tabela.
+        rows (int, optional): A quantidade de linhas.
+        Valor padrão: 3.
+        cols (int, optional): A quantidade de colunas.
+        Valor padrão: 3.
+        k (int, optional): O tamanho da sequência
+        vitoriosa. Valor padrão: 3.
+        depth (int, optional): A profundidade máxima
+        da busca. Valor padrão: None, isto é, a
+        profundidade padrão do tabuleiro.
+
+    Returns:
+        SelfPlayResult: O resultado agregado."""
+    if mode not in ("engine", "random"):
+        raise ValueError(f"Modo desconhecido: {mode!r}.")
+    if random_player not in ("X", "O"):
+        raise ValueError(
+            f"Jogador desconhecido: {random_player!r}."
+        )
+    engine = Search(table=table, depth=depth)
+    players = {"X": engine, "O": engine}
+    if mode == "random":
+        players[random_player] = None
+    rng = random.Random(seed)
+
+    wins = {"X": 0, "O": 0, "": 0}
+    total_moves = 0
+    start = time.perf_counter()
+    for _ in range(n):
+        winner, moves = play_game(
+            players, rng, rows, cols, k
+        )
+        wins[winner] += 1
+        total_moves += moves
+    return SelfPlayResult(
+        games=n,
+        x_wins=wins["X"],
+        o_wins=wins["O"],
+        ties=wins[""],
+        moves=total_moves,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    mode = sys.argv[2] if len(sys.argv) > 2 else "random"
+    result = play_games(n, mode=mode, seed=0)
+    print(result)
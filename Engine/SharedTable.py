@@ -0,0 +1,204 @@
+from multiprocessing import shared_memory
+from typing import Optional
+from Engine.Position import Position
+from Engine.Symmetries import get_symmetries
+
+# O tamanho, em bytes, de cada palavra de uma entrada.
+WORD_SIZE = 8
+# A disposição dos dados de uma entrada em uma única
+# palavra de 64 bits: o valor (com sinal, somado a
+# 'VALUE_OFFSET'), o tipo de limite, o índice da melhor
+# jogada mais um (0 quando não há jogada) e a
+# profundidade. Tabuleiros de até 4095 casas cabem
+# nos bits da jogada.
+VALUE_BITS = 32
+VALUE_MASK = (1 << VALUE_BITS) - 1
+VALUE_OFFSET = 1 << (VALUE_BITS - 1)
+FLAG_SHIFT = VALUE_BITS
+MOVE_SHIFT = FLAG_SHIFT + 2
+MOVE_BITS = 12
+MOVE_MASK = (1 << MOVE_BITS) - 1
+DEPTH_SHIFT = MOVE_SHIFT + MOVE_BITS
+MAX_DEPTH = 255
+
+
+class SharedTranspositionTable:
+    """Tabela de transposição em memória compartilhada,
+    usada ao mesmo tempo por vários processos da busca
+    paralela, sem travas.
+
+    Possui a mesma interface de 'TranspositionTable'.
+    Cada entrada ocupa duas palavras de 64 bits: os
+    dados ('value', 'flag', 'move' e 'depth') e o XOR
+    dos dados com a chave canônica. Uma escrita
+    interrompida por outro processo deixa as duas
+    palavras inconsistentes, e a entrada é tratada como
+    ausente na leitura, em vez de corromper a busca.
+
+    A entrada de uma posição é escolhida pelos bits
+    baixos da sua chave; uma posição diferente substitui
+    a entrada existente, e a mesma posição só a
+    substitui com uma busca pelo menos tão profunda."""
+
+    def __init__(
+        self, slots: int = 1 << 20, name: Optional[str] = None
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            slots (int, optional): A quantidade de
+            entradas, arredondada para uma potência de
+            2. Valor padrão: 2^20.
+            name (str, optional): O nome de uma tabela
+            já criada por outro processo, com a mesma
+            quantidade de entradas. Valor padrão: None,
+            isto é, cria uma nova tabela.
+        """
+        self.slots = 1 << max(0, slots - 1).bit_length()
+        self._mask = self.slots - 1
+        # Somente quem cria a tabela a remove.
+        self._owner = name is None
+        if self._owner:
+            self._memory = shared_memory.SharedMemory(
+                create=True, size=self.slots * 2 * WORD_SIZE
+            )
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+        self._words = self._memory.buf.cast("Q")
+
+    @property
+    def name(self) -> str:
+        """O nome da memória compartilhada, usado pelos
+        demais processos para acessar a tabela."""
+        return self._memory.name
+
+    def __len__(self) -> int:
+        """Retorna a quantidade de entradas ocupadas."""
+        words = self._words
+        return sum(
+            1
+            for index in range(0, len(words), 2)
+            if words[index] or words[index + 1]
+        )
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        self._memory.buf[:] = bytes(len(self._memory.buf))
+
+    def close(self) -> None:
+        """Libera o acesso à tabela e, caso este
+        processo a tenha criado, remove a memória
+        compartilhada."""
+        if getattr(self, "_words", None) is None:
+            return
+        self._words.release()
+        self._words = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __del__(self) -> None:
+        """Libera a tabela ao descartar o objeto. A
+        visão das palavras precisa ser liberada antes
+        da memória compartilhada ser fechada."""
+        self.close()
+
+    def canonical(self, pos: Position) -> tuple[int, int]:
+        """Retorna a chave canônica de uma posição.
+
+        Args:
+            pos (Position): A posição.
+
+        Returns:
+            tuple[int, int]: A chave canônica e o
+            índice da simetria que a produz."""
+        return pos.zobrist.canonical(pos.hashes)
+
+    def get(
+        self, pos: Position, key: int, sym: int
+    ) -> Optional[tuple[float, int, Optional[int], int]]:
+        """Busca uma posição na tabela.
+
+        Args:
+            pos (Position): A posição buscada.
+            key (int): A chave canônica da posição.
+            sym (int): A simetria que produz a chave.
+
+        Returns:
+            Optional[tuple[float, int, Optional[int], int]]:
+            O valor, o tipo de limite, o bit da melhor
+            jogada (já na orientação de 'pos') e a
+            profundidade da busca, ou None caso a
+            posição não esteja na tabela."""
+        index = (key & self._mask) << 1
+        words = self._words
+        data = words[index + 1]
+        if words[index] ^ data != key or not data:
+            return None
+        value = (data & VALUE_MASK) - VALUE_OFFSET
+        flag = (data >> FLAG_SHIFT) & 3
+        move = (data >> MOVE_SHIFT) & MOVE_MASK
+        depth = data >> DEPTH_SHIFT
+        if move:
+            # Desfaz a simetria usada na chave.
+            symmetries = get_symmetries(pos.rows, pos.cols)
+            move = 1 << symmetries.inverses[sym][move - 1]
+        else:
+            move = None
+        return (value, flag, move, depth)
+
+    def store(
+        self,
+        pos: Position,
+        key: int,
+        sym: int,
+        value: float,
+        flag: int,
+        move: Optional[int],
+        depth: int,
+    ) -> None:
+        """Armazena o resultado da busca de uma
+        posição.
+
+        Args:
+            pos (Position): A posição buscada.
+            key (int): A chave canônica da posição.
+            sym (int): A simetria que produz a chave.
+            value (float): O valor encontrado.
+            flag (int): O tipo de limite do valor.
+            move (Optional[int]): O bit da melhor
+            jogada encontrada.
+            depth (int): A profundidade restante da
+            busca.
+        """
+        # Valores fora do intervalo representável não
+        # são armazenados.
+        if not -VALUE_OFFSET <= value < VALUE_OFFSET:
+            return
+        index = (key & self._mask) << 1
+        words = self._words
+        # Uma profundidade maior que a representável é
+        # armazenada como 'MAX_DEPTH', o que só torna a
+        # entrada menos aproveitada.
+        depth = min(depth, MAX_DEPTH)
+        old = words[index + 1]
+        if (
+            old
+            and words[index] ^ old == key
+            and old >> DEPTH_SHIFT > depth
+        ):
+            return
+        cell = 0
+        if move is not None:
+            # Guarda a jogada na orientação canônica.
+            symmetries = get_symmetries(pos.rows, pos.cols)
+            index_move = move.bit_length() - 1
+            cell = symmetries.perms[sym][index_move] + 1
+        data = (
+            (int(value) + VALUE_OFFSET)
+            | flag << FLAG_SHIFT
+            | cell << MOVE_SHIFT
+            | depth << DEPTH_SHIFT
+        )
+        words[index] = key ^ data
+        words[index + 1] = data
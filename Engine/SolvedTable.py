@@ -0,0 +1,256 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from typing import Optional
+from TicTacToe.Game import Game
+from Engine.Position import Position
+
+# O caminho padrão da tabela, ao lado deste módulo.
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "solved.bin",
+)
+# Identificação e versão do formato do arquivo.
+MAGIC = b"TTTS"
+VERSION = 1
+# Cabeçalho: identificação, versão, linhas, colunas e
+# o resumo ('digest') das sequências vitoriosas.
+HEADER = struct.Struct("<4sBBB8s")
+# Valor de uma posição que não está na tabela (não
+# alcançável ou já terminada).
+MISSING = 0xFF
+# O maior tabuleiro aceito (3^casas entradas).
+MAX_CELLS = 12
+
+
+def _rules_digest(rows: int, cols: int, win_masks) -> bytes:
+    """Resume as regras do jogo, permitindo detectar
+    uma tabela desatualizada.
+
+    Args:
+        rows (int): A quantidade de linhas.
+        cols (int): A quantidade de colunas.
+        win_masks: As máscaras das sequências
+        vitoriosas.
+
+    Returns:
+        bytes: Um resumo de 8 bytes das regras."""
+    data = repr((rows, cols, sorted(win_masks)))
+    return hashlib.sha1(data.encode()).digest()[:8]
+
+
+def _base3_table(cells: int) -> tuple[int, ...]:
+    """Converte uma máscara de bits em um número na
+    base 3, onde cada bit ligado vira o dígito 1.
+
+    Args:
+        cells (int): A quantidade de casas.
+
+    Returns:
+        tuple[int, ...]: O valor, na base 3, de cada
+        máscara possível."""
+    table = [0] * (1 << cells)
+    for mask in range(1, 1 << cells):
+        low = mask & -mask
+        table[mask] = table[mask ^ low] + 3 ** (
+            low.bit_length() - 1
+        )
+    return tuple(table)
+
+
+def solve(game: Game) -> dict[tuple[int, int], tuple[int, int]]:
+    """Resolve todas as posições alcançáveis a partir
+    do início de uma partida.
+
+    Args:
+        game (Game): O jogo cujas regras serão
+        usadas, no seu estado inicial.
+
+    Returns:
+        dict[tuple[int, int], tuple[int, int]]: Para
+        cada posição ('x', 'o') não terminada, o seu
+        valor (1 se 'X' vence, -1 se 'O' vence e 0 em
+        caso de empate) e o índice da melhor jogada.
+    """
+    pos = Position.from_moves(
+        game._current_moves, game.winning_positions
+    )
+    solved = {}
+
+    def value_of(x_turn: bool) -> int:
+        """Retorna o valor da posição atual de 'pos',
+        registrando em 'solved' as posições não
+        terminadas."""
+        if pos.has_winner():
+            # Quem jogou por último venceu.
+            return -1 if x_turn else 1
+        if pos.is_full():
+            return 0
+        key = (pos.x, pos.o)
+        if key in solved:
+            return solved[key][0]
+
+        best_value = best_index = None
+        # Avalia TODAS as jogadas, na ordem das
+        # linhas, mantendo a primeira melhor jogada.
+        for bit in pos.legal_moves():
+            if x_turn:
+                pos.x |= bit
+                value = value_of(False)
+                pos.x ^= bit
+                better = best_value is None or value > best_value
+            else:
+                pos.o |= bit
+                value = value_of(True)
+                pos.o ^= bit
+                better = best_value is None or value < best_value
+            if better:
+                best_value = value
+                best_index = bit.bit_length() - 1
+        solved[key] = (best_value, best_index)
+        return best_value
+
+    value_of(True)
+    return solved
+
+
+def build(path: str = DEFAULT_PATH) -> int:
+    """Resolve o jogo e grava a tabela em disco.
+
+    Args:
+        path (str, optional): O caminho do arquivo.
+        Valor padrão: 'DEFAULT_PATH'.
+
+    Returns:
+        int: A quantidade de posições resolvidas."""
+    game = Game()
+    rows = len(game._current_moves)
+    cols = len(game._current_moves[0])
+    cells = rows * cols
+    if cells > MAX_CELLS:
+        raise ValueError(
+            f"Tabuleiro grande demais: {rows}x{cols}."
+        )
+    win_masks = Position.get_win_masks(
+        game.winning_positions, cols
+    )
+    solved = solve(game)
+
+    # Um byte por posição: o valor (+1) nos 2 bits
+    # mais altos e o índice da jogada nos demais.
+    base3 = _base3_table(cells)
+    data = bytearray([MISSING]) * (3**cells)
+    for (x, o), (value, index) in solved.items():
+        data[base3[x] + 2 * base3[o]] = (
+            (value + 1) << 6
+        ) | index
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        rows,
+        cols,
+        _rules_digest(rows, cols, win_masks),
+    )
+    # Grava em um arquivo temporário e o renomeia,
+    # evitando uma tabela pela metade.
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(header)
+        file.write(data)
+    os.replace(temp_path, path)
+    return len(solved)
+
+
+class SolvedTable:
+    """Tabela, mapeada em memória, com o valor e a
+    melhor jogada de todas as posições alcançáveis."""
+
+    def __init__(self, data: mmap.mmap, rows: int, cols: int) -> None:
+        """Construtor base.
+
+        Args:
+            data (mmap.mmap): O conteúdo do arquivo.
+            rows (int): A quantidade de linhas.
+            cols (int): A quantidade de colunas.
+        """
+        self._data = data
+        self.rows = rows
+        self.cols = cols
+        self._base3 = _base3_table(rows * cols)
+
+    @classmethod
+    def load(
+        cls, game: Game, path: str = DEFAULT_PATH
+    ) -> Optional["SolvedTable"]:
+        """Carrega a tabela de um arquivo, caso ela
+        exista e corresponda às regras de 'game'.
+
+        Args:
+            game (Game): O jogo cujas regras a tabela
+            deve seguir.
+            path (str, optional): O caminho do
+            arquivo. Valor padrão: 'DEFAULT_PATH'.
+
+        Returns:
+            Optional[SolvedTable]: A tabela, ou None
+            caso esteja ausente ou desatualizada."""
+        rows = len(game._current_moves)
+        cols = len(game._current_moves[0])
+        win_masks = Position.get_win_masks(
+            game.winning_positions, cols
+        )
+        expected = HEADER.pack(
+            MAGIC,
+            VERSION,
+            rows,
+            cols,
+            _rules_digest(rows, cols, win_masks),
+        )
+        try:
+            with open(path, "rb") as file:
+                data = mmap.mmap(
+                    file.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ,
+                )
+        except (OSError, ValueError):
+            return None
+        # Verifica o cabeçalho e o tamanho do arquivo.
+        if data[: HEADER.size] != expected or len(
+            data
+        ) != HEADER.size + 3 ** (rows * cols):
+            data.close()
+            return None
+        return cls(data, rows, cols)
+
+    def lookup(
+        self, pos: Position
+    ) -> Optional[tuple[int, tuple[int, int]]]:
+        """Busca o valor e a melhor jogada de uma
+        posição.
+
+        Args:
+            pos (Position): A posição buscada.
+
+        Returns:
+            Optional[tuple[int, tuple[int, int]]]: O
+            valor da posição e as coordenadas ('x' e
+            'y') da melhor jogada, ou None caso a
+            posição não esteja na tabela."""
+        base3 = self._base3
+        entry = self._data[
+            HEADER.size + base3[pos.x] + 2 * base3[pos.o]
+        ]
+        if entry == MISSING:
+            return None
+        value = (entry >> 6) - 1
+        return (value, divmod(entry & 0x3F, self.cols))
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    count = build(path)
+    print(f"{count} posições resolvidas em '{path}'.")
@@ -0,0 +1,144 @@
+class Symmetries:
+    """As simetrias (rotações e reflexões) de um
+    tabuleiro com 'rows' linhas e 'cols' colunas.
+
+    Um tabuleiro quadrado possui as 8 simetrias do
+    grupo diedral (D4), os demais possuem somente 4
+    (identidade, as duas reflexões e a rotação de
+    180 graus)."""
+
+    # Quantidade de bits por bloco das tabelas de
+    # transformação.
+    CHUNK = 8
+    CHUNK_MASK = (1 << CHUNK) - 1
+
+    def __init__(self, rows: int, cols: int) -> None:
+        """Construtor base.
+
+        Args:
+            rows (int): A quantidade de linhas do
+            tabuleiro.
+            cols (int): A quantidade de colunas do
+            tabuleiro.
+        """
+        size = rows * cols
+        last_row, last_col = rows - 1, cols - 1
+        # As transformações das coordenadas.
+        transforms = [
+            lambda r, c: (r, c),
+            lambda r, c: (r, last_col - c),
+            lambda r, c: (last_row - r, c),
+            lambda r, c: (last_row - r, last_col - c),
+        ]
+        if rows == cols:
+            transforms.extend(
+                [
+                    lambda r, c: (c, r),
+                    lambda r, c: (c, last_row - r),
+                    lambda r, c: (last_col - c, r),
+                    lambda r, c: (
+                        last_col - c,
+                        last_row - r,
+                    ),
+                ]
+            )
+        # 'perms[s][i]' é o índice da casa 'i' após
+        # aplicar a simetria 's'.
+        self.perms = []
+        for transform in transforms:
+            perm = []
+            for index in range(size):
+                r, c = transform(*divmod(index, cols))
+                perm.append(r * cols + c)
+            self.perms.append(tuple(perm))
+        # As permutações inversas, usadas para
+        # desfazer uma simetria.
+        self.inverses = []
+        for perm in self.perms:
+            inverse = [0] * size
+            for index, target in enumerate(perm):
+                inverse[target] = index
+            self.inverses.append(tuple(inverse))
+        # Tabelas de transformação por blocos de
+        # 'CHUNK' bits, evitando iterar bit a bit.
+        chunk = self.CHUNK
+        n_chunks = (size + chunk - 1) // chunk
+        self.tables = []
+        for perm in self.perms:
+            sym_tables = []
+            for i in range(n_chunks):
+                table = [0] * (1 << chunk)
+                for value in range(1 << chunk):
+                    mask = 0
+                    for j in range(chunk):
+                        index = i * chunk + j
+                        if value >> j & 1 and index < size:
+                            mask |= 1 << perm[index]
+                    table[value] = mask
+                sym_tables.append(tuple(table))
+            self.tables.append(tuple(sym_tables))
+        self.size = size
+
+    def transform(self, mask: int, sym: int) -> int:
+        """Aplica uma simetria a uma máscara.
+
+        Args:
+            mask (int): A máscara das casas.
+            sym (int): O índice da simetria.
+
+        Returns:
+            int: A máscara transformada."""
+        result = 0
+        for table in self.tables[sym]:
+            if not mask:
+                break
+            result |= table[mask & self.CHUNK_MASK]
+            mask >>= self.CHUNK
+        return result
+
+    def canonical(self, x: int, o: int) -> tuple[int, int]:
+        """Retorna a chave canônica de uma posição,
+        isto é, a menor chave entre todas as suas
+        simetrias.
+
+        Args:
+            x (int): As casas ocupadas por 'X'.
+            o (int): As casas ocupadas por 'O'.
+
+        Returns:
+            tuple[int, int]: A chave canônica e o
+            índice da simetria que a produz."""
+        size = self.size
+        best_key = -1
+        best_sym = 0
+        for sym in range(len(self.tables)):
+            key = self.transform(x, sym) | (
+                self.transform(o, sym) << size
+            )
+            if best_key < 0 or key < best_key:
+                best_key = key
+                best_sym = sym
+        return (best_key, best_sym)
+
+
+# As simetrias já calculadas, por tamanho de
+# tabuleiro.
+_symmetries: dict[tuple[int, int], Symmetries] = {}
+
+
+def get_symmetries(rows: int, cols: int) -> Symmetries:
+    """Retorna as simetrias de um tabuleiro,
+    calculando-as somente na primeira vez.
+
+    Args:
+        rows (int): A quantidade de linhas do
+        tabuleiro.
+        cols (int): A quantidade de colunas do
+        tabuleiro.
+
+    Returns:
+        Symmetries: As simetrias do tabuleiro."""
+    key = (rows, cols)
+    if key not in _symmetries:
+        _symmetries[key] = Symmetries(rows, cols)
+    return _symmetries[key]
@@ -0,0 +1,561 @@
+import argparse
+import math
+import mmap
+import os
+import struct
+import time
+from typing import Callable, Optional
+from Engine.Position import Position
+from Engine.SolvedTable import _rules_digest
+from Engine.Symmetries import get_symmetries
+from TicTacToe.Game import Game
+
+# Identificação e versão do formato do arquivo.
+MAGIC = b"TTTB"
+VERSION = 1
+# Cabeçalho: identificação, versão, linhas, colunas, o
+# resumo das regras e o progresso da geração (a
+# próxima camada e a próxima posição dela a ser
+# resolvida; a camada é -1 quando a tabela está
+# completa).
+HEADER = struct.Struct("<4sBBB8shQ")
+# O resultado de uma posição, do ponto de vista do
+# jogador do turno, nos 2 bits mais baixos de cada
+# byte; nos demais, a quantidade de jogadas até o fim
+# da partida, com jogo perfeito. 'UNKNOWN' indica uma
+# posição inalcançável ou não canônica.
+UNKNOWN, WIN, LOSS, DRAW = 0, 1, 2, 3
+DISTANCE_SHIFT = 2
+# O maior tabuleiro aceito, limitado pelos bits da
+# distância.
+MAX_CELLS = 63
+# A quantidade de posições resolvidas entre dois
+# registros do progresso.
+DEFAULT_CHUNK = 1 << 16
+
+
+def default_path(rows: int, cols: int, k: int) -> str:
+    """Retorna o caminho padrão da tabela de um
+    tabuleiro, ao lado deste módulo.
+
+    Args:
+        rows (int): A quantidade de linhas.
+        cols (int): A quantidade de colunas.
+        k (int): O tamanho da sequência vitoriosa.
+
+    Returns:
+        str: O caminho do arquivo."""
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        f"tablebase-{rows}x{cols}-{k}.bin",
+    )
+
+
+class LayerIndex:
+    """Numeração das posições de um tabuleiro em
+    camadas, pela quantidade de casas ocupadas.
+
+    Na camada 'n', 'X' possui 'ceil(n / 2)' casas e 'O',
+    'floor(n / 2)'. Uma posição é numerada pelo índice
+    combinatório do conjunto das casas ocupadas e, em
+    seguida, pelo índice das casas de 'X' dentro dele,
+    de modo que cada camada ocupa exatamente
+    'C(casas, n) * C(n, ceil(n / 2))' entradas."""
+
+    def __init__(self, cells: int) -> None:
+        """Construtor base.
+
+        Args:
+            cells (int): A quantidade de casas do
+            tabuleiro.
+        """
+        self.cells = cells
+        # 'binom[n][r]' é 'C(n, r)' (0 quando r > n).
+        self.binom = [
+            [math.comb(n, r) for r in range(cells + 2)]
+            for n in range(cells + 1)
+        ]
+        # O tamanho e o início de cada camada.
+        self.sizes = [
+            math.comb(cells, n) * math.comb(n, (n + 1) // 2)
+            for n in range(cells + 1)
+        ]
+        self.offsets = [0]
+        for size in self.sizes:
+            self.offsets.append(self.offsets[-1] + size)
+        self.total = self.offsets[-1]
+
+    def rank(self, x: int, o: int) -> int:
+        """Retorna o índice de uma posição.
+
+        Args:
+            x (int): As casas ocupadas por 'X'.
+            o (int): As casas ocupadas por 'O'.
+
+        Returns:
+            int: O índice, contado desde a camada 0."""
+        binom = self.binom
+        occupied = x | o
+        n = occupied.bit_count()
+        occupied_rank = x_rank = 0
+        i = j = 0
+        while occupied:
+            bit = occupied & -occupied
+            i += 1
+            occupied_rank += binom[bit.bit_length() - 1][i]
+            if x & bit:
+                j += 1
+                x_rank += binom[i - 1][j]
+            occupied ^= bit
+        return (
+            self.offsets[n]
+            + occupied_rank * binom[n][(n + 1) // 2]
+            + x_rank
+        )
+
+    def unrank(self, n: int, index: int) -> tuple[int, int]:
+        """Retorna a posição de um índice de uma
+        camada.
+
+        Args:
+            n (int): A camada.
+            index (int): O índice dentro da camada.
+
+        Returns:
+            tuple[int, int]: As casas de 'X' e de
+            'O'."""
+        binom = self.binom
+        x_count = (n + 1) // 2
+        occupied_rank, x_rank = divmod(index, binom[n][x_count])
+        # As casas ocupadas, da maior para a menor.
+        cells = []
+        p = self.cells - 1
+        for i in range(n, 0, -1):
+            while binom[p][i] > occupied_rank:
+                p -= 1
+            occupied_rank -= binom[p][i]
+            cells.append(p)
+            p -= 1
+        # As posições, entre as ocupadas, das casas de
+        # 'X', da maior para a menor.
+        x = o = 0
+        q = n - 1
+        for j in range(x_count, 0, -1):
+            while binom[q][j] > x_rank:
+                q -= 1
+            x_rank -= binom[q][j]
+            x |= 1 << cells[n - 1 - q]
+            q -= 1
+        for cell in cells:
+            o |= 1 << cell
+        return (x, o & ~x)
+
+
+def _pack(result: int, distance: int) -> int:
+    """Codifica o resultado e a distância em um byte.
+
+    Args:
+        result (int): 'WIN', 'LOSS' ou 'DRAW'.
+        distance (int): As jogadas até o fim.
+
+    Returns:
+        int: O byte da entrada."""
+    return result | distance << DISTANCE_SHIFT
+
+
+def _solve_chunk(
+    index: LayerIndex,
+    rows: int,
+    cols: int,
+    win_masks: tuple[int, ...],
+    data: mmap.mmap,
+    base: int,
+    n: int,
+    start: int,
+    end: int,
+) -> bytearray:
+    """Resolve as posições canônicas de um trecho de
+    uma camada, a partir dos valores da camada
+    seguinte, já gravados em 'data'.
+
+    Returns:
+        bytearray: As entradas do trecho."""
+    cells = rows * cols
+    symmetries = get_symmetries(rows, cols)
+    transform = symmetries.transform
+    sym_count = len(symmetries.perms)
+    rank = index.rank
+    unrank = index.unrank
+    full = (1 << cells) - 1
+    x_turn = n % 2 == 0
+    out = bytearray(end - start)
+    for offset in range(end - start):
+        x, o = unrank(n, start + offset)
+        # Somente a menor posição entre as simétricas
+        # é resolvida.
+        key = x | o << cells
+        for sym in range(1, sym_count):
+            image = transform(x, sym) | transform(o, sym) << cells
+            if image < key:
+                break
+        else:
+            mover, other = (x, o) if x_turn else (o, x)
+            # Uma posição em que o jogador do turno já
+            # venceu é inalcançável; uma em que o
+            # adversário venceu terminou com derrota.
+            if any(mover & mask == mask for mask in win_masks):
+                continue
+            if any(other & mask == mask for mask in win_masks):
+                out[offset] = _pack(LOSS, 0)
+                continue
+            if n == cells:
+                out[offset] = _pack(DRAW, 0)
+                continue
+            win = loss = None
+            draw = False
+            empty = ~(x | o) & full
+            while empty:
+                bit = empty & -empty
+                empty ^= bit
+                if x_turn:
+                    child_x, child_o = x | bit, o
+                else:
+                    child_x, child_o = x, o | bit
+                child = symmetries.canonical(child_x, child_o)[0]
+                entry = data[
+                    base + rank(child & full, child >> cells)
+                ]
+                # O resultado da posição seguinte é do
+                # ponto de vista do adversário.
+                result = entry & 3
+                distance = entry >> DISTANCE_SHIFT
+                if result == LOSS:
+                    if win is None or distance < win:
+                        win = distance
+                        if not win:
+                            break
+                elif result == DRAW:
+                    draw = True
+                elif loss is None or distance > loss:
+                    loss = distance
+            if win is not None:
+                out[offset] = _pack(WIN, win + 1)
+            elif draw:
+                # Um empate sempre termina com o
+                # tabuleiro cheio.
+                out[offset] = _pack(DRAW, cells - n)
+            else:
+                out[offset] = _pack(LOSS, loss + 1)
+    return out
+
+
+def build(
+    game: Game,
+    path: Optional[str] = None,
+    chunk: int = DEFAULT_CHUNK,
+    progress: Optional[Callable[[int, int, int], None]] = None,
+) -> None:
+    """Gera, por análise retrógrada, a tabela com o
+    resultado e a distância até o fim de todas as
+    posições de um tabuleiro.
+
+    As camadas são resolvidas da última (tabuleiro
+    cheio) para a primeira, cada posição a partir das
+    posições seguintes, já resolvidas. A tabela é
+    gravada diretamente no arquivo mapeado em memória,
+    e o progresso é registrado no cabeçalho a cada
+    trecho de 'chunk' posições: uma geração
+    interrompida continua de onde parou ao ser
+    executada novamente.
+
+    Args:
+        game (Game): O jogo cujas regras serão usadas.
+        path (str, optional): O caminho do arquivo.
+        Valor padrão: 'default_path' do tabuleiro.
+        chunk (int, optional): As posições de cada
+        trecho. Valor padrão: 'DEFAULT_CHUNK'.
+        progress (Callable, optional): Função chamada
+        após cada trecho, com a camada, as posições já
+        resolvidas dela e o seu tamanho. Valor padrão:
+        None.
+
+    Raises:
+        ValueError: Caso o tabuleiro seja grande
+        demais."""
+    rows, cols = game.rows, game.cols
+    cells = rows * cols
+    if cells > MAX_CELLS:
+        raise ValueError(
+            f"Tabuleiro grande demais: {rows}x{cols}."
+        )
+    if path is None:
+        path = default_path(rows, cols, game.k)
+    win_masks = Position.get_win_masks(
+        game.winning_positions, cols
+    )
+    digest = _rules_digest(rows, cols, win_masks)
+    index = LayerIndex(cells)
+    size = HEADER.size + index.total
+
+    # Continua uma geração já iniciada, caso o arquivo
+    # corresponda às mesmas regras; caso contrário,
+    # começa do zero.
+    layer, start = cells, 0
+    mode = "r+b"
+    try:
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            existing = os.fstat(file.fileno()).st_size
+        magic, version, r, c, d, layer, start = HEADER.unpack(
+            header
+        )
+        if (magic, version, r, c, d, existing) != (
+            MAGIC,
+            VERSION,
+            rows,
+            cols,
+            digest,
+            size,
+        ):
+            raise ValueError()
+    except (OSError, ValueError, struct.error):
+        layer, start = cells, 0
+        mode = "w+b"
+    with open(path, mode) as file:
+        if mode == "w+b":
+            file.truncate(size)
+            file.write(
+                HEADER.pack(
+                    MAGIC, VERSION, rows, cols, digest,
+                    layer, start,
+                )
+            )
+            file.flush()
+        data = mmap.mmap(file.fileno(), size)
+        try:
+            while layer >= 0:
+                base = HEADER.size
+                layer_start = base + index.offsets[layer]
+                layer_size = index.sizes[layer]
+                while start < layer_size:
+                    end = min(start + chunk, layer_size)
+                    out = _solve_chunk(
+                        index, rows, cols, win_masks, data,
+                        base, layer, start, end,
+                    )
+                    first = layer_start + start
+                    data[first : first + len(out)] = out
+                    start = end
+                    # Grava as entradas antes do progresso,
+                    # de modo que o progresso nunca indique
+                    # entradas ainda não gravadas.
+                    data.flush()
+                    next_layer, next_start = (
+                        (layer, start)
+                        if start < layer_size
+                        else (layer - 1, 0)
+                    )
+                    data[: HEADER.size] = HEADER.pack(
+                        MAGIC, VERSION, rows, cols, digest,
+                        next_layer, next_start,
+                    )
+                    data.flush()
+                    if progress is not None:
+                        progress(layer, start, layer_size)
+                layer, start = layer - 1, 0
+        finally:
+            data.close()
+
+
+class Tablebase:
+    """Tabela, mapeada em memória, gerada por 'build',
+    com o resultado e a distância até o fim de todas as
+    posições de um tabuleiro.
+
+    Possui a mesma interface de consulta de
+    'SolvedTable' ('lookup'), podendo substituí-la na
+    busca."""
+
+    def __init__(
+        self, data: mmap.mmap, rows: int, cols: int
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            data (mmap.mmap): O conteúdo do arquivo.
+            rows (int): A quantidade de linhas.
+            cols (int): A quantidade de colunas.
+        """
+        self._data = data
+        self.rows = rows
+        self.cols = cols
+        self._index = LayerIndex(rows * cols)
+        self._symmetries = get_symmetries(rows, cols)
+
+    @classmethod
+    def load(
+        cls, game: Game, path: Optional[str] = None
+    ) -> Optional["Tablebase"]:
+        """Carrega a tabela de um arquivo, caso ela
+        exista, esteja completa e corresponda às regras
+        de 'game'.
+
+        Args:
+            game (Game): O jogo cujas regras a tabela
+            deve seguir.
+            path (str, optional): O caminho do
+            arquivo. Valor padrão: 'default_path' do
+            tabuleiro.
+
+        Returns:
+            Optional[Tablebase]: A tabela, ou None caso
+            esteja ausente, incompleta ou
+            desatualizada."""
+        rows, cols = game.rows, game.cols
+        if rows * cols > MAX_CELLS:
+            return None
+        if path is None:
+            path = default_path(rows, cols, game.k)
+        win_masks = Position.get_win_masks(
+            game.winning_positions, cols
+        )
+        expected = HEADER.pack(
+            MAGIC,
+            VERSION,
+            rows,
+            cols,
+            _rules_digest(rows, cols, win_masks),
+            -1,
+            0,
+        )
+        try:
+            with open(path, "rb") as file:
+                data = mmap.mmap(
+                    file.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ,
+                )
+        except (OSError, ValueError):
+            return None
+        size = HEADER.size + LayerIndex(rows * cols).total
+        if data[: HEADER.size] != expected or len(data) != size:
+            data.close()
+            return None
+        return cls(data, rows, cols)
+
+    def probe(self, x: int, o: int) -> tuple[int, int]:
+        """Consulta uma posição.
+
+        Args:
+            x (int): As casas ocupadas por 'X'.
+            o (int): As casas ocupadas por 'O'.
+
+        Returns:
+            tuple[int, int]: O resultado, do ponto de
+            vista do jogador do turno ('UNKNOWN' caso a
+            posição seja inalcançável), e a quantidade
+            de jogadas até o fim."""
+        cells = self.rows * self.cols
+        key = self._symmetries.canonical(x, o)[0]
+        entry = self._data[
+            HEADER.size
+            + self._index.rank(
+                key & ((1 << cells) - 1), key >> cells
+            )
+        ]
+        return (entry & 3, entry >> DISTANCE_SHIFT)
+
+    def lookup(
+        self, pos: Position
+    ) -> Optional[tuple[int, tuple[int, int]]]:
+        """Busca o valor e a melhor jogada de uma
+        posição: a vitória mais rápida, o empate ou a
+        derrota mais demorada.
+
+        Args:
+            pos (Position): A posição buscada.
+
+        Returns:
+            Optional[tuple[int, tuple[int, int]]]: O
+            valor da posição (1 se 'X' vence, -1 se 'O'
+            vence e 0 em caso de empate) e as
+            coordenadas ('x' e 'y') da melhor jogada, ou
+            None caso a posição seja inalcançável ou já
+            tenha terminado."""
+        result, distance = self.probe(pos.x, pos.o)
+        if result == UNKNOWN or not distance:
+            return None
+        x_turn = pos.x.bit_count() == pos.o.bit_count()
+        best_bit = best_score = None
+        for bit in pos.legal_moves():
+            if x_turn:
+                child = self.probe(pos.x | bit, pos.o)
+            else:
+                child = self.probe(pos.x, pos.o | bit)
+            child, child_distance = child
+            # Ordena as jogadas pelo ponto de vista do
+            # jogador do turno: vitórias rápidas,
+            # empates e derrotas demoradas.
+            if child == LOSS:
+                score = (2, -child_distance)
+            elif child == DRAW:
+                score = (1, 0)
+            else:
+                score = (0, child_distance)
+            if best_score is None or score > best_score:
+                best_bit, best_score = bit, score
+        value = {WIN: 1, LOSS: -1, DRAW: 0}[result]
+        return (
+            value if x_turn else -value,
+            pos.to_coords(best_bit),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Gera, por análise retrógrada, a "
+        "tabela com o resultado de todas as posições "
+        "de um tabuleiro. Uma geração interrompida "
+        "continua de onde parou."
+    )
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--cols", type=int, default=4)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument(
+        "--path",
+        default=None,
+        help="O arquivo da tabela (padrão: ao lado "
+        "deste módulo).",
+    )
+    parser.add_argument(
+        "--chunk",
+        type=int,
+        default=DEFAULT_CHUNK,
+        help="Posições resolvidas entre dois registros "
+        "do progresso.",
+    )
+    args = parser.parse_args()
+    game = Game(args.rows, args.cols, args.k)
+    start = time.perf_counter()
+
+    def report(layer: int, done: int, total: int) -> None:
+        print(
+            f"camada {layer}: {done}/{total} "
+            f"({time.perf_counter() - start:.1f}s)",
+            flush=True,
+        )
+
+    build(game, args.path, args.chunk, report)
+    path = args.path or default_path(
+        args.rows, args.cols, args.k
+    )
+    result, distance = Tablebase.load(game, path).probe(0, 0)
+    names = {WIN: "vitória", LOSS: "derrota", DRAW: "empate"}
+    print(
+        f"Tabela completa em '{path}': {names[result]} "
+        f"de 'X' em {distance} jogadas."
+    )
+
+
+if __name__ == "__main__":
+    main()
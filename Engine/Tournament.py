@@ -0,0 +1,392 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import time
+from typing import NamedTuple, Optional
+from Engine.MCTS import MCTS
+from Engine.Search import Search
+from Move import Move
+from TicTacToe.Game import Game
+
+
+class BotConfig(NamedTuple):
+    """A configuração de um 'bot' do torneio."""
+
+    # O nome do 'bot', usado nos relatórios.
+    name: str
+    # O tipo do 'bot': "minimax", "mcts" ou "random".
+    kind: str
+    # A profundidade máxima da busca (None para a
+    # profundidade padrão do tabuleiro).
+    depth: Optional[int] = None
+    # A quantidade máxima de simulações do "mcts"
+    # (None para limitar somente pelo tempo).
+    playouts: Optional[int] = None
+
+
+class GameTask(NamedTuple):
+    """Uma partida a ser jogada por um processo."""
+
+    # O índice da partida.
+    index: int
+    # Os 'bots' que jogam com 'X' e com 'O'.
+    x_bot: BotConfig
+    o_bot: BotConfig
+    # As dimensões e o tamanho da sequência vitoriosa.
+    rows: int
+    cols: int
+    k: int
+    # A quantidade de jogadas iniciais aleatórias.
+    openings: int
+    # A semente das jogadas aleatórias.
+    seed: int
+    # O tempo máximo, em segundos, de cada jogada dos
+    # 'bots' (None para não limitar).
+    time_budget: Optional[float] = None
+
+
+class GameRecord(NamedTuple):
+    """O resultado de uma partida do torneio."""
+
+    # O índice da partida.
+    index: int
+    # Os nomes dos 'bots' que jogaram com 'X' e 'O'.
+    x_name: str
+    o_name: str
+    # O 'símbolo' do vencedor ("" em caso de empate).
+    winner: str
+    # A quantidade de jogadas.
+    moves: int
+    # O tempo, em segundos, de cada jogada escolhida
+    # pelos 'bots' de 'X' e de 'O'.
+    x_latencies: list[float]
+    o_latencies: list[float]
+
+
+# Os motores de busca de cada processo, reutilizados
+# (junto com as suas tabelas de transposição) entre
+# as partidas.
+_engines: dict[BotConfig, Search | MCTS] = {}
+
+
+def parse_bot(spec: str) -> BotConfig:
+    """Converte uma especificação 'nome=tipo[:n]' em
+    uma configuração de 'bot', onde 'n' é a
+    profundidade do "minimax" ou a quantidade de
+    simulações do "mcts".
+
+    Args:
+        spec (str): A especificação, como "d4=minimax:4",
+        "m=mcts:2000" ou "rnd=random".
+
+    Returns:
+        BotConfig: A configuração do 'bot'."""
+    name, _, rest = spec.partition("=")
+    kind, _, depth = (rest or name).partition(":")
+    if kind not in ("minimax", "mcts", "random"):
+        raise argparse.ArgumentTypeError(
+            f"Tipo de 'bot' desconhecido: {kind!r}."
+        )
+    limit = int(depth) if depth else None
+    if kind == "mcts":
+        return BotConfig(name=name, kind=kind, playouts=limit)
+    return BotConfig(name=name, kind=kind, depth=limit)
+
+
+def play_task(task: GameTask) -> GameRecord:
+    """Joga uma partida do torneio.
+
+    Args:
+        task (GameTask): A partida a ser jogada.
+
+    Returns:
+        GameRecord: O resultado da partida."""
+    rng = random.Random(task.seed)
+    game = Game(task.rows, task.cols, task.k)
+    bots = {"X": task.x_bot, "O": task.o_bot}
+    latencies = {"X": [], "O": []}
+    moves = 0
+    while True:
+        label = game._get_player_label()
+        bot = bots[label]
+        if moves < task.openings or bot.kind == "random":
+            # Escolhe uma casa vazia qualquer.
+            row, col = rng.choice(
+                [
+                    (move.row, move.col)
+                    for row in game._current_moves
+                    for move in row
+                    if move.label == ""
+                ]
+            )
+        else:
+            engine = _engines.get(bot)
+            if engine is None:
+                if bot.kind == "mcts":
+                    engine = MCTS(
+                        playouts=bot.playouts, seed=task.seed
+                    )
+                else:
+                    engine = Search(depth=bot.depth)
+                _engines[bot] = engine
+            start = time.perf_counter()
+            row, col = engine.best_move(game, task.time_budget)
+            latencies[label].append(
+                time.perf_counter() - start
+            )
+        game.make_move(Move(row, col, label))
+        moves += 1
+
+        # Verifica se a partida terminou.
+        game.check_move()
+        if game._has_winner or game.is_tied():
+            break
+    return GameRecord(
+        index=task.index,
+        x_name=task.x_bot.name,
+        o_name=task.o_bot.name,
+        winner=label if game._has_winner else "",
+        moves=moves,
+        x_latencies=latencies["X"],
+        o_latencies=latencies["O"],
+    )
+
+
+def make_tasks(
+    bots: list[BotConfig],
+    games: int,
+    rows: int,
+    cols: int,
+    k: int,
+    openings: int,
+    seed: int,
+    time_budget: Optional[float] = None,
+) -> list[GameTask]:
+    """Cria as partidas de um torneio em que cada par
+    de 'bots' joga 'games' partidas com cada cor.
+
+    Returns:
+        list[GameTask]: As partidas do torneio."""
+    tasks = []
+    pairs = itertools.permutations(bots, 2)
+    for x_bot, o_bot in pairs:
+        for _ in range(games):
+            tasks.append(
+                GameTask(
+                    index=len(tasks),
+                    x_bot=x_bot,
+                    o_bot=o_bot,
+                    rows=rows,
+                    cols=cols,
+                    k=k,
+                    openings=openings,
+                    seed=seed + len(tasks),
+                    time_budget=time_budget,
+                )
+            )
+    return tasks
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Retorna o percentil 'q' (entre 0 e 100) de uma
+    lista de valores, por interpolação linear.
+
+    Args:
+        values (list[float]): Os valores, ordenados.
+        q (float): O percentil.
+
+    Returns:
+        float: O valor do percentil, ou 0 caso a lista
+        esteja vazia."""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (
+        position - low
+    )
+
+
+def run(
+    tasks: list[GameTask],
+    processes: Optional[int] = None,
+    chunksize: Optional[int] = None,
+):
+    """Distribui as partidas entre um conjunto de
+    processos, devolvendo os resultados conforme
+    terminam.
+
+    Args:
+        tasks (list[GameTask]): As partidas.
+        processes (int, optional): A quantidade de
+        processos. Valor padrão: a quantidade de
+        núcleos.
+        chunksize (int, optional): A quantidade de
+        partidas enviadas de uma vez a cada processo.
+        Valor padrão: calculado a partir do total.
+
+    Yields:
+        GameRecord: O resultado de cada partida."""
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (processes * 8))
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(
+            play_task, tasks, chunksize
+        )
+
+
+def report(
+    bots: list[BotConfig],
+    records: list[GameRecord],
+    elapsed: float,
+) -> str:
+    """Monta o relatório do torneio: vitórias, empates
+    e derrotas, partidas por segundo e a latência das
+    jogadas de cada 'bot'.
+
+    Returns:
+        str: O relatório."""
+    names = [bot.name for bot in bots]
+    # Vitórias, empates e derrotas de cada 'bot', no
+    # total e contra cada adversário.
+    totals = {name: [0, 0, 0] for name in names}
+    pairs = {
+        (a, b): [0, 0, 0] for a in names for b in names
+    }
+    latencies = {name: [] for name in names}
+    for record in records:
+        for name, other, label in (
+            (record.x_name, record.o_name, "X"),
+            (record.o_name, record.x_name, "O"),
+        ):
+            if record.winner == label:
+                column = 0
+            elif record.winner == "":
+                column = 1
+            else:
+                column = 2
+            totals[name][column] += 1
+            pairs[(name, other)][column] += 1
+        latencies[record.x_name].extend(record.x_latencies)
+        latencies[record.o_name].extend(record.o_latencies)
+
+    width = max(len(name) for name in names) + 2
+    lines = [
+        f"{len(records)} partidas em {elapsed:.2f}s "
+        f"({len(records) / max(elapsed, 1e-9):.1f} "
+        "partidas/s)",
+        "",
+        "Vitórias/Empates/Derrotas:",
+        "".ljust(width)
+        + "".join(name.rjust(14) for name in names)
+        + "Total".rjust(14),
+    ]
+    for name in names:
+        row = [
+            "/".join(map(str, pairs[(name, other)]))
+            if other != name
+            else "-"
+            for other in names
+        ]
+        row.append("/".join(map(str, totals[name])))
+        lines.append(
+            name.ljust(width)
+            + "".join(cell.rjust(14) for cell in row)
+        )
+    lines.extend(["", "Latência por jogada (ms):"])
+    lines.append(
+        "".ljust(width)
+        + "".join(
+            column.rjust(10)
+            for column in ("jogadas", "p50", "p90", "p99")
+        )
+    )
+    for name in names:
+        values = sorted(latencies[name])
+        cells = [str(len(values))] + [
+            f"{percentile(values, q) * 1000:.2f}"
+            for q in (50, 90, 99)
+        ]
+        lines.append(
+            name.ljust(width)
+            + "".join(cell.rjust(10) for cell in cells)
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Torneio entre configurações do "
+        "'bot', distribuído entre processos."
+    )
+    parser.add_argument(
+        "bots",
+        nargs="+",
+        type=parse_bot,
+        help="Os 'bots', como 'd4=minimax:4', "
+        "'m=mcts:2000' ou 'rnd=random'.",
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=10,
+        help="Partidas por par de 'bots' e por cor.",
+    )
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument(
+        "--openings",
+        type=int,
+        default=0,
+        help="Jogadas iniciais aleatórias.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--time",
+        type=float,
+        default=None,
+        help="O tempo máximo, em segundos, de cada "
+        "jogada dos 'bots'.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Processos (padrão: um por núcleo).",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Partidas enviadas de uma vez a cada "
+        "processo.",
+    )
+    args = parser.parse_args()
+    if len({bot.name for bot in args.bots}) < 2:
+        parser.error("São necessários dois 'bots' distintos.")
+
+    tasks = make_tasks(
+        args.bots,
+        args.games,
+        args.rows,
+        args.cols,
+        args.k,
+        args.openings,
+        args.seed,
+        args.time,
+    )
+    start = time.perf_counter()
+    records = list(
+        run(tasks, args.processes, args.chunksize)
+    )
+    elapsed = time.perf_counter() - start
+    print(report(args.bots, records, elapsed))
+
+
+if __name__ == "__main__":
+    main()
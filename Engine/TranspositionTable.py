@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from typing import Optional
+from Engine.Position import Position
+from Engine.Symmetries import get_symmetries
+
+# Os tipos de limite de um valor armazenado na tabela:
+# valor exato, limite inferior (houve poda 'beta') e
+# limite superior (nenhuma jogada superou 'alpha').
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    """Tabela de transposição para a busca alfa-beta.
+
+    As posições são indexadas pelo menor 'hash' de
+    Zobrist entre as suas simetrias, de modo que
+    todas as rotações e reflexões de uma mesma
+    posição compartilham a mesma entrada. Cada
+    entrada guarda o valor, o tipo de limite ('EXACT',
+    'LOWER' ou 'UPPER'), a melhor jogada encontrada e
+    a profundidade restante da busca que a gerou.
+    Quando a tabela atinge 'max_size' entradas, a
+    entrada usada há mais tempo é descartada (LRU)."""
+
+    def __init__(self, max_size: int = 1 << 20) -> None:
+        """Construtor base.
+
+        Args:
+            max_size (int, optional): A quantidade
+            máxima de entradas. Valor padrão: 2^20.
+        """
+        self.max_size = max_size
+        # As entradas, da menos para a mais recente.
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        """Retorna a quantidade de entradas."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        self._entries.clear()
+
+    def canonical(self, pos: Position) -> tuple[int, int]:
+        """Retorna a chave canônica de uma posição.
+
+        Args:
+            pos (Position): A posição.
+
+        Returns:
+            tuple[int, int]: A chave canônica e o
+            índice da simetria que a produz."""
+        return pos.zobrist.canonical(pos.hashes)
+
+    def get(
+        self, pos: Position, key: int, sym: int
+    ) -> Optional[tuple[float, int, Optional[int], int]]:
+        """Busca uma posição na tabela.
+
+        Args:
+            pos (Position): A posição buscada.
+            key (int): A chave canônica da posição.
+            sym (int): A simetria que produz a chave.
+
+        Returns:
+            Optional[tuple[float, int, Optional[int], int]]:
+            O valor, o tipo de limite, o bit da melhor
+            jogada (já na orientação de 'pos') e a
+            profundidade da busca, ou None caso a
+            posição não esteja na tabela."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        # Marca a entrada como a mais recente.
+        self._entries.move_to_end(key)
+        value, flag, move, depth = entry
+        if move is not None:
+            # Desfaz a simetria usada na chave.
+            symmetries = get_symmetries(pos.rows, pos.cols)
+            move = 1 << symmetries.inverses[sym][move]
+        return (value, flag, move, depth)
+
+    def store(
+        self,
+        pos: Position,
+        key: int,
+        sym: int,
+        value: float,
+        flag: int,
+        move: Optional[int],
+        depth: int,
+    ) -> None:
+        """Armazena o resultado da busca de uma
+        posição.
+
+        Args:
+            pos (Position): A posição buscada.
+            key (int): A chave canônica da posição.
+            sym (int): A simetria que produz a chave.
+            value (float): O valor encontrado.
+            flag (int): O tipo de limite do valor.
+            move (Optional[int]): O bit da melhor
+            jogada encontrada.
+            depth (int): A profundidade restante da
+            busca.
+        """
+        if move is not None:
+            # Guarda a jogada na orientação canônica.
+            symmetries = get_symmetries(pos.rows, pos.cols)
+            index = move.bit_length() - 1
+            move = symmetries.perms[sym][index]
+        entries = self._entries
+        entries[key] = (value, flag, move, depth)
+        entries.move_to_end(key)
+        # Descarta a entrada usada há mais tempo.
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
@@ -0,0 +1,130 @@
+import random
+from Engine.Symmetries import get_symmetries
+
+# A semente padrão das chaves, fixa para que os
+# 'hashes' sejam os mesmos em qualquer processo (e
+# possam ser guardados em disco).
+SEED = 20240917
+# A quantidade de bits de cada 'hash'.
+BITS = 64
+HASH_MASK = (1 << BITS) - 1
+
+
+class Zobrist:
+    """As chaves do 'hash' de Zobrist de um tabuleiro
+    com 'rows' linhas e 'cols' colunas.
+
+    O 'hash' de uma posição é o XOR das chaves de suas
+    casas ocupadas, e é atualizado com um único XOR a
+    cada jogada feita ou desfeita. Como as jogadas
+    alternam entre 'X' e 'O', a chave do turno é
+    incluída na chave de cada casa: o 'hash' já
+    distingue o jogador do turno.
+
+    Para que posições simétricas compartilhem uma
+    mesma chave canônica, o 'hash' de cada simetria do
+    tabuleiro é mantido junto, em blocos de 'BITS' bits
+    de um único inteiro (os 'hashes'). O bloco 0 é o
+    'hash' da própria posição."""
+
+    def __init__(
+        self, rows: int, cols: int, seed: int = SEED
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            rows (int): A quantidade de linhas do
+            tabuleiro.
+            cols (int): A quantidade de colunas do
+            tabuleiro.
+            seed (int, optional): A semente das chaves.
+            Valor padrão: 'SEED'.
+        """
+        size = rows * cols
+        rng = random.Random(f"{seed}:{rows}x{cols}")
+        x_keys = [rng.getrandbits(BITS) for _ in range(size)]
+        o_keys = [rng.getrandbits(BITS) for _ in range(size)]
+        # A chave do turno de 'O'.
+        self.side = rng.getrandbits(BITS)
+        perms = get_symmetries(rows, cols).perms
+        self.count = len(perms)
+        # A chave do turno, repetida em cada bloco.
+        side = 0
+        for sym in range(self.count):
+            side |= self.side << (sym * BITS)
+        # As chaves de cada casa, já com o turno, em
+        # cada simetria: no bloco 's', a chave da casa
+        # para onde a simetria 's' a leva.
+        self.x = []
+        self.o = []
+        for index in range(size):
+            x_key = o_key = side
+            for sym, perm in enumerate(perms):
+                x_key ^= x_keys[perm[index]] << (sym * BITS)
+                o_key ^= o_keys[perm[index]] << (sym * BITS)
+            self.x.append(x_key)
+            self.o.append(o_key)
+        self.x = tuple(self.x)
+        self.o = tuple(self.o)
+
+    def hashes(self, x: int, o: int) -> int:
+        """Calcula, do zero, os 'hashes' de uma
+        posição.
+
+        Args:
+            x (int): As casas ocupadas por 'X'.
+            o (int): As casas ocupadas por 'O'.
+
+        Returns:
+            int: Os 'hashes' de cada simetria."""
+        result = 0
+        for stones, keys in ((x, self.x), (o, self.o)):
+            while stones:
+                bit = stones & -stones
+                result ^= keys[bit.bit_length() - 1]
+                stones ^= bit
+        return result
+
+    def canonical(self, hashes: int) -> tuple[int, int]:
+        """Retorna a chave canônica de uma posição,
+        isto é, o menor 'hash' entre as suas
+        simetrias.
+
+        Args:
+            hashes (int): Os 'hashes' da posição.
+
+        Returns:
+            tuple[int, int]: A chave canônica e o
+            índice da simetria que a produz."""
+        best_key = hashes & HASH_MASK
+        best_sym = 0
+        for sym in range(1, self.count):
+            hashes >>= BITS
+            key = hashes & HASH_MASK
+            if key < best_key:
+                best_key = key
+                best_sym = sym
+        return (best_key, best_sym)
+
+
+# As chaves já calculadas, por tamanho de tabuleiro.
+_zobrist: dict[tuple[int, int], Zobrist] = {}
+
+
+def get_zobrist(rows: int, cols: int) -> Zobrist:
+    """Retorna as chaves de Zobrist (com a semente
+    padrão) de um tabuleiro, calculando-as somente na
+    primeira vez.
+
+    Args:
+        rows (int): A quantidade de linhas do
+        tabuleiro.
+        cols (int): A quantidade de colunas do
+        tabuleiro.
+
+    Returns:
+        Zobrist: As chaves do tabuleiro."""
+    key = (rows, cols)
+    if key not in _zobrist:
+        _zobrist[key] = Zobrist(rows, cols)
+    return _zobrist[key]
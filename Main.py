@@ -1,8 +1,106 @@
-from TicTacToe.Window import Window
+import argparse
+from Engine.Search import DEFAULT_DIFFICULTY, DIFFICULTIES
 
 
 def main() -> None:
-    window = Window()
+    parser = argparse.ArgumentParser(
+        description="Jogo da velha contra o 'bot'."
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=3,
+        help="A quantidade de linhas do tabuleiro.",
+    )
+    parser.add_argument(
+        "--cols",
+        type=int,
+        default=3,
+        help="A quantidade de colunas do tabuleiro.",
+    )
+    parser.add_argument(
+        "-k",
+        type=int,
+        default=3,
+        help="O tamanho da sequência vitoriosa.",
+    )
+    parser.add_argument(
+        "--time",
+        type=float,
+        default=None,
+        help="O tempo máximo, em segundos, de cada "
+        "jogada do 'bot', no lugar do tempo do nível "
+        "de dificuldade.",
+    )
+    parser.add_argument(
+        "--difficulty",
+        choices=[difficulty.name for difficulty in DIFFICULTIES],
+        default=DEFAULT_DIFFICULTY,
+        help="O nível de dificuldade do 'bot'.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="A quantidade de processos da busca do "
+        "'bot'.",
+    )
+    parser.add_argument(
+        "--ponder",
+        action="store_true",
+        help="Faz o 'bot' buscar as suas respostas "
+        "durante o turno do usuário.",
+    )
+    parser.add_argument(
+        "--no-log",
+        dest="game_log",
+        action="store_false",
+        help="Não grava as partidas no registro de "
+        "partidas do tabuleiro.",
+    )
+    parser.add_argument(
+        "--terminal",
+        action="store_true",
+        help="Joga no terminal, sem interface gráfica "
+        "(e sem importar o 'tkinter').",
+    )
+    args = parser.parse_args()
+    # As interfaces são importadas somente quando
+    # usadas: o 'tkinter' é lento para carregar e
+    # ausente (ou sem tela) em alguns ambientes.
+    if args.terminal:
+        from TicTacToe.Terminal import Terminal
+
+        Terminal(
+            args.rows,
+            args.cols,
+            args.k,
+            args.time,
+            args.difficulty,
+            args.processes,
+            game_log=args.game_log,
+        ).run()
+        return
+    import tkinter as tk
+    from TicTacToe.Window import Window
+
+    try:
+        window = Window(
+            args.rows,
+            args.cols,
+            args.k,
+            args.time,
+            args.difficulty,
+            args.processes,
+            args.ponder,
+            args.game_log,
+        )
+    except tk.TclError as error:
+        parser.exit(
+            1,
+            f"Interface gráfica indisponível ({error}); "
+            "use '--terminal'.\n",
+        )
     window.mainloop()
 
 
@@ -1,27 +1,214 @@
+import math
+import queue
+import threading
 import tkinter as tk
 from tkinter import font
 from Move import Move
+from Engine.GameLog import GameLogWriter, game_result
+from Engine.Position import Position
+from Engine.Search import (
+    DEFAULT_DIFFICULTY,
+    WIN,
+    Search,
+    SearchCancelled,
+    get_difficulty,
+)
+from Engine.SearchStats import BOUND_SIGNS, SearchStats
+from Engine.SolvedTable import SolvedTable
+from Engine.Tablebase import Tablebase
+from Engine.TranspositionTable import TranspositionTable
 from TicTacToe.Game import Game
 
-from copy import deepcopy
-
 
 class Board:
-    """Representa o tabuleiro (3x3)
+    """Representa o tabuleiro (por padrão, 3x3)
     do jogo da velha."""
 
-    def __init__(self, master) -> None:
-        """Construtor base."""
+    # O intervalo, em milissegundos, entre as
+    # verificações do resultado da busca do 'bot'.
+    POLL_INTERVAL = 10
+    # O tempo máximo, em segundos, de cada análise do
+    # modo de análise.
+    ANALYSIS_TIME = 2.0
+    # Quantas vezes a reflexão ('ponder') percorre as
+    # jogadas prováveis do usuário, dobrando o tempo de
+    # cada busca a cada vez.
+    PONDER_PASSES = 4
+    # A escala das cores do mapa de calor: uma jogada
+    # avaliada em 'HEAT_SCALE' já é quase verde (ou,
+    # negativa, quase vermelha).
+    HEAT_SCALE = 256
+    # O lado, em 'pixels', do tabuleiro 3x3 (em
+    # tabuleiros maiores, as casas diminuem até
+    # 'MIN_CELL').
+    BOARD_SIZE = 360
+    # O lado mínimo, em 'pixels', de uma casa.
+    MIN_CELL = 24
+    # O espaço, em 'pixels', entre uma casa e a borda
+    # da sua área.
+    CELL_PAD = 3
+    # A cor de fundo das casas, restaurada pelo mapa
+    # de calor.
+    CELL_BG = "#d9d9d9"
+    # A cor da borda das casas, fora da sequência
+    # vitoriosa.
+    CELL_OUTLINE = "lightblue"
+
+    def __init__(
+        self,
+        master,
+        table: TranspositionTable = None,
+        rows: int = 3,
+        cols: int = 3,
+        k: int = 3,
+        time_budget: float = None,
+        difficulty: str = DEFAULT_DIFFICULTY,
+        processes: int = 1,
+        ponder: bool = False,
+        game_log: bool = True,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            master: A janela pai.
+            table (TranspositionTable, optional): A
+            tabela de transposição usada pelo 'bot',
+            compartilhada entre jogadas e partidas.
+            Valor padrão: uma nova tabela.
+            rows (int, optional): A quantidade de
+            linhas do tabuleiro. Valor padrão: 3.
+            cols (int, optional): A quantidade de
+            colunas do tabuleiro. Valor padrão: 3.
+            k (int, optional): A quantidade de
+            'símbolos' em sequência necessária para
+            vencer. Valor padrão: 3.
+            time_budget (float, optional): O tempo
+            máximo, em segundos, de cada busca do
+            'bot', no lugar do tempo do nível de
+            dificuldade. Valor padrão: None.
+            difficulty (str, optional): O nome do nível
+            de dificuldade do 'bot'. Valor padrão:
+            'DEFAULT_DIFFICULTY'.
+            processes (int, optional): A quantidade de
+            processos da busca do 'bot': com mais de
+            um, usa 'ParallelSearch'. Valor padrão: 1.
+            ponder (bool, optional): Se o 'bot' busca,
+            durante o turno do usuário, as suas
+            respostas às jogadas mais prováveis dele
+            ('ponder'). Valor padrão: False.
+            game_log (bool, optional): Se as partidas
+            são gravadas no registro de partidas do
+            tabuleiro ('Engine.GameLog'). Valor padrão:
+            True.
+        """
         # Referência à janela pai.
         self.master = master
         # Objeto responsável pela lógica do jogo.
-        self._game = Game()
-        # As posições ('row' e 'col') dos botões.
-        self._cells = {}
+        self._game = Game(rows, cols, k)
+        # O motor de busca do 'bot'. A tabela com o
+        # jogo resolvido é gerada por
+        # 'python -m Engine.SolvedTable' (ou, em
+        # tabuleiros maiores,
+        # 'python -m Engine.Tablebase') e, caso
+        # esteja ausente ou desatualizada, o 'bot'
+        # volta a usar a busca.
+        solved = SolvedTable.load(self._game) or Tablebase.load(
+            self._game
+        )
+        # A busca paralela (com o 'multiprocessing') é
+        # importada somente quando usada, acelerando a
+        # inicialização.
+        if processes > 1:
+            from Engine.ParallelSearch import ParallelSearch
+
+            # A busca paralela usa a sua própria tabela,
+            # em memória compartilhada.
+            self._engine = ParallelSearch(
+                processes, solved=solved
+            )
+        else:
+            self._engine = Search(table=table, solved=solved)
+        # A 'thread' da busca em andamento, o evento
+        # que a cancela e a fila com o seu resultado.
+        self._worker = None
+        self._stop = threading.Event()
+        self._results = queue.Queue()
+        # Indica se o 'bot' está pensando.
+        self._thinking = False
+        # As estatísticas da busca, coletadas somente
+        # enquanto o painel de depuração está visível.
+        self._stats = SearchStats()
+        self._show_stats = False
+        # O modo de análise: uma busca própria, que
+        # avalia todas as jogadas do usuário e usa a
+        # mesma tabela de transposição do 'bot' (as
+        # duas nunca buscam ao mesmo tempo), a sua
+        # 'thread', o evento que a cancela e a fila com
+        # os valores de cada profundidade concluída.
+        self._analyzer = Search(table=table)
+        self._analysis = False
+        self._analysis_worker = None
+        self._analysis_stop = threading.Event()
+        self._analysis_results = queue.Queue()
+        # A cor de fundo exibida em cada casa pelo
+        # mapa de calor.
+        self._heat = {}
+        # A reflexão ('ponder'): a sua 'thread', o
+        # evento que a cancela e as respostas já
+        # encontradas, pela posição ('x' e 'o') após a
+        # jogada do usuário, junto com o tempo de busca
+        # usado.
+        self.ponder = ponder
+        self._ponder_worker = None
+        self._ponder_stop = threading.Event()
+        self._pondered = {}
+        # O registro das partidas, gravado em lotes por
+        # outra 'thread'; sem ele (tabuleiro grande
+        # demais, arquivo inacessível ou de outras
+        # regras), as partidas não são gravadas. Cada
+        # partida é gravada uma única vez, como foi
+        # deixada ao reiniciar ou fechar: um final
+        # desfeito nunca é gravado.
+        self._log = None
+        if game_log:
+            try:
+                self._log = GameLogWriter(self._game)
+            except (OSError, ValueError):
+                pass
+        # O tempo escolhido pelo usuário ('--time')
+        # substitui o de todos os níveis, inclusive
+        # dos escolhidos depois no menu.
+        self._time_override = time_budget
+        # O nível de dificuldade e o tempo máximo de
+        # cada busca do 'bot'.
+        self.set_difficulty(difficulty)
+        # A cor da borda das casas da sequência
+        # vitoriosa marcada.
+        self._outline = {}
+        # Os itens do 'Canvas' (o fundo e o texto) de
+        # cada casa, pela posição ('row' e 'col').
+        self._items = {}
+        # O que está desenhado em cada casa (o texto,
+        # a sua cor, o fundo e a borda), somente nas
+        # casas diferentes de uma casa vazia, para que
+        # somente as casas alteradas sejam
+        # redesenhadas.
+        self._drawn = {}
         # Cria um 'Frame' para os Textos.
         self._create_board_display()
         # Cria o 'Grid' do tabuleiro.
         self._create_board_grid()
+        # Atalhos para desfazer e refazer jogadas.
+        self.master.bind("<Control-z>", self.undo)
+        self.master.bind("<Control-y>", self.redo)
+        # Atalho para reiniciar a partida.
+        self.master.bind("<Control-r>", self.reset)
+        # Atalho para o painel de depuração da busca.
+        self.master.bind("<F3>", self.toggle_stats)
+        # Atalho para o modo de análise.
+        self.master.bind("<F4>", self.toggle_analysis)
+        # O usuário ('X') joga primeiro.
+        self._user_turn()
 
     def check_game_state(self) -> None:
         """Verifica o estado atual do jogo, caso não
@@ -50,20 +237,35 @@ class Board:
                 )
                 self._game._game_ended = True
 
+    def _log_game(self) -> None:
+        """Grava a partida atual no registro, com o seu
+        resultado ou, caso não tenha terminado, como
+        abandonada."""
+        if self._log is None or not self._game._history:
+            return
+        self._log.record(
+            self._game._history, game_result(self._game)
+        )
+
     def user_play(self, event) -> None:
         """Registra a jogada e verifica se houve
         empate ou vencedores, passando o turno caso
         contrário."""
+        # Ignora os cliques enquanto o 'bot' pensa.
+        if self._thinking:
+            return
+
         # Verifica o estado do jogo, indicando
         # se há vitória, empate ou não.
         self.check_game_state()
 
         # Verifica se o jogo não terminou.
         if not self._game._game_ended:
-            # Pega o botão que foi clicado, junto com
-            # as suas posições.
-            clicked_button = event.widget
-            row, col = self._cells[clicked_button]
+            # Pega a posição da casa clicada.
+            coords = self._cell_at(event.x, event.y)
+            if coords is None:
+                return
+            row, col = coords
             # Cria um 'movimento' para determinado
             # botão.
             move = Move(
@@ -74,14 +276,17 @@ class Board:
 
             # Verifica se o local selecionado é válido.
             if self._game.is_move_valid(move):
-                # Atualiza o conteúdo do botão.
-                self._update_button(clicked_button)
-
-                # Registra a jogada feita pelo jogador.
-                self._game._update_moves(move)
-
-                # Passa o turno.
-                self._game.next_turn()
+                # Encerra a análise e a reflexão da
+                # posição anterior.
+                self._cancel_analysis()
+                self._cancel_ponder()
+                self._clear_heatmap()
+
+                # Registra a jogada feita pelo jogador e
+                # passa o turno.
+                self._game.make_move(move)
+                # Atualiza o conteúdo da casa.
+                self._refresh_cell(row, col)
 
                 # Informa de quem é a vez, via texto.
                 self._update_display(
@@ -92,345 +297,630 @@ class Board:
                 # Faz o 'bot' jogar.
                 self.bot_play()
 
-    def _minimax_check_move(self, pos) -> bool:
-        """Verifica se algum jogador fez uma sequência
-        vitoriosa no estado atual do jogo.
+    def bot_play(self) -> None:
+        """Aplica o algoritmo de 'Minimax' com podagem
+        alfa-beta, para escolher a melhor jogada para
+        o 'bot'.
 
-        Args:
-            pos: O estado atual do jogo.
+        A busca é feita em outra 'thread', mantendo a
+        janela responsiva; o seu resultado é aplicado
+        por '_poll_search', no laço do 'tkinter'."""
+        # Verifica o estado do jogo, indicando
+        # se há vitória, empate ou não.
+        self.check_game_state()
 
-        Returns:
-            bool: Se algum jogador venceu com alguma
-            sequência."""
-        # Itera sobre todas as sequências vitoriosas
-        # do jogo.
-        for combo in self._game.winning_positions:
-            results = set()
-            # Itera sobre as sequências vitoriosas,
-            # obtendo os 'símbolos' de cada jogada da
-            # sequência.
-            for item in combo:
-                (n, m) = item
-                results.add(pos[n][m].label)
-
-            # Verifica se na sequência, existe somente
-            # um 'símbolo' e se o 'símbolo' é válido.
-            is_win = (
-                len(results) == 1
-                and "" not in results
+        # Verifica se o jogo não terminou.
+        if not self._game._game_ended:
+            # Caso a reflexão já tenha buscado esta
+            # posição, com pelo menos o tempo de uma
+            # busca do 'bot', responde imediatamente.
+            pos = self._game.position
+            pondered = self._pondered.get((pos.x, pos.o))
+            if pondered is not None and (
+                self.time_budget is None
+                or pondered[0] is not None
+                and pondered[0] >= self.time_budget
+            ):
+                self._apply_bot_move(pondered[1])
+                return
+            # Indica que o 'bot' está pensando.
+            self._thinking = True
+            self._update_display(
+                "Pensando...",
+                self._game._get_player_color(),
+            )
+            # Liga (ou desliga) a coleta de estatísticas
+            # antes de a busca começar.
+            if self._show_stats:
+                self._stats.attach(self._engine)
+            else:
+                self._stats.detach(self._engine)
+            # A busca usa uma cópia da posição, já que
+            # a partida pode ser reiniciada enquanto
+            # ela acontece.
+            self._stop = threading.Event()
+            self._worker = threading.Thread(
+                target=self._search_worker,
+                args=(
+                    self._game.position.copy(),
+                    self._game._get_player_label() == "X",
+                    self._stop,
+                ),
+                daemon=True,
+            )
+            self._worker.start()
+            self.master.after(
+                self.POLL_INTERVAL, self._poll_search
             )
-            if is_win:
-                return True
-        return False
 
-    def _minimax_tie(self, pos, has_winner) -> bool:
-        """Verifica se o estado atual do jogo está
-        empatado.
+    def _search_worker(self, pos, isMax, stop) -> None:
+        """Executa a busca do 'bot', fora do laço do
+        'tkinter', colocando o resultado (ou a falha)
+        na fila.
 
         Args:
-            pos: O estado atual do jogo.
-            has_winner: Se o jogo possui
-            vencedores.
+            pos (Position): A posição a ser buscada.
+            isMax: Se é o turno de 'X'.
+            stop (threading.Event): O evento que
+            cancela a busca.
+        """
+        try:
+            best_move = self._engine.search(
+                pos, isMax, self.time_budget, stop
+            )
+        except SearchCancelled:
+            return
+        except Exception as error:
+            # Uma falha da busca (por exemplo, nos
+            # processos da busca paralela) também é
+            # enviada ao laço do 'tkinter', que
+            # libera o tabuleiro.
+            best_move = error
+        self._results.put((stop, best_move))
+
+    def _poll_search(self) -> None:
+        """Verifica se a busca do 'bot' terminou e,
+        então, aplica a jogada escolhida ou, caso a
+        busca tenha falhado, a de uma busca rasa."""
+        while True:
+            try:
+                stop, best_move = self._results.get_nowait()
+            except queue.Empty:
+                # Continua esperando enquanto a busca
+                # estiver em andamento.
+                self._update_stats()
+                if self._thinking:
+                    self.master.after(
+                        self.POLL_INTERVAL, self._poll_search
+                    )
+                return
+            # Descarta o resultado de uma busca
+            # cancelada, ainda na fila, e continua
+            # esperando pelo da busca atual.
+            if stop is self._stop and not stop.is_set():
+                break
+        self._thinking = False
+        self._update_stats()
+        if isinstance(best_move, Exception):
+            # Caso a busca tenha falhado, o 'bot' joga
+            # a melhor jogada de uma busca rasa, feita
+            # neste processo, e a falha é informada.
+            game = self._game
+            best_move = Search(depth=1).search(
+                game.position.copy(),
+                game._get_player_label() == "X",
+            )
+            self._apply_bot_move(best_move)
+            if not game._game_ended:
+                self._update_display(
+                    "Falha na busca do 'bot'; vez de "
+                    f"{game._get_player_label()}.",
+                    game._get_player_color(),
+                )
+            return
+        self._apply_bot_move(best_move)
+
+    def cancel_search(self) -> None:
+        """Cancela a busca do 'bot' em andamento, caso
+        exista, e espera a 'thread' terminar."""
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        self._thinking = False
+
+    def close(self) -> None:
+        """Cancela as buscas em andamento e libera os
+        recursos do motor de busca."""
+        self.cancel_search()
+        self._cancel_analysis()
+        self._cancel_ponder()
+        self._engine.close()
+        if self._log is not None:
+            self._log_game()
+            self._log.close()
+
+    def _user_turn(self) -> None:
+        """Inicia as buscas em segundo plano do turno
+        do usuário: a análise, caso o modo de análise
+        esteja ligado, ou, senão, a reflexão.
+
+        As duas usam a mesma busca e a mesma tabela de
+        transposição: ambas são canceladas antes que
+        qualquer uma seja iniciada."""
+        self._cancel_analysis()
+        self._cancel_ponder()
+        self._start_analysis()
+        self._start_ponder()
+
+    def _start_ponder(self) -> None:
+        """Inicia, em outra 'thread', a reflexão
+        ('ponder'): a busca das respostas do 'bot' às
+        jogadas mais prováveis do usuário.
+
+        A reflexão e a análise nunca acontecem ao mesmo
+        tempo, já que usam a mesma tabela de
+        transposição; a análise também busca todas as
+        jogadas do usuário, e os seus resultados ficam
+        na tabela."""
+        self._cancel_ponder()
+        if (
+            not self.ponder
+            or self._analysis
+            or self._thinking
+            or self._game._game_ended
+        ):
+            return
+        self._pondered.clear()
+        self._ponder_stop = threading.Event()
+        self._ponder_worker = threading.Thread(
+            target=self._ponder_worker_run,
+            args=(
+                self._game.position.copy(),
+                self._game._get_player_label() == "X",
+                self._ponder_stop,
+            ),
+            daemon=True,
+        )
+        self._ponder_worker.start()
 
-        Returns:
-            bool: Se o estado atual do jogo está
-            empatado ou não."""
-        played_moves = (
-            move.label for row in pos for move in row
+    def _ponder_worker_run(self, pos, isMax, stop) -> None:
+        """Executa a reflexão, fora do laço do
+        'tkinter'.
+
+        As jogadas do usuário são ordenadas por uma
+        análise rápida, da mais para a menos provável,
+        e a resposta do 'bot' a cada uma é buscada com
+        o seu tempo normal. Depois, as jogadas são
+        percorridas novamente, com o dobro do tempo.
+
+        Args:
+            pos (Position): A posição do turno do
+            usuário.
+            isMax: Se o usuário joga com 'X'.
+            stop (threading.Event): O evento que
+            cancela a reflexão.
+        """
+        budget = self.time_budget
+        try:
+            scores = self._analyzer.analyze(
+                pos, isMax, budget, stop
+            )
+            if isMax:
+                likely = sorted(scores, key=scores.get, reverse=True)
+            else:
+                likely = sorted(scores, key=scores.get)
+            for _ in range(self.PONDER_PASSES):
+                for row, col in likely:
+                    bit = 1 << (row * pos.cols + col)
+                    child = Position(
+                        pos.rows,
+                        pos.cols,
+                        pos.win_masks,
+                        pos.x | bit if isMax else pos.x,
+                        pos.o if isMax else pos.o | bit,
+                    )
+                    if child.has_winner() or child.is_full():
+                        continue
+                    move = self._engine.search(
+                        child, not isMax, budget, stop
+                    )
+                    self._pondered[(child.x, child.o)] = (
+                        budget,
+                        move,
+                    )
+                # Sem limite de tempo, as buscas já são
+                # completas.
+                if budget is None:
+                    break
+                budget *= 2
+        except SearchCancelled:
+            return
+
+    def _cancel_ponder(self) -> None:
+        """Cancela a reflexão em andamento, caso
+        exista, e espera a 'thread' terminar."""
+        self._ponder_stop.set()
+        if self._ponder_worker is not None:
+            self._ponder_worker.join()
+            self._ponder_worker = None
+
+    def toggle_analysis(self, event=None) -> None:
+        """Liga ou desliga o modo de análise, que
+        exibe, como um mapa de calor, o valor de cada
+        jogada do usuário."""
+        self._analysis = not self._analysis
+        self._user_turn()
+
+    def _start_analysis(self) -> None:
+        """Inicia, em outra 'thread', a análise da
+        posição atual, caso o modo de análise esteja
+        ligado e seja o turno do usuário.
+
+        As cores da análise anterior, de outra
+        posição, são removidas já no início, e não
+        quando a nova conclui a sua primeira
+        profundidade."""
+        self._cancel_analysis()
+        self._clear_heatmap()
+        if (
+            not self._analysis
+            or self._thinking
+            or self._game._game_ended
+        ):
+            return
+        isMax = self._game._get_player_label() == "X"
+        self._analysis_stop = threading.Event()
+        self._analysis_worker = threading.Thread(
+            target=self._analysis_worker_run,
+            args=(
+                self._game.position.copy(),
+                isMax,
+                self._analysis_stop,
+            ),
+            daemon=True,
+        )
+        self._analysis_worker.start()
+        self.master.after(
+            self.POLL_INTERVAL, self._poll_analysis
         )
-        return has_winner and all(played_moves)
 
-    def _minimax_heuristic(self, pos, isMax) -> int:
-        """Retorna a heurística do estado atual.
+    def _analysis_worker_run(self, pos, isMax, stop) -> None:
+        """Executa a análise, fora do laço do
+        'tkinter', colocando na fila os valores de
+        cada profundidade concluída.
 
         Args:
-            pos: O estado atual do jogo.
-            isMax: Indica se está no turno de
-            'X' ou 'O'.
+            pos (Position): A posição a ser analisada.
+            isMax: Se é o turno de 'X'.
+            stop (threading.Event): O evento que
+            cancela a análise.
+        """
 
-        Returns:
-            int: Um valor heurística referente ao
-            estado atual do jogo."""
-        # Verifica se existe vencedores no estado
-        # atual do jogo.
-        has_winner = self._minimax_check_move(pos)
-
-        # Verifica se o estado atual do jogo está
-        # empatado e, então, retorna 0.
-        if self._minimax_tie(pos, not has_winner):
-            return 0
-        # Verifica se o estado atual do jogo possui
-        # vencedores e, então, retorna 1 (caso o 'X'
-        # vença) ou -1 (caso o 'O' vença).
-        elif has_winner:
-            return -1 if isMax else 1
-        # Se o jogo não tiver terminado, retorna -2.
-        else:
-            return -2
+        def on_depth(depth: int, scores: dict) -> None:
+            self._analysis_results.put((stop, isMax, scores))
 
-    def _max(self, pos, alpha, beta):
-        """Ramo de maximização, turno de 'X'.
+        try:
+            self._analyzer.analyze(
+                pos, isMax, self.ANALYSIS_TIME, stop, on_depth
+            )
+        except SearchCancelled:
+            return
+        # Indica o fim da análise.
+        self._analysis_results.put((stop, isMax, None))
+
+    def _poll_analysis(self) -> None:
+        """Exibe os valores mais recentes da análise,
+        enquanto ela estiver em andamento."""
+        latest = None
+        running = True
+        while True:
+            try:
+                stop, isMax, scores = (
+                    self._analysis_results.get_nowait()
+                )
+            except queue.Empty:
+                break
+            # Descarta os valores de uma análise
+            # cancelada.
+            if stop is not self._analysis_stop or stop.is_set():
+                continue
+            if scores is None:
+                running = False
+            else:
+                latest = (isMax, scores)
+        if latest is not None:
+            self._show_heatmap(*latest)
+        if running and not self._analysis_stop.is_set():
+            self.master.after(
+                self.POLL_INTERVAL, self._poll_analysis
+            )
+
+    def _cancel_analysis(self) -> None:
+        """Cancela a análise em andamento, caso exista,
+        e espera a 'thread' terminar."""
+        self._analysis_stop.set()
+        if self._analysis_worker is not None:
+            self._analysis_worker.join()
+            self._analysis_worker = None
+
+    def _show_heatmap(self, isMax: bool, scores: dict) -> None:
+        """Colore as casas das jogadas analisadas,
+        do vermelho (jogadas ruins para o jogador do
+        turno) ao verde (jogadas boas).
 
         Args:
-            pos: O estado atual do tabuleiro.
-            alpha: O melhor valor para alfa.
-            beta: O melhor valor para beta.
+            isMax: Se é o turno de 'X'.
+            scores (dict): O valor de cada jogada, pelas
+            suas coordenadas, do ponto de vista de 'X'.
+        """
+        game = self._game
+        forced = WIN - game.rows * game.cols
+        for coords in list(self._heat):
+            if coords not in scores:
+                self._set_heat(coords, None)
+        for coords, value in scores.items():
+            color = self._heat_color(
+                value if isMax else -value, forced
+            )
+            self._set_heat(coords, color)
 
-        Returns:
-            O melhor valor encontrado, para jogada de
-            maximização, e, também, a melhor jogada
-            ('x' e 'y')."""
-        # Pega a heurística da posição atual.
-        heuristic = self._minimax_heuristic(pos, True)
-        # Indica que o jogo terminou, isto é, não
-        # existe mais 'folhas' para serem exploradas.
-        if heuristic != -2:
-            # Retorna a heurística do estado atual.
-            return (heuristic, None)
-        # Caso o jogo não tenha terminado...
+    def _clear_heatmap(self) -> None:
+        """Remove as cores do mapa de calor."""
+        for coords in list(self._heat):
+            self._set_heat(coords, None)
+
+    def _set_heat(self, coords: tuple, color) -> None:
+        """Altera a cor de fundo de uma casa pelo mapa
+        de calor.
+
+        Args:
+            coords (tuple): A posição ('row' e 'col')
+            da casa.
+            color: A nova cor, ou None para a cor
+            original.
+        """
+        if color is None:
+            self._heat.pop(coords, None)
         else:
-            # Valores bases (para melhor valor
-            # encontrado e melhor jogada).
-            best_value = float("-inf")
-            best_move = None
-
-            # Itera sobre TODAS as possibilidades,
-            # isto é, as posições que 'X' pode jogar.
-            for row in pos:
-                for move in row:
-                    # Verifica se a posição está
-                    # disponível.
-                    if move.label == "":
-                        # Cria uma jogada (objeto) para
-                        # a posição escolhida.
-                        temp_move = Move(
-                            move.row,
-                            move.col,
-                            "X",
-                        )
-
-                        # Registra o movimento,
-                        # alterando o estado atual do
-                        # jogo.
-                        pos[move.row][
-                            move.col
-                        ] = temp_move
-
-                        # Passa para o ramo de 'min',
-                        # pegando o menor valor possível.
-                        value = self._min(
-                            pos, alpha, beta
-                        )[0]
-
-                        # Restaura a posição alterada
-                        # previamente.
-                        pos[move.row][move.col] = move
-
-                        # Verifica se o valor
-                        # encontrado no ramo de 'min'
-                        # é melhor que 'best_value'.
-                        if value > best_value:
-                            # Altera o melhor valor
-                            # encontrado, junto com a
-                            # melhor sequência.
-                            best_value = value
-                            best_move = (
-                                move.row,
-                                move.col,
-                            )
-
-                        # Escolhe o maior valor para
-                        # 'alpha'.
-                        alpha = max(alpha, best_value)
-
-                        # Se 'beta' <= 'alpha', a
-                        # podagem é realizada neste
-                        # ramo, isto é, a jogada atual.
-                        if beta <= alpha:
-                            break
-            # Retorna o melhor valor encontrado e a
-            # melhor jogada.
-            return (best_value, best_move)
-
-    def _min(self, pos, alpha, beta):
-        """Ramo de minimização, turno de 'O'.
+            self._heat[coords] = color
+        self._draw_cell(coords)
+
+    @classmethod
+    def _heat_color(cls, value: int, forced: int) -> str:
+        """Converte o valor de uma jogada, do ponto de
+        vista de quem a faz, em uma cor: vermelho,
+        amarelo (valor nulo) e verde.
 
         Args:
-            pos: O estado atual do tabuleiro.
-            alpha: O melhor valor para alfa.
-            beta: O melhor valor para beta.
+            value (int): O valor da jogada.
+            forced (int): O menor valor de uma vitória
+            forçada.
 
         Returns:
-            O melhor valor encontrado, para jogada de
-            minimização, e, também, a melhor jogada
-            ('x' e 'y')."""
-        # Pega a heurística da posição atual.
-        heuristic = self._minimax_heuristic(
-            pos, False
-        )
-        # Indica que o jogo terminou, isto é, não
-        # existe mais 'folhas' para serem exploradas.
-        if heuristic != -2:
-            # Retorna a heurística do estado atual.
-            return (heuristic, None)
-        # Caso o jogo não tenha terminado...
+            str: A cor, em hexadecimal."""
+        if value >= forced:
+            heat = 1.0
+        elif value <= -forced:
+            heat = -1.0
         else:
-            # Valores bases (para melhor valor
-            # encontrado e melhor jogada).
-            best_value = float("inf")
-            best_move = None
-
-            # Itera sobre TODAS as possibilidades,
-            # isto é, as posições que 'O' pode jogar.
-            for row in pos:
-                for move in row:
-                    # Verifica se a posição está
-                    # disponível.
-                    if move.label == "":
-                        # Cria uma jogada (objeto) para
-                        # a posição escolhida.
-                        temp_move = Move(
-                            move.row,
-                            move.col,
-                            "O",
-                        )
-
-                        # Registra o movimento,
-                        # alterando o estado atual do
-                        # jogo.
-                        pos[move.row][
-                            move.col
-                        ] = temp_move
-
-                        # Passa para o ramo de 'max',
-                        # pegando o maior valor possível.
-                        value = self._max(
-                            pos, alpha, beta
-                        )[0]
-
-                        # Restaura a posição alterada
-                        # previamente.
-                        pos[move.row][move.col] = move
-
-                        # Verifica se o valor
-                        # encontrado no ramo de 'max'
-                        # é melhor que 'best_value'.
-                        if value < best_value:
-                            # Altera o melhor valor
-                            # encontrado, junto com a
-                            # melhor sequência.
-                            best_value = value
-                            best_move = (
-                                move.row,
-                                move.col,
-                            )
-
-                        # Escolhe o menor valor para
-                        # 'beta'.
-                        beta = min(beta, best_value)
-
-                        # Se 'beta' <= 'alpha', a
-                        # podagem é realizada neste
-                        # ramo, isto é, a jogada atual.
-                        if beta <= alpha:
-                            break
-            # Retorna o melhor valor encontrado e a
-            # melhor jogada.
-            return (best_value, best_move)
-
-    def _minimax(self, pos, isMax, alpha, beta):
-        """Algoritmo de 'Minimax', com podagem
-        alfa-beta.
+            # Uma vitória forçada é sempre mais forte
+            # do que qualquer avaliação estática.
+            heat = 0.9 * math.tanh(value / cls.HEAT_SCALE)
+        red = 255 if heat <= 0 else round(255 * (1 - heat))
+        green = 255 if heat >= 0 else round(255 * (1 + heat))
+        return f"#{red:02x}{green:02x}60"
+
+    def _apply_bot_move(self, best_move) -> None:
+        """Registra a jogada escolhida pelo 'bot'.
 
         Args:
-            pos: O estado atual do tabuleiro.
-            isMax: Se a jogada é de maximização
-            ou de minimização.
-            alpha: O melhor valor para alfa.
-            beta: O melhor valor para beta.
+            best_move: As coordenadas ('x' e 'y') da
+            jogada.
+        """
+        # Cria uma jogada (objeto Move) para o bot.
+        bot_move = Move(
+            best_move[0],
+            best_move[1],
+            self._game._get_player_label(),
+        )
 
-        Returns:
-            O melhor valor encontrado, para jogada de
-            maximização ou minimização, e, também, a
-            melhor jogada ('x' e 'y')."""
-        # Vez de 'X'.
-        if isMax:
-            return self._max(pos, alpha, beta)
-        # Vez de 'O'.
-        else:
-            return self._min(pos, alpha, beta)
+        # Registra o movimento do 'bot' e passa o
+        # turno.
+        self._game.make_move(bot_move)
+        # Atualiza a casa escolhida pelo 'bot'.
+        self._refresh_cell(bot_move.row, bot_move.col)
+
+        # Informa de quem é a vez, via texto.
+        self._update_display(
+            self._game._get_player_label(),
+            self._game._get_player_color(),
+        )
 
-    def bot_play(self) -> None:
-        """Aplica o algoritmo de 'Minimax' com podagem
-        alfa-beta, para escolher a melhor jogada para
-        o 'bot'."""
         # Verifica o estado do jogo, indicando
         # se há vitória, empate ou não.
         self.check_game_state()
+        # Analisa a nova posição, ou reflete sobre
+        # ela.
+        self._user_turn()
+
+    def reset(self, event=None) -> None:
+        """Reinicia a partida, cancelando a busca do
+        'bot' em andamento."""
+        self.cancel_search()
+        # Remove a marcação de uma sequência
+        # vitoriosa.
+        self._highlight_cells(self.CELL_OUTLINE)
+        self._log_game()
+        game = self._game
+        self._game = Game(game.rows, game.cols, game.k)
+        # Somente as casas já desenhadas precisam ser
+        # apagadas.
+        for row, col in list(self._drawn):
+            self._refresh_cell(row, col)
+        self._update_display("")
+        self._user_turn()
+
+    def undo(self, event=None) -> None:
+        """Desfaz jogadas até voltar ao turno anterior
+        do usuário ('X'), isto é, a resposta do 'bot'
+        e a jogada do usuário."""
+        self.cancel_search()
+        if not self._game._history:
+            return
+        # Remove a marcação de uma sequência
+        # vitoriosa.
+        self._highlight_cells(self.CELL_OUTLINE)
+        while True:
+            move = self._game.undo()
+            self._refresh_cell(move.row, move.col)
+            if (
+                not self._game._history
+                or self._game._get_player_label() == "X"
+            ):
+                break
+        # Informa de quem é a vez, via texto.
+        self._update_display(
+            self._game._get_player_label(),
+            self._game._get_player_color(),
+        )
+        self._user_turn()
+
+    def redo(self, event=None) -> None:
+        """Refaz as jogadas desfeitas por 'undo', até o
+        próximo turno do usuário ('X')."""
+        if self._thinking:
+            return
+        while True:
+            move = self._game.redo()
+            if move is None:
+                break
+            self._refresh_cell(move.row, move.col)
+            if self._game._get_player_label() == "X":
+                break
+        # Informa de quem é a vez, via texto.
+        self._update_display(
+            self._game._get_player_label(),
+            self._game._get_player_color(),
+        )
+        # Verifica o estado do jogo, indicando
+        # se há vitória, empate ou não.
+        self.check_game_state()
+        self._user_turn()
 
-        # Verifica se o jogo não terminou.
-        if not self._game._game_ended:
-
-            # Aplica o algoritmo de 'Minimax' com
-            # poda alfa-beta, retornando o melhor
-            # valor encontrando e as coordenadas
-            # ('x' e 'y') da melhor jogada.
-            res = self._minimax(
-                deepcopy(self._game._current_moves),
-                False,
-                float("-inf"),
-                float("inf"),
-            )
-            best_move = res[1]
-
-            # Cria uma jogada (objeto Move) para o bot.
-            bot_move = Move(
-                best_move[0],
-                best_move[1],
-                self._game._get_player_label(),
-            )
+    def set_difficulty(self, name: str) -> None:
+        """Altera o nível de dificuldade do 'bot', a
+        partir da sua próxima jogada.
 
-            # Procura pelo botão correspondente as
-            # coordenadas ('x' e 'y') da jogada
-            # escolhida pelo 'bot'.
-            button = list(self._cells.keys())[
-                list(self._cells.values()).index(
-                    (bot_move.row, bot_move.col)
-                )
-            ]
+        Args:
+            name (str): O nome do nível.
+        """
+        difficulty = get_difficulty(name)
+        self.difficulty = difficulty.name
+        # As respostas já encontradas pela reflexão
+        # valem somente para o nível anterior.
+        pondering = self._ponder_worker is not None
+        self._cancel_ponder()
+        self._pondered.clear()
+        self._engine.depth = difficulty.depth
+        self.time_budget = (
+            self._time_override
+            if self._time_override is not None
+            else difficulty.time_budget
+        )
+        if pondering:
+            self._start_ponder()
+
+    def toggle_stats(self, event=None) -> None:
+        """Exibe ou esconde o painel de depuração com
+        as estatísticas da busca do 'bot'.
+
+        As estatísticas só são coletadas a partir da
+        próxima busca com o painel visível."""
+        self._show_stats = not self._show_stats
+        if self._show_stats:
+            self.stats_display.pack(fill=tk.X, padx=5, pady=5)
+            self._update_stats()
+        else:
+            self.stats_display.pack_forget()
+
+    def _update_stats(self) -> None:
+        """Atualiza o painel de depuração com as
+        estatísticas da busca atual (ou da última)."""
+        if not self._show_stats:
+            return
+        text = self._stats.format()
+        text += (
+            "\nprofundidade: "
+            f"{self._engine.completed_depth}"
+        )
+        if self._stats.root_moves:
+            coords, value, bound = self._stats.root_moves[-1]
+            sign = BOUND_SIGNS[bound]
+            text += f"\nraiz: {coords} {sign} {value:g}"
+        self.stats_display["text"] = text
 
-            # Atualiza as informações do botão, isto é,
-            # o movimento escolhido pelo 'bot'.
-            self._update_button(button)
+    def _refresh_cell(self, row: int, col: int) -> None:
+        """Atualiza uma casa conforme o 'símbolo'
+        registrado na sua posição.
 
-            # Registra o movimento do 'bot'.
-            self._game._update_moves(bot_move)
+        Args:
+            row (int): O índice da linha da casa.
+            col (int): O índice da coluna da casa.
+        """
+        self._draw_cell((row, col))
 
-            # Passa o turno.
-            self._game.next_turn()
+    def _draw_cell(self, coords: tuple) -> None:
+        """Redesenha uma casa, alterando somente os
+        itens do 'Canvas' que mudaram: o 'símbolo', o
+        fundo (do mapa de calor) e a borda (da
+        sequência vitoriosa).
 
-            # Informa de quem é a vez, via texto.
-            self._update_display(
-                self._game._get_player_label(),
-                self._game._get_player_color(),
+        Args:
+            coords (tuple): A posição ('row' e 'col')
+            da casa.
+        """
+        label = self._game._get_label(*coords)
+        state = (
+            label,
+            self._game._colors.get(label, "black"),
+            self._heat.get(coords, self.CELL_BG),
+            self._outline.get(coords, self.CELL_OUTLINE),
+        )
+        blank = ("", "black", self.CELL_BG, self.CELL_OUTLINE)
+        drawn = self._drawn.get(coords, blank)
+        if state == drawn:
+            return
+        rect, text = self._items[coords]
+        if state[:2] != drawn[:2]:
+            self.canvas.itemconfig(
+                text, text=state[0], fill=state[1]
             )
+        if state[2:] != drawn[2:]:
+            self.canvas.itemconfig(
+                rect, fill=state[2], outline=state[3]
+            )
+        if state == blank:
+            del self._drawn[coords]
+        else:
+            self._drawn[coords] = state
 
-            # Verifica o estado do jogo, indicando
-            # se há vitória, empate ou não.
-            self.check_game_state()
+    def _cell_at(self, x: int, y: int):
+        """Retorna a casa de um ponto do 'Canvas'.
 
-    def _update_button(self, clicked_button) -> None:
-        """Atualiza as informações de um botão."""
-        # Altera o texto do botão para o 'símbolo' do
-        # jogador.
-        clicked_button.config(
-            text=self._game._get_player_label()
-        )
-        # Altera a cor do texto do botão, para a cor
-        # do 'símbolo' do jogador.
-        clicked_button.config(
-            fg=self._game._get_player_color()
-        )
+        Args:
+            x (int): A coordenada horizontal do ponto.
+            y (int): A coordenada vertical do ponto.
+
+        Returns:
+            tuple | None: A posição ('row' e 'col') da
+            casa, ou None fora do tabuleiro.
+        """
+        row, col = y // self._cell_size, x // self._cell_size
+        game = self._game
+        if 0 <= row < game.rows and 0 <= col < game.cols:
+            return row, col
+        return None
 
     def _update_display(
         self, msg: str, color: str = "black"
@@ -447,14 +937,20 @@ class Board:
         self.display["text"] = msg
         self.display["fg"] = color
 
-    def _highlight_cells(self) -> None:
-        """Altera a cor de fundo dos botões na
-        sequência vitoriosa."""
-        for button, coords in self._cells.items():
-            if coords in self._game.winner_combo:
-                button.config(
-                    highlightbackground="black"
-                )
+    def _highlight_cells(self, color: str = "black") -> None:
+        """Altera a cor da borda das casas na
+        sequência vitoriosa.
+
+        Args:
+            color (str, optional): A nova cor da borda.
+            Valor padrão: "black".
+        """
+        for coords in self._game.winner_combo:
+            if color == self.CELL_OUTLINE:
+                self._outline.pop(coords, None)
+            else:
+                self._outline[coords] = color
+            self._draw_cell(coords)
 
     def _create_board_display(self) -> None:
         """Cria um 'Frame' no topo da janela pai."""
@@ -471,55 +967,68 @@ class Board:
         # Exibe o 'Label' no 'Frame' recentemente
         # criado, com um 'pady' de 10.
         self.display.pack(pady=10)
+        # O painel de depuração, exibido no rodapé da
+        # janela por 'toggle_stats'.
+        self.stats_display = tk.Label(
+            master=self.master,
+            text="",
+            font=font.Font(family="Courier", size=10),
+            justify=tk.LEFT,
+            anchor="w",
+        )
 
     def _create_board_grid(self) -> None:
-        """Cria um 'Frame' para o 'Grid' na janela pai
-        e adiciona os botões, referentes ao espaços
-        para o 'X' e/ou 'O'."""
-        # Cria um 'Frame' para o 'Grid' e exibe-o.
-        grid_frame = tk.Frame(master=self.master)
-        grid_frame.pack()
-
-        # Itera sobre as linhas do tabuleiro, máximo 3.
-        for row in range(3):
-            # Configura o posicionamento nas linhas.
-            self.master.rowconfigure(
-                row, weight=1, minsize=50
-            )
-            # Configura o posicionamento nas colunas.
-            self.master.columnconfigure(
-                row, weight=1, minsize=75
-            )
-            # Itera sobre as colunas do tabuleiro,
-            # máximo 3.
-            for col in range(3):
-                # Cria e configura o botão, responsável
-                # pelo 'Grid' na posição 'row' e 'col'.
-                button = tk.Button(
-                    master=grid_frame,
-                    text="",
-                    font=font.Font(
-                        size=36, weight="bold"
-                    ),
-                    fg="black",
-                    width=3,
-                    height=2,
-                    highlightbackground="lightblue",
-                )
-                # Adiciona o botão, junto com as suas
-                # posições ('row' e 'col'), em '_cells'.
-                self._cells[button] = (row, col)
-                # Atribui uma 'key' ao botão, sendo
-                # este o botão esquerdo do mouse.
-                button.bind(
-                    "<ButtonPress-1>", self.user_play
+        """Cria o 'Canvas' do tabuleiro na janela pai,
+        com um retângulo e um texto, referentes aos
+        espaços para o 'X' e/ou 'O', em cada casa.
+
+        Um único 'Canvas', com uma única fonte, é
+        criado muito mais rápido do que um botão por
+        casa, e o clique é localizado pelas suas
+        coordenadas, sem procurar pelo botão."""
+        rows, cols = self._game.rows, self._game.cols
+        # As casas diminuem conforme o tabuleiro
+        # cresce.
+        size = max(
+            self.MIN_CELL, self.BOARD_SIZE // max(rows, cols, 3)
+        )
+        self._cell_size = size
+        # A fonte dos 'símbolos', compartilhada por
+        # todas as casas; ela também diminui conforme
+        # o tabuleiro cresce.
+        self._cell_font = font.Font(
+            size=max(10, 108 // max(rows, cols, 3)),
+            weight="bold",
+        )
+        # Cria o 'Canvas' e exibe-o.
+        self.canvas = tk.Canvas(
+            master=self.master,
+            width=cols * size,
+            height=rows * size,
+            highlightthickness=0,
+        )
+        self.canvas.pack(padx=5, pady=5)
+        pad = self.CELL_PAD
+        for row in range(rows):
+            for col in range(cols):
+                x, y = col * size, row * size
+                rect = self.canvas.create_rectangle(
+                    x + pad,
+                    y + pad,
+                    x + size - pad,
+                    y + size - pad,
+                    fill=self.CELL_BG,
+                    outline=self.CELL_OUTLINE,
+                    width=2,
                 )
-                # Ajusta a posição do botão, conforme
-                # o 'row' e 'col'.
-                button.grid(
-                    row=row,
-                    column=col,
-                    padx=5,
-                    pady=5,
-                    sticky="nsew",
+                text = self.canvas.create_text(
+                    x + size // 2,
+                    y + size // 2,
+                    text="",
+                    fill="black",
+                    font=self._cell_font,
                 )
+                self._items[(row, col)] = (rect, text)
+        # Atribui uma 'key' ao 'Canvas', sendo esta o
+        # botão esquerdo do mouse.
+        self.canvas.bind("<ButtonPress-1>", self.user_play)
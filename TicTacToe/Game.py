@@ -1,37 +1,102 @@
-import tkinter as tk
 from itertools import cycle
-from tkinter import font
-from typing import Any
+from typing import Any, Iterable, Optional
+from Engine.Position import Position
 from Move import Move
-
 from Player import Player
 
 
 class Game:
     """Representa toda a lógica do jogo da velha."""
 
-    def __init__(self) -> None:
-        """Construtor base."""
-        # Um iterador cíclico sobre os jogadores do
-        # jogo da velha.
-        self._players = cycle(
-            (
-                Player(label="X", color="red"),
-                Player(label="O", color="blue"),
+    def __init__(
+        self, rows: int = 3, cols: int = 3, k: int = 3
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            rows (int, optional): A quantidade de
+            linhas do tabuleiro. Valor padrão: 3.
+            cols (int, optional): A quantidade de
+            colunas do tabuleiro. Valor padrão: 3.
+            k (int, optional): A quantidade de
+            'símbolos' em sequência necessária para
+            vencer. Valor padrão: 3.
+        """
+        if rows < 1 or cols < 1:
+            raise ValueError(
+                f"Tabuleiro inválido: {rows}x{cols}."
+            )
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError(
+                f"Sequência inválida: {k} em "
+                f"{rows}x{cols}."
             )
+        # As dimensões do tabuleiro e o tamanho da
+        # sequência vitoriosa.
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        players = (
+            Player(label="X", color="red"),
+            Player(label="O", color="blue"),
         )
+        # A cor do 'símbolo' de cada jogador.
+        self._colors = {
+            player.label: player.color
+            for player in players
+        }
+        # Um iterador cíclico sobre os jogadores do
+        # jogo da velha.
+        self._players = cycle(players)
         # O jogador do turno atual.
         self._current_player = next(self._players)
         # O estado atual do jogo.
         self._current_moves = [
-            [Move(row, col) for col in range(3)]
-            for row in range(3)
+            [Move(row, col) for col in range(cols)]
+            for row in range(rows)
         ]
         # As sequências das posições que definem uma
         # vitória.
         self.winning_positions = (
             self._get_winning_positions()
         )
+        # Os índices das sequências vitoriosas que
+        # passam por cada casa.
+        self._lines_through = [
+            [[] for _ in range(cols)]
+            for _ in range(rows)
+        ]
+        for index, combo in enumerate(
+            self.winning_positions
+        ):
+            for row, col in combo:
+                self._lines_through[row][col].append(
+                    index
+                )
+        # A quantidade de 'símbolos' de cada jogador
+        # em cada sequência vitoriosa.
+        self._line_counts = {
+            "X": [0] * len(self.winning_positions),
+            "O": [0] * len(self.winning_positions),
+        }
+        # A quantidade de casas ocupadas.
+        self._move_count = 0
+        # A última jogada registrada.
+        self._last_move = None
+        # O estado atual do jogo em 'bitboard', mantido
+        # junto com '_current_moves' e usado, no lugar,
+        # pela busca do 'bot'.
+        self.position = Position(
+            rows,
+            cols,
+            Position.get_win_masks(
+                self.winning_positions, cols
+            ),
+        )
+        # As jogadas feitas, em ordem, e as jogadas
+        # desfeitas que ainda podem ser refeitas.
+        self._history = []
+        self._redo = []
         # A sequência, feita por um jogador, que o
         # levou à vitória.
         self.winner_combo = []
@@ -40,6 +105,18 @@ class Game:
         # Indica se o jogo já terminou.
         self._game_ended = False
 
+    @property
+    def hash(self) -> int:
+        """O 'hash' de Zobrist, de 64 bits, do estado
+        atual do jogo, incluindo o jogador do turno.
+
+        É atualizado a cada jogada, e é o mesmo em
+        qualquer processo.
+
+        Returns:
+            int: O 'hash' do estado atual."""
+        return self.position.hash
+
     def _get_player_label(self) -> str:
         """Retorna o 'símbolo' do jogador atual.
 
@@ -58,43 +135,46 @@ class Game:
 
     def _get_winning_positions(self) -> list[Any]:
         """Retorna todas as sequência de posições
-        vitoriosas.
+        vitoriosas, isto é, todas as sequências de 'k'
+        casas consecutivas nas linhas, colunas e
+        diagonais do tabuleiro.
 
         Returns:
             list[Any]: Uma lista contendo as
             sequências das posições vitoriosas."""
-        # As sequências de vitória nas linhas.
-        wins_on_row = [
-            [(move.row, move.col) for move in row]
-            for row in self._current_moves
-        ]
-        # As sequências de vitória nas colunas.
-        wins_on_col = [
-            list(col) for col in zip(*wins_on_row)
-        ]
-        # As sequências de vitória nas diagonais.
-        wins_on_diagonals = [
-            [
-                row[i]
-                for i, row in enumerate(wins_on_row)
-            ]
-        ]
-        wins_on_diagonals.extend(
-            [
-                [
-                    col[j]
-                    for j, col in enumerate(
-                        reversed(wins_on_col)
-                    )
-                ]
-            ]
-        )
-        # Retorna todas as sequências de vitória.
-        return (
-            wins_on_row
-            + wins_on_col
-            + wins_on_diagonals
+        rows, cols, k = self.rows, self.cols, self.k
+        steps = range(k)
+        # As direções das sequências: linhas,
+        # colunas, diagonais e anti-diagonais, junto
+        # com o intervalo de casas onde cada sequência
+        # pode começar sem sair do tabuleiro.
+        directions = (
+            (0, 1, range(rows), range(cols - k + 1)),
+            (1, 0, range(rows - k + 1), range(cols)),
+            (
+                1,
+                1,
+                range(rows - k + 1),
+                range(cols - k + 1),
+            ),
+            (
+                1,
+                -1,
+                range(rows - k + 1),
+                range(k - 1, cols),
+            ),
         )
+        winning_positions = []
+        for d_row, d_col, row_range, col_range in directions:
+            for row in row_range:
+                for col in col_range:
+                    winning_positions.append(
+                        [
+                            (row + i * d_row, col + i * d_col)
+                            for i in steps
+                        ]
+                    )
+        return winning_positions
 
     def is_move_valid(self, move: Move) -> bool:
         """Verifica se determinada posição é válida.
@@ -119,22 +199,119 @@ class Game:
         Returns:
             bool: Se existe empate no estado atual do
             jogo."""
-        # Verifica se ninguém ganhou.
-        no_winner = not self._has_winner
-        # Verifica se todas as posições no tabuleiro
-        # (3x3) foram preenchidas, por 'X' ou 'O'.
-        played_moves = (
-            move.label
-            for row in self._current_moves
-            for move in row
+        # Verifica se ninguém ganhou e se todas as
+        # posições no tabuleiro foram preenchidas, por
+        # 'X' ou 'O'.
+        return (
+            not self._has_winner
+            and self._move_count
+            == self.rows * self.cols
         )
-        # Retorna um valor booleano indicando empate.
-        return no_winner and all(played_moves)
 
     def next_turn(self) -> None:
         """Passa o turno."""
         self._current_player = next(self._players)
 
+    def _set_player(self, label: str) -> None:
+        """Define de quem é o turno atual.
+
+        Args:
+            label (str): O 'símbolo' do jogador.
+        """
+        while self._current_player.label != label:
+            self.next_turn()
+
+    def make_move(self, move: Move) -> None:
+        """Faz uma jogada: registra o movimento, guarda-o
+        no histórico e passa o turno.
+
+        Args:
+            move (Move): A jogada, com o 'símbolo' do
+            jogador do turno atual.
+        """
+        self._play(move)
+        # Uma nova jogada invalida as jogadas
+        # desfeitas.
+        self._redo.clear()
+
+    def _play(self, move: Move) -> None:
+        """Registra uma jogada no histórico e passa o
+        turno.
+
+        Args:
+            move (Move): A jogada.
+        """
+        self._update_moves(move)
+        self._history.append(move)
+        self._set_player(move.label)
+        self.next_turn()
+
+    def unmake_move(self) -> Optional[Move]:
+        """Desfaz a última jogada, devolvendo o turno ao
+        jogador que a fez.
+
+        Returns:
+            Optional[Move]: A jogada desfeita, ou None
+            caso nenhuma jogada tenha sido feita."""
+        if not self._history:
+            return None
+        move = self._history.pop()
+        self._reset_move(move)
+        self._set_player(move.label)
+        # Antes desta jogada o jogo não havia
+        # terminado.
+        self._has_winner = False
+        self._game_ended = False
+        self.winner_combo = []
+        # Nenhuma sequência foi completada até a
+        # jogada anterior.
+        self._last_move = (
+            self._history[-1] if self._history else None
+        )
+        return move
+
+    def undo(self) -> Optional[Move]:
+        """Desfaz a última jogada, permitindo refazê-la.
+
+        Returns:
+            Optional[Move]: A jogada desfeita, ou None
+            caso não haja o que desfazer."""
+        move = self.unmake_move()
+        if move is not None:
+            self._redo.append(move)
+        return move
+
+    def redo(self) -> Optional[Move]:
+        """Refaz a última jogada desfeita.
+
+        Returns:
+            Optional[Move]: A jogada refeita, ou None
+            caso não haja o que refazer."""
+        if not self._redo:
+            return None
+        move = self._redo.pop()
+        self._play(move)
+        self.check_move()
+        return move
+
+    def replay(self, moves: Iterable[Move]) -> None:
+        """Reinicia o jogo e refaz uma sequência de
+        jogadas, parando caso alguém vença.
+
+        Args:
+            moves (Iterable[Move]): As jogadas, em
+            ordem.
+        """
+        while self._history:
+            self.unmake_move()
+        self._redo.clear()
+        self._set_player("X")
+        for move in moves:
+            self.make_move(move)
+            self.check_move()
+            if self._has_winner:
+                break
+
     def _get_label(self, row: int, col: int) -> str:
         """Extrai o 'símbolo', de algum jogador,
         contido em uma jogada.
@@ -148,6 +325,36 @@ class Game:
         """
         return self._current_moves[row][col].label
 
+    def _update_counts(
+        self, row: int, col: int, label: str, delta: int
+    ) -> None:
+        """Atualiza os contadores das sequências que
+        passam por uma casa.
+
+        Args:
+            row (int): O índice da linha da casa.
+            col (int): O índice da coluna da casa.
+            label (str): O 'símbolo' do jogador.
+            delta (int): 1 ao ocupar a casa e -1 ao
+            liberá-la.
+        """
+        if not label:
+            return
+        counts = self._line_counts[label]
+        for index in self._lines_through[row][col]:
+            counts[index] += delta
+        self._move_count += delta
+        # Liga (ou desliga) o bit da casa na posição,
+        # atualizando o seu 'hash'.
+        index = row * self.cols + col
+        position = self.position
+        if label == "X":
+            position.x ^= 1 << index
+            position.hashes ^= position.zobrist.x[index]
+        else:
+            position.o ^= 1 << index
+            position.hashes ^= position.zobrist.o[index]
+
     def _update_moves(self, move: Move) -> None:
         """Registra o último movimento feito por algum
         jogador.
@@ -155,7 +362,14 @@ class Game:
         Args:
             move (Any): A jogada feita por algum
             jogador."""
-        self._current_moves[move.row][move.col] = move
+        row, col = move.row, move.col
+        # Desconta o 'símbolo' que ocupava a casa.
+        self._update_counts(
+            row, col, self._get_label(row, col), -1
+        )
+        self._current_moves[row][col] = move
+        self._update_counts(row, col, move.label, 1)
+        self._last_move = move
 
     def _reset_move(self, move: Move) -> None:
         """Reseta uma jogada.
@@ -164,34 +378,50 @@ class Game:
             move (Move): Uma jogada qualquer, feita
             por algum jogador.
         """
-        default_move = Move(move.row, move.col, "")
-        self._current_moves[move.row][
-            move.col
-        ] = default_move
+        row, col = move.row, move.col
+        self._update_counts(
+            row, col, self._get_label(row, col), -1
+        )
+        default_move = Move(row, col, "")
+        self._current_moves[row][col] = default_move
+        # Sem a última jogada, a próxima verificação
+        # considera todas as sequências.
+        self._last_move = None
 
     def check_move(self) -> None:
         """Verifica se algum jogador fez uma sequência
-        vitoriosa no estado atual do jogo."""
-        # Itera sobre todas as sequências vitoriosas
-        # do jogo.
-        for combo in self.winning_positions:
-            results = set()
-            # Itera sobre as sequências vitoriosas,
-            # obtendo os 'símbolos' de cada jogada da
-            # sequência.
-            for item in combo:
-                (n, m) = item
-                results.add(self._get_label(n, m))
-
-            # Verifica se na sequência, existe somente
-            # um 'símbolo' e se o 'símbolo' é válido.
-            is_win = (
-                len(results) == 1
-                and "" not in results
-            )
-            if is_win:
-                # Indica que há um vencedor e qual a 
-                # sequência usada pelo vencedor.
-                self._has_winner = True
-                self.winner_combo = combo
-                break
+        vitoriosa no estado atual do jogo.
+
+        Somente as sequências que passam pela última
+        jogada registrada são verificadas, já que as
+        demais não mudaram desde a verificação
+        anterior."""
+        last_move = self._last_move
+        if last_move is None:
+            # Verifica todas as sequências, de ambos os
+            # jogadores.
+            labels = ("X", "O")
+            lines = range(len(self.winning_positions))
+        elif last_move.label:
+            # Verifica as sequências que passam pela
+            # última jogada, do jogador que a fez.
+            labels = (last_move.label,)
+            lines = self._lines_through[last_move.row][
+                last_move.col
+            ]
+        else:
+            return
+
+        # Percorre as sequências em ordem, assim como a
+        # verificação completa do tabuleiro.
+        for index in lines:
+            for label in labels:
+                # Verifica se a sequência está completa.
+                if self._line_counts[label][index] == self.k:
+                    # Indica que há um vencedor e qual a
+                    # sequência usada pelo vencedor.
+                    self._has_winner = True
+                    self.winner_combo = (
+                        self.winning_positions[index]
+                    )
+                    return
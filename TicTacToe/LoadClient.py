@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from typing import Optional
+from Engine.Search import DEFAULT_DIFFICULTY, DIFFICULTIES
+from Engine.Tournament import percentile
+from TicTacToe.Server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class Connection:
+    """Uma conexão com o servidor, compartilhada por
+    várias partidas: as requisições são enviadas sem
+    esperar as anteriores, e cada resposta é entregue
+    a quem a pediu, pelo seu 'id'."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            reader (asyncio.StreamReader): A entrada.
+            writer (asyncio.StreamWriter): A saída.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        # As respostas aguardadas, pelo 'id'.
+        self._waiting: dict[int, asyncio.Future] = {}
+        self._listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def open(
+        cls, host: str, port: int, path: Optional[str] = None
+    ) -> "Connection":
+        """Conecta-se ao servidor, por TCP ou por um
+        'socket' Unix.
+
+        Returns:
+            Connection: A conexão."""
+        if path is not None:
+            streams = await asyncio.open_unix_connection(path)
+        else:
+            streams = await asyncio.open_connection(host, port)
+        return cls(*streams)
+
+    async def _listen(self) -> None:
+        """Entrega as respostas recebidas."""
+        while line := await self._reader.readline():
+            response = json.loads(line)
+            future = self._waiting.pop(response["id"], None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self._waiting.values():
+            future.set_exception(
+                ConnectionError("Conexão encerrada.")
+            )
+
+    async def request(self, op: str, **fields) -> dict:
+        """Envia uma requisição e espera a resposta.
+
+        Args:
+            op (str): A operação.
+
+        Raises:
+            RuntimeError: Caso o servidor indique um
+            erro.
+
+        Returns:
+            dict: A resposta."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        data = json.dumps({"id": request_id, "op": op, **fields})
+        self._writer.write(data.encode() + b"\n")
+        response = await future
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response
+
+    async def close(self) -> None:
+        """Fecha a conexão."""
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._listener.cancel()
+
+
+async def play(
+    connection: Connection,
+    args: argparse.Namespace,
+    rng: random.Random,
+    latencies: list[float],
+) -> None:
+    """Joga partidas contra o 'bot', com jogadas
+    aleatórias, registrando a latência de cada uma (a
+    jogada e a resposta do 'bot').
+
+    Args:
+        connection (Connection): A conexão.
+        args (argparse.Namespace): As opções.
+        rng (random.Random): O gerador das jogadas.
+        latencies (list[float]): As latências, em
+        segundos.
+    """
+    for _ in range(args.rounds):
+        state = await connection.request(
+            "new",
+            rows=args.rows,
+            cols=args.cols,
+            k=args.k,
+            bot="O",
+            difficulty=args.difficulty,
+        )
+        game_id = state["game"]
+        while state["status"] == "playing":
+            empty = [
+                (row, col)
+                for row, line in enumerate(state["board"])
+                for col, label in enumerate(line)
+                if label == "."
+            ]
+            row, col = rng.choice(empty)
+            start = time.perf_counter()
+            state = await connection.request(
+                "move", game=game_id, row=row, col=col
+            )
+            latencies.append(time.perf_counter() - start)
+        await connection.request("close", game=game_id)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Executa o teste de carga e imprime o
+    relatório."""
+    connections = [
+        await Connection.open(args.host, args.port, args.unix)
+        for _ in range(args.connections)
+    ]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            play(
+                connections[index % len(connections)],
+                args,
+                random.Random(args.seed + index),
+                latencies,
+            )
+            for index in range(args.games)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    stats = await connections[0].request("stats")
+    for connection in connections:
+        await connection.close()
+
+    latencies.sort()
+    lookups = stats["hits"] + stats["misses"]
+    print(
+        f"{args.games * args.rounds} partidas, "
+        f"{len(latencies)} jogadas em {elapsed:.2f}s "
+        f"({len(latencies) / max(elapsed, 1e-9):.0f} "
+        "jogadas/s)"
+    )
+    print(
+        "latência por jogada (ms): "
+        f"p50 {percentile(latencies, 50) * 1000:.2f}, "
+        f"p99 {percentile(latencies, 99) * 1000:.2f}, "
+        f"máx. {latencies[-1] * 1000 if latencies else 0:.2f}"
+    )
+    print(
+        f"cache: {stats['hits']}/{lookups} acertos, "
+        f"{stats['searches']} buscas, "
+        f"{stats['cache']} posições"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Teste de carga do servidor: várias "
+        "partidas simultâneas, com jogadas aleatórias, "
+        "medindo a latência de cada jogada."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--unix",
+        default=None,
+        help="O caminho de um 'socket' Unix, usado no "
+        "lugar do TCP.",
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=1000,
+        help="As partidas simultâneas.",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=1,
+        help="As partidas jogadas, uma após a outra, "
+        "por cada partida simultânea.",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=10,
+        help="As conexões, divididas entre as "
+        "partidas.",
+    )
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument(
+        "--difficulty",
+        choices=[difficulty.name for difficulty in DIFFICULTIES],
+        default=DEFAULT_DIFFICULTY,
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Garante que nada aqui dependa do 'tkinter'.
+    sys.modules["tkinter"] = None
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
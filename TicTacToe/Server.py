@@ -0,0 +1,662 @@
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from Engine.Position import Position
+from Engine.Search import (
+    DEFAULT_DIFFICULTY,
+    Search,
+    get_difficulty,
+)
+from Engine.SolvedTable import SolvedTable
+from Engine.Symmetries import get_symmetries
+from Engine.Tablebase import Tablebase
+from Move import Move
+from TicTacToe.Game import Game
+
+# O endereço padrão do servidor.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# A quantidade máxima de posições no cache
+# compartilhado de jogadas do 'bot'.
+CACHE_SIZE = 1 << 16
+# Quantas buscas, por processo, podem aguardar na
+# fila; as demais esperam antes de serem enviadas,
+# limitando a memória do servidor sob carga.
+QUEUE_FACTOR = 4
+# O maior tabuleiro aceito, em casas.
+MAX_CELLS = 400
+
+
+class ProtocolError(Exception):
+    """Uma requisição inválida. A mensagem é devolvida
+    ao cliente."""
+
+
+class Session:
+    """Uma partida hospedada pelo servidor."""
+
+    __slots__ = (
+        "game",
+        "bot",
+        "difficulty",
+        "status",
+        "lock",
+    )
+
+    def __init__(
+        self, game: Game, bot: str, difficulty: str
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            game (Game): O jogo.
+            bot (str): O 'símbolo' do 'bot' ("X" ou
+            "O"), ou "" para uma partida sem 'bot'.
+            difficulty (str): O nível de dificuldade
+            do 'bot'.
+        """
+        self.game = game
+        self.bot = bot
+        self.difficulty = difficulty
+        # "playing", o 'símbolo' do vencedor ou "draw".
+        self.status = "playing"
+        # Impede que duas jogadas da mesma partida
+        # sejam processadas ao mesmo tempo.
+        self.lock = asyncio.Lock()
+
+
+class Server:
+    """Servidor 'asyncio' que hospeda várias partidas
+    simultâneas, por um protocolo de linhas JSON.
+
+    Cada linha recebida é uma requisição, com um campo
+    'op', e cada requisição recebe uma linha de
+    resposta, com o mesmo 'id'. As requisições de uma
+    conexão são processadas de forma concorrente; as
+    buscas do 'bot' são enviadas a um conjunto limitado
+    de processos e todas as partidas compartilham um
+    cache das jogadas já buscadas, pela posição
+    canônica (as simetrias de uma posição têm a mesma
+    resposta)."""
+
+    def __init__(
+        self, processes: Optional[int] = None
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            processes (int, optional): A quantidade de
+            processos das buscas. Valor padrão: a
+            quantidade de núcleos.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self._executor = None
+        # O limite de buscas enviadas aos processos.
+        self._slots = None
+        # As partidas, pelo seu identificador.
+        self.sessions: dict[int, Session] = {}
+        self._ids = itertools.count(1)
+        # O cache compartilhado: a jogada (no
+        # referencial canônico) de cada posição, e as
+        # buscas em andamento, que as partidas na
+        # mesma posição aguardam em vez de repetir.
+        self._cache = OrderedDict()
+        self._pending: dict[tuple, asyncio.Future] = {}
+        # Os contadores exibidos por 'stats'.
+        self.hits = 0
+        self.misses = 0
+        self.searches = 0
+
+    async def start(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        path: Optional[str] = None,
+    ) -> asyncio.AbstractServer:
+        """Cria os processos das buscas e começa a
+        aceitar conexões.
+
+        Args:
+            host (str, optional): O endereço TCP. Valor
+            padrão: 'DEFAULT_HOST'.
+            port (int, optional): A porta TCP. Valor
+            padrão: 'DEFAULT_PORT'.
+            path (str, optional): O caminho de um
+            'socket' Unix, usado no lugar do TCP. Valor
+            padrão: None.
+
+        Returns:
+            asyncio.AbstractServer: O servidor."""
+        context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(
+            self.processes,
+            mp_context=context,
+            initializer=_init_worker,
+        )
+        self._slots = asyncio.Semaphore(
+            self.processes * QUEUE_FACTOR
+        )
+        # Sem limite de tamanho de linha além do padrão
+        # do 'asyncio' (64 KiB).
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self._handle_client, path
+            )
+        return await asyncio.start_server(
+            self._handle_client, host, port
+        )
+
+    def close(self) -> None:
+        """Encerra os processos das buscas."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Atende uma conexão até o cliente fechá-la.
+
+        Args:
+            reader (asyncio.StreamReader): A entrada.
+            writer (asyncio.StreamWriter): A saída.
+        """
+        tasks = set()
+        # As partidas criadas por esta conexão,
+        # removidas quando ela é fechada.
+        games = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(
+                    self._respond(line, writer, games)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            for game_id in games:
+                self.sessions.pop(game_id, None)
+            writer.close()
+
+    async def _respond(
+        self,
+        line: bytes,
+        writer: asyncio.StreamWriter,
+        games: set,
+    ) -> None:
+        """Processa uma requisição e escreve a sua
+        resposta, esperando que o cliente a receba
+        antes de continuar ('drain').
+
+        Args:
+            line (bytes): A linha da requisição.
+            writer (asyncio.StreamWriter): A saída.
+            games (set): As partidas criadas pela
+            conexão.
+        """
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise ProtocolError(
+                    "Requisição inválida: JSON malformado."
+                ) from None
+            if not isinstance(request, dict):
+                raise ProtocolError(
+                    "A requisição não é um objeto."
+                )
+            request_id = request.get("id")
+            response = await self.handle(request, games)
+            response["ok"] = True
+        except (ProtocolError, ValueError) as error:
+            response = {"ok": False, "error": str(error)}
+        except (KeyError, TypeError) as error:
+            response = {
+                "ok": False,
+                "error": f"Requisição inválida: {error}.",
+            }
+        except Exception as error:
+            # Uma falha do servidor, como a de um dos
+            # processos das buscas, também é respondida.
+            response = {
+                "ok": False,
+                "error": f"Erro interno: {error!r}.",
+            }
+        response["id"] = request_id
+        if writer.is_closing():
+            return
+        data = json.dumps(response).encode()
+        writer.write(data + b"\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def handle(
+        self, request: dict, games: Optional[set] = None
+    ) -> dict:
+        """Executa uma requisição.
+
+        Args:
+            request (dict): A requisição.
+            games (set, optional): As partidas da
+            conexão, atualizadas por "new" e "close".
+            Valor padrão: None.
+
+        Raises:
+            ProtocolError: Caso a requisição seja
+            inválida.
+
+        Returns:
+            dict: A resposta."""
+        op = request.get("op")
+        if op == "new":
+            response = await self._new_game(request)
+            if games is not None:
+                games.add(response["game"])
+            return response
+        if op == "move":
+            return await self._move(request, games)
+        if op == "state":
+            return self._state(
+                self._get_session(request, games)
+            )
+        if op == "close":
+            session = self._get_session(request, games)
+            del self.sessions[request["game"]]
+            if games is not None:
+                games.discard(request["game"])
+            return self._state(session)
+        if op == "stats":
+            return {
+                "sessions": len(self.sessions),
+                "cache": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "searches": self.searches,
+            }
+        raise ProtocolError(f"Operação desconhecida: {op!r}.")
+
+    def _get_session(
+        self, request: dict, games: Optional[set] = None
+    ) -> Session:
+        """Retorna a partida de uma requisição.
+
+        Args:
+            request (dict): A requisição.
+            games (set, optional): As partidas da
+            conexão, as únicas que ela pode acessar.
+            Valor padrão: None, isto é, qualquer
+            partida.
+
+        Raises:
+            ProtocolError: Caso a partida não exista
+            ou seja de outra conexão.
+
+        Returns:
+            Session: A partida."""
+        game_id = self._get_int(request, "game")
+        session = self.sessions.get(game_id)
+        # As partidas de outras conexões são tratadas
+        # como inexistentes, sem revelar os seus
+        # identificadores (que são sequenciais).
+        if session is None or (
+            games is not None and game_id not in games
+        ):
+            raise ProtocolError("Partida inexistente.")
+        return session
+
+    @staticmethod
+    def _get_int(
+        request: dict, name: str, default: Optional[int] = None
+    ) -> int:
+        """Retorna um campo inteiro de uma requisição.
+
+        Args:
+            request (dict): A requisição.
+            name (str): O nome do campo.
+            default (int, optional): O valor de um
+            campo ausente. Valor padrão: None, isto é,
+            o campo é obrigatório.
+
+        Raises:
+            ProtocolError: Caso o campo seja
+            obrigatório e esteja ausente, ou não seja
+            um inteiro.
+
+        Returns:
+            int: O valor do campo."""
+        value = request.get(name, default)
+        if value is None:
+            raise ProtocolError(
+                f"Requisição inválida: campo {name!r} "
+                "ausente."
+            )
+        if not isinstance(value, int) or isinstance(
+            value, bool
+        ):
+            raise ProtocolError(
+                f"Requisição inválida: campo {name!r} "
+                f"não é um inteiro: {value!r}."
+            )
+        return value
+
+    async def _new_game(self, request: dict) -> dict:
+        """Cria uma partida e, caso o 'bot' comece,
+        faz a sua jogada."""
+        rows = self._get_int(request, "rows", 3)
+        cols = self._get_int(request, "cols", 3)
+        k = self._get_int(request, "k", 3)
+        if rows * cols > MAX_CELLS:
+            raise ProtocolError(
+                f"Tabuleiro grande demais: {rows}x{cols}."
+            )
+        bot = request.get("bot", "O")
+        if bot not in ("X", "O", ""):
+            raise ProtocolError(f"'Bot' inválido: {bot!r}.")
+        difficulty = get_difficulty(
+            request.get("difficulty", DEFAULT_DIFFICULTY)
+        ).name
+        game = Game(rows, cols, k)
+        game_id = next(self._ids)
+        session = Session(game, bot, difficulty)
+        self.sessions[game_id] = session
+        try:
+            async with session.lock:
+                bot_move = await self._bot_play(session)
+        except BaseException:
+            # Sem a primeira jogada do 'bot', a partida
+            # não é criada.
+            self.sessions.pop(game_id, None)
+            raise
+        response = self._state(session)
+        response["game"] = game_id
+        response["bot_move"] = bot_move
+        return response
+
+    async def _move(
+        self, request: dict, games: Optional[set] = None
+    ) -> dict:
+        """Registra a jogada do cliente e, caso a
+        partida continue, a resposta do 'bot'."""
+        session = self._get_session(request, games)
+        async with session.lock:
+            game = session.game
+            if session.status != "playing":
+                raise ProtocolError("A partida já terminou.")
+            row = self._get_int(request, "row")
+            col = self._get_int(request, "col")
+            if not (
+                0 <= row < game.rows and 0 <= col < game.cols
+            ):
+                raise ProtocolError("Casa fora do tabuleiro.")
+            label = game._get_player_label()
+            if label == session.bot:
+                raise ProtocolError("É o turno do 'bot'.")
+            if game._get_label(row, col):
+                raise ProtocolError("Casa ocupada.")
+            self._play(session, Move(row, col, label))
+            try:
+                bot_move = await self._bot_play(session)
+            except BaseException:
+                # Caso a busca do 'bot' falhe (ou seja
+                # cancelada), a jogada do cliente é
+                # desfeita, devolvendo-lhe o turno.
+                game.unmake_move()
+                raise
+        response = self._state(session)
+        response["bot_move"] = bot_move
+        return response
+
+    def _play(self, session: Session, move: Move) -> None:
+        """Registra uma jogada e atualiza o estado da
+        partida.
+
+        Args:
+            session (Session): A partida.
+            move (Move): A jogada.
+        """
+        game = session.game
+        game.make_move(move)
+        game.check_move()
+        if game._has_winner:
+            session.status = move.label
+        elif game.is_tied():
+            session.status = "draw"
+
+    async def _bot_play(self, session: Session) -> Optional[list]:
+        """Faz a jogada do 'bot', caso seja o seu
+        turno.
+
+        Returns:
+            list, optional: As coordenadas da jogada,
+            ou None caso não seja o turno do 'bot'."""
+        game = session.game
+        label = game._get_player_label()
+        if session.status != "playing" or label != session.bot:
+            return None
+        row, col = await self._best_move(
+            game, label == "X", session.difficulty
+        )
+        self._play(session, Move(row, col, label))
+        return [row, col]
+
+    async def _best_move(
+        self, game: Game, isMax: bool, difficulty: str
+    ) -> tuple[int, int]:
+        """Escolhe a jogada do 'bot', consultando o
+        cache compartilhado antes de buscá-la em um dos
+        processos.
+
+        Args:
+            game (Game): O jogo.
+            isMax: Se é o turno de 'X'.
+            difficulty (str): O nível de dificuldade.
+
+        Returns:
+            tuple[int, int]: As coordenadas da jogada."""
+        pos = game.position
+        symmetries = get_symmetries(game.rows, game.cols)
+        canonical, sym = symmetries.canonical(pos.x, pos.o)
+        key = (
+            game.rows,
+            game.cols,
+            game.k,
+            difficulty,
+            canonical,
+        )
+        cell = self._cache.get(key)
+        if cell is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        else:
+            # Uma busca da mesma posição (ou de uma
+            # simétrica) já em andamento é aguardada em
+            # vez de repetida. A busca não é cancelada
+            # caso o cliente que a iniciou desconecte.
+            search = self._pending.get(key)
+            if search is None:
+                self.misses += 1
+                task = (
+                    game.rows,
+                    game.cols,
+                    game.k,
+                    pos.x,
+                    pos.o,
+                    isMax,
+                    difficulty,
+                )
+                search = asyncio.create_task(
+                    self._search(key, task, sym)
+                )
+                # Consome o erro de uma busca cujas
+                # partidas já desistiram dela.
+                search.add_done_callback(
+                    lambda done: done.cancelled()
+                    or done.exception()
+                )
+                self._pending[key] = search
+            else:
+                self.hits += 1
+            cell = await asyncio.shield(search)
+        # Desfaz a simetria da posição canônica.
+        return divmod(symmetries.inverses[sym][cell], game.cols)
+
+    async def _search(
+        self, key: tuple, task: tuple, sym: int
+    ) -> int:
+        """Busca a jogada do 'bot' em um dos processos,
+        registrando-a no cache.
+
+        Args:
+            key (tuple): A chave da posição no cache.
+            task (tuple): A tarefa de '_search_task'.
+            sym (int): A simetria que leva a posição à
+            canônica.
+
+        Returns:
+            int: O índice da casa da jogada, no
+            referencial canônico."""
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._slots:
+                self.searches += 1
+                row, col = await loop.run_in_executor(
+                    self._executor, _search_task, task
+                )
+        finally:
+            del self._pending[key]
+        rows, cols = task[0], task[1]
+        symmetries = get_symmetries(rows, cols)
+        cell = symmetries.perms[sym][row * cols + col]
+        self._cache[key] = cell
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return cell
+
+    def _state(self, session: Session) -> dict:
+        """Retorna o estado de uma partida.
+
+        Args:
+            session (Session): A partida.
+
+        Returns:
+            dict: O tabuleiro (uma linha de texto por
+            linha, com '.' nas casas vazias), o jogador
+            do turno e a situação da partida."""
+        game = session.game
+        return {
+            "board": [
+                "".join(move.label or "." for move in row)
+                for row in game._current_moves
+            ],
+            "turn": game._get_player_label(),
+            "status": session.status,
+        }
+
+
+# A busca de cada processo e as máscaras das
+# sequências vitoriosas, por regras do jogo, mantidas
+# entre as tarefas (a busca, com a sua tabela de
+# transposição).
+_engines: dict[tuple[int, int, int], tuple] = {}
+
+
+def _init_worker() -> None:
+    """Inicializa um processo do servidor, que ignora
+    o 'Ctrl+C': quem o encerra é o processo
+    principal."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _search_task(task: tuple) -> tuple[int, int]:
+    """Busca, em um processo do servidor, a jogada do
+    'bot' em uma posição.
+
+    Args:
+        task (tuple): As regras ('rows', 'cols' e
+        'k'), a posição ('x' e 'o'), o turno e o nível
+        de dificuldade.
+
+    Returns:
+        tuple[int, int]: As coordenadas da jogada."""
+    rows, cols, k, x, o, isMax, difficulty = task
+    rules = (rows, cols, k)
+    if rules not in _engines:
+        game = Game(rows, cols, k)
+        solved = SolvedTable.load(game) or Tablebase.load(game)
+        _engines[rules] = (
+            Search(solved=solved),
+            game.position.win_masks,
+        )
+    engine, win_masks = _engines[rules]
+    level = get_difficulty(difficulty)
+    engine.depth = level.depth
+    pos = Position(rows, cols, win_masks, x, o)
+    return engine.search(pos, isMax, level.time_budget)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Servidor de partidas contra o "
+        "'bot', por um protocolo de linhas JSON."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--unix",
+        default=None,
+        help="O caminho de um 'socket' Unix, usado no "
+        "lugar do TCP.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Processos das buscas (padrão: um por "
+        "núcleo).",
+    )
+    args = parser.parse_args()
+
+    # Garante que nada aqui dependa do 'tkinter'.
+    sys.modules["tkinter"] = None
+
+    async def serve() -> None:
+        server = Server(args.processes)
+        listener = await server.start(
+            args.host, args.port, args.unix
+        )
+        address = args.unix or f"{args.host}:{args.port}"
+        print(
+            f"Servindo em {address} com "
+            f"{server.processes} processos.",
+            flush=True,
+        )
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
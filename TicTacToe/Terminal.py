@@ -0,0 +1,278 @@
+import sys
+from typing import Optional, TextIO
+from Move import Move
+from Engine.GameLog import GameLogWriter, game_result
+from Engine.Search import (
+    DEFAULT_DIFFICULTY,
+    Search,
+    get_difficulty,
+)
+from Engine.SolvedTable import SolvedTable
+from Engine.Tablebase import Tablebase
+from Engine.TranspositionTable import TranspositionTable
+from TicTacToe.Game import Game
+
+
+class Terminal:
+    """O jogo da velha no terminal, contra o mesmo
+    'bot' da janela, sem depender do 'tkinter' nem de
+    uma interface gráfica.
+
+    O usuário ('X') joga digitando a linha e a coluna
+    da casa, a partir de 1; "d" desfaz a última
+    jogada, "r" reinicia a partida e "s" sai."""
+
+    # Os comandos, além das jogadas.
+    UNDO = "d"
+    RESET = "r"
+    QUIT = "s"
+
+    def __init__(
+        self,
+        rows: int = 3,
+        cols: int = 3,
+        k: int = 3,
+        time_budget: float = None,
+        difficulty: str = DEFAULT_DIFFICULTY,
+        processes: int = 1,
+        game_log: bool = True,
+        stdin: TextIO = None,
+        stdout: TextIO = None,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            rows (int, optional): A quantidade de
+            linhas do tabuleiro. Valor padrão: 3.
+            cols (int, optional): A quantidade de
+            colunas do tabuleiro. Valor padrão: 3.
+            k (int, optional): A quantidade de
+            'símbolos' em sequência necessária para
+            vencer. Valor padrão: 3.
+            time_budget (float, optional): O tempo
+            máximo, em segundos, de cada jogada do
+            'bot', no lugar do tempo do nível de
+            dificuldade. Valor padrão: None.
+            difficulty (str, optional): O nome do nível
+            de dificuldade do 'bot'. Valor padrão:
+            'DEFAULT_DIFFICULTY'.
+            processes (int, optional): A quantidade de
+            processos da busca do 'bot'. Valor padrão:
+            1.
+            game_log (bool, optional): Se as partidas
+            são gravadas no registro de partidas.
+            Valor padrão: True.
+            stdin (TextIO, optional): A entrada dos
+            comandos. Valor padrão: 'sys.stdin'.
+            stdout (TextIO, optional): A saída do
+            tabuleiro. Valor padrão: 'sys.stdout'.
+        """
+        self._stdin = stdin or sys.stdin
+        self._stdout = stdout or sys.stdout
+        # Objeto responsável pela lógica do jogo.
+        self._game = Game(rows, cols, k)
+        # O motor de busca do 'bot', escolhido como
+        # na janela.
+        solved = SolvedTable.load(self._game) or Tablebase.load(
+            self._game
+        )
+        # A busca paralela (com o 'multiprocessing') é
+        # importada somente quando usada, acelerando a
+        # inicialização.
+        if processes > 1:
+            from Engine.ParallelSearch import ParallelSearch
+
+            self._engine = ParallelSearch(
+                processes, solved=solved
+            )
+        else:
+            self._engine = Search(
+                table=TranspositionTable(), solved=solved
+            )
+        # O nível de dificuldade e o tempo máximo de
+        # cada busca do 'bot'.
+        level = get_difficulty(difficulty)
+        self._engine.depth = level.depth
+        self.time_budget = level.time_budget
+        if time_budget is not None:
+            self.time_budget = time_budget
+        # O registro das partidas, como na janela: cada
+        # partida é gravada como foi deixada ao
+        # reiniciar ou sair.
+        self._log = None
+        if game_log:
+            try:
+                self._log = GameLogWriter(self._game)
+            except (OSError, ValueError):
+                pass
+
+    def run(self) -> None:
+        """Joga partidas até o usuário sair ou a
+        entrada terminar."""
+        try:
+            self._write(self._render())
+            while True:
+                command = self._read()
+                if command is None or command == self.QUIT:
+                    break
+                if command == self.UNDO:
+                    self._undo()
+                elif command == self.RESET:
+                    self._log_game()
+                    game = self._game
+                    self._game = Game(
+                        game.rows, game.cols, game.k
+                    )
+                elif not self._user_play(command):
+                    continue
+                self._write(self._render())
+        finally:
+            self._engine.close()
+            if self._log is not None:
+                self._log_game()
+                self._log.close()
+
+    def _read(self) -> Optional[str]:
+        """Lê o próximo comando do usuário.
+
+        Returns:
+            Optional[str]: O comando, ou None ao fim da
+            entrada."""
+        self._stdout.write("> ")
+        self._stdout.flush()
+        line = self._stdin.readline()
+        if not line:
+            return None
+        return line.strip().lower()
+
+    def _user_play(self, command: str) -> bool:
+        """Registra a jogada do usuário e, caso o jogo
+        não tenha terminado, a resposta do 'bot'.
+
+        Args:
+            command (str): A linha e a coluna da casa,
+            a partir de 1.
+
+        Returns:
+            bool: Se a jogada foi válida."""
+        game = self._game
+        if game._game_ended:
+            self._write(
+                f"A partida terminou; digite '{self.RESET}' "
+                "para reiniciar."
+            )
+            return False
+        try:
+            row, col = (
+                int(value) - 1 for value in command.split()
+            )
+        except ValueError:
+            self._write(
+                "Digite a linha e a coluna da casa (por "
+                f"exemplo, '1 2'), '{self.UNDO}' para "
+                f"desfazer, '{self.RESET}' para reiniciar "
+                f"ou '{self.QUIT}' para sair."
+            )
+            return False
+        move = Move(row, col, game._get_player_label())
+        if (
+            not 0 <= row < game.rows
+            or not 0 <= col < game.cols
+            or not game.is_move_valid(move)
+        ):
+            self._write("Casa inválida.")
+            return False
+        game.make_move(move)
+        if not self._check_game_state():
+            self._bot_play()
+        return True
+
+    def _bot_play(self) -> None:
+        """Busca e registra a jogada do 'bot'."""
+        game = self._game
+        self._write("Pensando...")
+        row, col = self._engine.search(
+            game.position.copy(),
+            game._get_player_label() == "X",
+            self.time_budget,
+        )
+        game.make_move(Move(row, col, game._get_player_label()))
+        self._check_game_state()
+
+    def _undo(self) -> None:
+        """Desfaz jogadas até voltar ao turno anterior
+        do usuário ('X'), isto é, a resposta do 'bot'
+        e a jogada do usuário."""
+        game = self._game
+        while game.undo() is not None:
+            if (
+                not game._history
+                or game._get_player_label() == "X"
+            ):
+                break
+
+    def _check_game_state(self) -> bool:
+        """Verifica se houve vitória ou empate após a
+        última jogada.
+
+        Returns:
+            bool: Se o jogo terminou."""
+        game = self._game
+        game.check_move()
+        if game._has_winner or game.is_tied():
+            game._game_ended = True
+        return game._game_ended
+
+    def _log_game(self) -> None:
+        """Grava a partida atual no registro, com o seu
+        resultado ou, caso não tenha terminado, como
+        abandonada."""
+        if self._log is None or not self._game._history:
+            return
+        self._log.record(
+            self._game._history, game_result(self._game)
+        )
+
+    def _render(self) -> str:
+        """Desenha o tabuleiro e o estado da partida.
+
+        Returns:
+            str: O tabuleiro, com os índices das linhas
+            e das colunas, e o estado da partida."""
+        game = self._game
+        width = len(str(max(game.rows, game.cols)))
+        # As casas da sequência vitoriosa são marcadas
+        # com '*'.
+        combo = set(game.winner_combo)
+        lines = [
+            " " * (width + 1)
+            + " ".join(
+                f"{col + 1:>{width}}" for col in range(game.cols)
+            )
+        ]
+        for row in range(game.rows):
+            cells = []
+            for col in range(game.cols):
+                label = game._get_label(row, col) or "."
+                if (row, col) in combo:
+                    label = "*"
+                cells.append(f"{label:>{width}}")
+            lines.append(
+                f"{row + 1:>{width}} " + " ".join(cells)
+            )
+        if game._has_winner:
+            lines.append(f"{game._history[-1].label} venceu!")
+        elif game._game_ended:
+            lines.append("Empate!")
+        else:
+            lines.append(f"Vez de {game._get_player_label()}.")
+        return "\n".join(lines)
+
+    def _write(self, text: str) -> None:
+        """Escreve uma mensagem na saída.
+
+        Args:
+            text (str): A mensagem.
+        """
+        self._stdout.write(text + "\n")
+        self._stdout.flush()
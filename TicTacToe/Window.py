@@ -1,14 +1,109 @@
 import tkinter as tk
 from TicTacToe.Board import Board
+from Engine.Search import DEFAULT_DIFFICULTY, DIFFICULTIES
+from Engine.TranspositionTable import TranspositionTable
 
 
 class Window(tk.Tk):
     """A janela principal."""
 
-    def __init__(self) -> None:
-        """Construtor base."""
+    def __init__(
+        self,
+        rows: int = 3,
+        cols: int = 3,
+        k: int = 3,
+        time_budget: float = None,
+        difficulty: str = DEFAULT_DIFFICULTY,
+        processes: int = 1,
+        ponder: bool = False,
+        game_log: bool = True,
+    ) -> None:
+        """Construtor base.
+
+        Args:
+            rows (int, optional): A quantidade de
+            linhas do tabuleiro. Valor padrão: 3.
+            cols (int, optional): A quantidade de
+            colunas do tabuleiro. Valor padrão: 3.
+            k (int, optional): A quantidade de
+            'símbolos' em sequência necessária para
+            vencer. Valor padrão: 3.
+            time_budget (float, optional): O tempo
+            máximo, em segundos, de cada jogada do
+            'bot', no lugar do tempo do nível de
+            dificuldade. Valor padrão: None.
+            difficulty (str, optional): O nome do nível
+            de dificuldade do 'bot'. Valor padrão:
+            'DEFAULT_DIFFICULTY'.
+            processes (int, optional): A quantidade de
+            processos da busca do 'bot'. Valor padrão:
+            1.
+            ponder (bool, optional): Se o 'bot' busca as
+            suas respostas durante o turno do usuário.
+            Valor padrão: False.
+            game_log (bool, optional): Se as partidas
+            são gravadas no registro de partidas.
+            Valor padrão: True.
+        """
         super().__init__()
         # Define o título da janela.
         self.title("Jogo da Velha")
+        # A tabela de transposição do 'bot', mantida
+        # durante toda a sessão da janela.
+        self.table = TranspositionTable()
         # Objeto responsável pelo tabuleiro.
-        self.board = Board(master=self)
+        self.board = Board(
+            master=self,
+            table=self.table,
+            rows=rows,
+            cols=cols,
+            k=k,
+            time_budget=time_budget,
+            difficulty=difficulty,
+            processes=processes,
+            ponder=ponder,
+            game_log=game_log,
+        )
+        # Cria o menu de dificuldade.
+        self._create_menu()
+        # Cancela a busca do 'bot' ao fechar a janela.
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+    def _create_menu(self) -> None:
+        """Cria a barra de menus, com os níveis de
+        dificuldade do 'bot' e o modo de análise."""
+        menubar = tk.Menu(self)
+        # O nível selecionado no menu.
+        self.difficulty = tk.StringVar(
+            master=self, value=self.board.difficulty
+        )
+        menu = tk.Menu(menubar, tearoff=0)
+        for difficulty in DIFFICULTIES:
+            menu.add_radiobutton(
+                label=difficulty.label,
+                value=difficulty.name,
+                variable=self.difficulty,
+                command=self._set_difficulty,
+            )
+        menubar.add_cascade(label="Dificuldade", menu=menu)
+        # O menu de análise, com o mapa de calor das
+        # jogadas.
+        analysis = tk.Menu(menubar, tearoff=0)
+        analysis.add_command(
+            label="Mapa de calor",
+            accelerator="F4",
+            command=self.board.toggle_analysis,
+        )
+        menubar.add_cascade(label="Análise", menu=analysis)
+        self.config(menu=menubar)
+
+    def _set_difficulty(self) -> None:
+        """Aplica o nível de dificuldade selecionado no
+        menu."""
+        self.board.set_difficulty(self.difficulty.get())
+
+    def close(self) -> None:
+        """Fecha a janela, cancelando a busca do 'bot'
+        em andamento."""
+        self.board.close()
+        self.destroy()